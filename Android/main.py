@@ -996,12 +996,13 @@ class TPNFCApp(App):
         def background_refresh():
             try:
                 # Refresh data from Google Sheets (this is the blocking operation)
-                self.refresh_from_sheets()
+                changed = self.refresh_from_sheets()
                 
                 # Schedule UI updates on main thread
                 def update_ui(dt):
-                    # Update guest check-ins for current station  
-                    self.refresh_guest_checkins()
+                    # Update guest check-ins for current station (unchanged data needs no redraw)
+                    if changed:
+                        self.refresh_guest_checkins()
                     # No success message - just clear status
                     self.clear_status_message()
                     # Re-enable logo
@@ -1534,11 +1535,17 @@ class TPNFCApp(App):
     
     
     def refresh_from_sheets(self):
-        """Refresh guest data from Google Sheets to get latest check-ins"""
+        """Refresh guest data from Google Sheets to get latest check-ins.
+        
+        Returns True if the guest data changed (False if unchanged or the refresh failed).
+        """
         if self.sheets_service:
             try:
-                # Fetch fresh data from Google Sheets
-                fresh_guest_data = self.sheets_service.get_all_guests()
+                # Fetch fresh data from Google Sheets, skipped if the sheet has not changed
+                fresh_guest_data = self.sheets_service.get_guests_if_changed()
+                if fresh_guest_data is None:
+                    self.logger.info("Guest data unchanged on Google Sheets")
+                    return False
                 if fresh_guest_data:
                     self.guest_data = fresh_guest_data
                     # Rebuild the guest data map
@@ -1546,10 +1553,12 @@ class TPNFCApp(App):
                     for guest in self.guest_data:
                         self.guest_data_map[guest.original_id] = guest
                     self.logger.info(f"Refreshed {len(fresh_guest_data)} guests from Google Sheets")
+                    return True
                 else:
                     self.logger.warning("Failed to refresh guest data from Google Sheets")
             except Exception as e:
                 self.logger.error(f"Error refreshing from Google Sheets: {e}")
+        return False
     
     def refresh_guest_checkins(self):
         """Refresh guest check-in status for current station"""
@@ -5,6 +5,7 @@ Google Sheets service for managing attendance data.
 """
 
 import logging
+import zlib
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 import json
@@ -37,6 +38,7 @@ class GoogleSheetsService:
         self.service = None
         self.spreadsheet_id = config['spreadsheet_id']
         self.sheet_name = config.get('sheet_name', 'Sheet1')
+        self._fingerprint = None  # Fingerprint of the data returned by the last refresh
         
     def authenticate(self) -> bool:
         """
@@ -140,6 +142,40 @@ class GoogleSheetsService:
             self.logger.error(f"Error fetching data from Google Sheets: {e}")
             return []
             
+    def get_guests_if_changed(self) -> Optional[List[GuestRecord]]:
+        """
+        Fetch all guests only if the check-in data changed since the last call.
+
+        Probes the ID column and columns E-I in one batchGet and compares a
+        row count and checksum per column with the last successful refresh.
+        
+        Returns:
+            List of GuestRecord objects, or None if nothing changed
+        """
+        try:
+            result = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[f"{self.sheet_name}!A2:A", f"{self.sheet_name}!E2:I"],
+                majorDimension='COLUMNS'
+            ).execute()
+            fingerprint = tuple(
+                (len(cells), zlib.crc32('\x1f'.join(str(cell) for cell in cells).encode('utf-8')))
+                for value_range in result.get('valueRanges', [])
+                for cells in value_range.get('values', [])
+            )
+        except Exception as e:
+            self.logger.debug(f"Change probe failed, refreshing: {e}")
+            fingerprint = None
+            
+        if fingerprint is not None and fingerprint == self._fingerprint:
+            self.logger.debug("Guest data unchanged since the last refresh - skipping")
+            return None
+            
+        guests = self.get_all_guests()
+        if guests:
+            self._fingerprint = fingerprint
+        return guests
+            
     def find_guest_by_id(self, original_id: int) -> Optional[GuestRecord]:
         """
         Find a specific guest by their original ID.
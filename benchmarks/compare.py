@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compare two benchmark result files and report regressions.
+
+Metrics ending in "per_sec" are better when higher; all other timing,
+API call and memory metrics are better when lower. Counters (check_ins,
+file sizes) are shown but never fail the comparison.
+
+Usage:
+    python benchmarks/compare.py baseline.json results.json [--threshold 15]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+INFORMATIONAL_SUFFIXES = ('_check_ins', '_kb')
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith('per_sec')
+
+
+def load_results(path: str) -> Dict[int, Dict[str, float]]:
+    """Load a result file as guest count -> metrics."""
+    with open(path, 'r') as f:
+        report = json.load(f)
+    return {entry['guests']: entry['metrics'] for entry in report.get('results', [])}
+
+
+def compare(baseline: Dict[int, Dict[str, float]], current: Dict[int, Dict[str, float]],
+            threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Compare metrics present in both result sets.
+
+    Returns:
+        Tuple[List[str], List[str]]: Report lines, regression lines
+    """
+    lines, regressions = [], []
+    for guests in sorted(set(baseline) & set(current)):
+        lines.append(f"{guests} guests")
+        for metric in sorted(set(baseline[guests]) & set(current[guests])):
+            old, new = baseline[guests][metric], current[guests][metric]
+            if old:
+                change = (new - old) / abs(old) * 100
+            else:
+                change = 0.0 if not new else float('inf')
+            worse = -change if higher_is_better(metric) else change
+            marker = ""
+            if not metric.endswith(INFORMATIONAL_SUFFIXES) and worse > threshold:
+                marker = "  REGRESSION"
+                regressions.append(f"{guests} guests: {metric} {old:.4g} -> {new:.4g} ({change:+.1f}%)")
+            lines.append(f"  {metric:<32} {old:>12.4g} {new:>12.4g} {change:+8.1f}%{marker}")
+    return lines, regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare TP_NFC benchmark results")
+    parser.add_argument('baseline', help="Baseline result file")
+    parser.add_argument('current', help="New result file")
+    parser.add_argument('--threshold', type=float, default=15.0, help="Allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    lines, regressions = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:g}%:")
+        print("\n".join(f"  {line}" for line in regressions))
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
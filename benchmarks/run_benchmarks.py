@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmarks for the scan -> registry -> queue -> Google Sheets pipeline.
+
+TagManager, CheckInQueue and GoogleSheetsService run unmodified against a
+virtual NFC reader and the local Sheets API emulator (tools/sheets_emulator.py).
+Each guest count runs in a scratch directory, so nothing under config/ is touched.
+
+Usage:
+    python benchmarks/run_benchmarks.py --guests 1000 5000 20000 --output results.json
+    python benchmarks/compare.py baseline.json results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sheets_emulator import SheetsEmulator
+from virtual_reader import VirtualReader
+from src.models import NFCTag
+from src.services.bulk_registration import BulkRegistration
+from src.services.google_sheets_service import GoogleSheetsService
+from src.services.station_daemon import StationDaemon
+from src.services.tag_manager import TagManager
+
+SCHEMA_VERSION = 1
+DEFAULT_GUESTS = [1000, 5000, 20000]
+GUI_STATION = "Lio"
+HEADLESS_STATION = "Juntos"
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def tag_uid(guest_id: int) -> str:
+    return f"BENCH{guest_id:08d}"
+
+
+@contextmanager
+def working_directory(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def quiet_logger() -> logging.Logger:
+    logger = logging.getLogger("TP_NFC_bench")
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    logger.setLevel(logging.WARNING)
+    return logger
+
+
+class Stack:
+    """TagManager + CheckInQueue + GoogleSheetsService wired to the emulator and a virtual reader."""
+
+    def __init__(self, guest_count: int, latency: float, logger: logging.Logger):
+        self.emulator = SheetsEmulator(latency=latency, seed=42)
+        self.emulator.load_guests(guest_count)
+        self.reader = VirtualReader()
+        self.sheets = GoogleSheetsService(
+            {'spreadsheet_id': 'benchmark', 'sheet_name': 'Sheet1', 'guest_cache_file': 'config/guest_cache.json'},
+            logger, service_factory=self.emulator.client)
+        self.sheets.authenticate()
+        self.tag_manager = TagManager(self.reader, self.sheets, logger, replica_id='bench')
+        # Sync is driven explicitly so its API calls can be counted
+        self.tag_manager.check_in_queue.stop_sync()
+        self.tag_manager.tag_registry.update({tag_uid(i): i for i in range(1, guest_count + 1)})
+        self.tag_manager.save_registry()
+
+    def close(self) -> None:
+        self.tag_manager.shutdown()
+
+
+def bench_load(stack: Stack) -> Dict[str, Any]:
+    """Full guest list download: time, API calls and memory held by the guest records."""
+    stack.emulator.reset_stats()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    guests = stack.sheets.get_all_guests()
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    load_cells = stack.emulator.stats['cells_read']
+    load_calls = stack.emulator.request_count
+
+    # Single-station kiosk refresh: only the station (and ID) columns are read
+    stack.emulator.reset_stats()
+    start = time.perf_counter()
+    stack.sheets.get_guests_for_view(stations=[GUI_STATION])
+    view_elapsed = time.perf_counter() - start
+    view_cells = stack.emulator.stats['cells_read']
+
+    # Scheduled refresh of an unchanged sheet: only the fingerprint probe runs
+    stack.sheets.get_guests_if_changed()
+    stack.emulator.reset_stats()
+    start = time.perf_counter()
+    stack.sheets.get_guests_if_changed()
+    probe_elapsed = time.perf_counter() - start
+    return {
+        'load_seconds': elapsed,
+        'load_api_calls': load_calls,
+        'load_cells_read': load_cells,
+        'view_refresh_seconds': view_elapsed,
+        'view_refresh_cells_read': view_cells,
+        'unchanged_refresh_seconds': probe_elapsed,
+        'unchanged_refresh_cells_read': stack.emulator.stats['cells_read'],
+        'memory_guests_mb': retained / 1024 / 1024,
+        'memory_load_peak_mb': peak / 1024 / 1024,
+        'memory_bytes_per_guest': retained / max(1, len(guests)),
+    }
+
+
+def bench_scans(stack: Stack, process, station_ids: List[int], prefix: str) -> Dict[str, Any]:
+    """Scan tags through a pipeline entry point; throughput, latency and API calls per scan."""
+    stack.reader.feed(tag_uid(i) for i in station_ids)
+    stack.emulator.reset_stats()
+    latencies = []
+    checked_in = 0
+    start = time.perf_counter()
+    for _ in station_ids:
+        scan_start = time.perf_counter()
+        tag = stack.reader.read_tag()
+        if process(tag):
+            checked_in += 1
+        latencies.append((time.perf_counter() - scan_start) * 1000)
+    elapsed = time.perf_counter() - start
+    return {
+        f'{prefix}_scans_per_sec': len(station_ids) / elapsed if elapsed else 0.0,
+        f'{prefix}_scan_p50_ms': percentile(latencies, 50),
+        f'{prefix}_scan_p99_ms': percentile(latencies, 99),
+        f'{prefix}_api_calls_per_scan': stack.emulator.request_count / len(station_ids),
+        f'{prefix}_check_ins': checked_in,
+    }
+
+
+def bench_sync(stack: Stack) -> Dict[str, Any]:
+    """Drain the check-in queue to the emulator; API calls and time per check-in."""
+    pending = stack.tag_manager.check_in_queue.get_queue_status()['pending']
+    stack.emulator.reset_stats()
+    start = time.perf_counter()
+    remaining = stack.tag_manager.check_in_queue.force_sync()
+    elapsed = time.perf_counter() - start
+    synced = max(1, pending - remaining)
+    return {
+        'sync_check_ins': pending - remaining,
+        'sync_api_calls_per_check_in': stack.emulator.request_count / synced,
+        'sync_ms_per_check_in': elapsed * 1000 / synced,
+    }
+
+
+def bench_bulk_registration(stack: Stack, guest_ids: List[int]) -> Dict[str, Any]:
+    """Pre-register a wristband for each guest through a bulk session, including the final flush."""
+    guests = [guest for guest in stack.sheets._cached_guests if guest.original_id in set(guest_ids)]
+    session = BulkRegistration(stack.tag_manager, guests, stack.tag_manager.logger)
+    stack.emulator.reset_stats()
+    latencies = []
+    start = time.perf_counter()
+    for guest in guests:
+        tap_start = time.perf_counter()
+        session.register(NFCTag(f"BULK{guest.original_id:08d}"))
+        latencies.append((time.perf_counter() - tap_start) * 1000)
+    session.stop()
+    elapsed = time.perf_counter() - start
+    count = max(1, len(guests))
+    return {
+        'bulk_register_tap_p50_ms': percentile(latencies, 50),
+        'bulk_register_ms_per_tag': elapsed * 1000 / count,
+        'bulk_register_api_calls_per_tag': stack.emulator.request_count / count,
+    }
+
+
+def bench_persistence(stack: Stack, guest_count: int, samples: int) -> Dict[str, Any]:
+    """Cost of one queue save and one registry save with every guest checked in / registered."""
+    queue = stack.tag_manager.check_in_queue
+    with queue.lock:
+        for guest_id in range(1, guest_count + 1):
+            queue.local_check_ins.setdefault(guest_id, {})['reception'] = "09:00"
+
+    bind_times = []
+    for guest_id in range(1, samples + 1):
+        start = time.perf_counter()
+        stack.tag_manager.bind_tag(tag_uid(guest_id), guest_id)
+        bind_times.append((time.perf_counter() - start) * 1000)
+
+    queue_times, registry_times = [], []
+    for _ in range(samples):
+        start = time.perf_counter()
+        queue.save_queue()
+        queue_times.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        stack.tag_manager.save_registry()
+        registry_times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'queue_save_ms': sum(queue_times) / samples,
+        'queue_save_p99_ms': percentile(queue_times, 99),
+        'queue_file_kb': queue.queue_file.stat().st_size / 1024,
+        'registry_save_ms': sum(registry_times) / samples,
+        'registry_save_p99_ms': percentile(registry_times, 99),
+        'registry_file_kb': stack.tag_manager.registry_file.stat().st_size / 1024,
+        'registry_bind_ms': sum(bind_times) / samples,
+        'registry_bind_p99_ms': percentile(bind_times, 99),
+    }
+
+
+def run_for(guest_count: int, scans: int, latency: float, persistence_samples: int) -> Dict[str, Any]:
+    """Run every benchmark for one guest count in a scratch directory."""
+    logger = quiet_logger()
+    with tempfile.TemporaryDirectory(prefix="tp_nfc_bench_") as workdir, working_directory(workdir):
+        stack = Stack(guest_count, latency, logger)
+        try:
+            scans = min(scans, guest_count)
+            step = max(1, guest_count // scans)
+            guest_ids = list(range(1, guest_count + 1, step))[:scans]
+
+            metrics = bench_load(stack)
+            metrics.update(bench_scans(
+                stack, lambda tag: stack.tag_manager.process_checkpoint_scan_with_tag(tag, GUI_STATION),
+                guest_ids, 'gui'))
+
+            daemon = StationDaemon(stack.reader, stack.sheets, stack.tag_manager, logger, HEADLESS_STATION)
+            daemon.refresh_guests()
+            metrics.update(bench_scans(
+                stack, lambda tag: (daemon.process_tag(tag) or {}).get('status') == 'checked_in',
+                guest_ids, 'headless'))
+
+            metrics.update(bench_sync(stack))
+            metrics.update(bench_bulk_registration(stack, guest_ids))
+            metrics.update(bench_persistence(stack, guest_count, persistence_samples))
+        finally:
+            stack.close()
+
+    if resource:
+        # ru_maxrss is KB on Linux, bytes on macOS
+        divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        metrics['rss_max_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor
+    return {'guests': guest_count, 'scans': len(guest_ids), 'metrics': metrics}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TP_NFC end-to-end benchmarks")
+    parser.add_argument('--guests', type=int, nargs='+', default=DEFAULT_GUESTS, help="Guest counts to benchmark")
+    parser.add_argument('--scans', type=int, default=200, help="Scans per pipeline and guest count")
+    parser.add_argument('--latency', type=float, default=0.0, help="Emulated Sheets API latency in seconds")
+    parser.add_argument('--persistence-samples', type=int, default=10, help="Saves timed per file")
+    parser.add_argument('--output', help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for guest_count in args.guests:
+        print(f"Benchmarking {guest_count} guests...", file=sys.stderr)
+        results.append(run_for(guest_count, args.scans, args.latency, args.persistence_samples))
+
+    report = {
+        'schema': SCHEMA_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'scans': args.scans, 'latency': args.latency, 'persistence_samples': args.persistence_samples},
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
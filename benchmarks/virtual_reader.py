@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Virtual NFC reader for benchmarks.
+Implements the NFC service interface used by TagManager and StationDaemon,
+returning tags from a scripted sequence of UIDs instead of hardware.
+"""
+
+from collections import deque
+from typing import Iterable, Optional
+
+from src.models import NFCTag
+
+
+class VirtualReader:
+    """NFC service stand-in that "scans" a queue of tag UIDs."""
+
+    def __init__(self, uids: Iterable[str] = ()):
+        """
+        Initialize virtual reader.
+
+        Args:
+            uids: Tag UIDs returned by successive read_tag() calls
+        """
+        self._uids = deque(uids)
+        self.is_connected = True
+        self.reads = 0
+        self.beeps = 0
+
+    def feed(self, uids: Iterable[str]) -> None:
+        """Queue more tag UIDs."""
+        self._uids.extend(uids)
+
+    def connect(self) -> bool:
+        self.is_connected = True
+        return True
+
+    def disconnect(self) -> None:
+        self.is_connected = False
+
+    def read_tag(self, timeout: int = 5) -> Optional[NFCTag]:
+        """Return the next queued tag, or None (as on a timeout) when the queue is empty."""
+        self.reads += 1
+        return NFCTag(self._uids.popleft()) if self._uids else None
+
+    def get_last_error_type(self) -> Optional[str]:
+        return None if self._uids else 'timeout'
+
+    def write_data_to_tag(self, tag_uid: str, data: str) -> bool:
+        return True
+
+    def cancel_read(self) -> None:
+        pass
+
+    def beep(self) -> None:
+        self.beeps += 1
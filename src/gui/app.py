@@ -17,10 +17,17 @@ import os
 import platform
 import json
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-import requests
+import queue
 import webbrowser
 
+from .guest_table import GuestTableModel
+from .summary_counters import SummaryCounters
+from ..services.connectivity_monitor import ConnectivityMonitor
+from ..services.bulk_registration import BulkRegistration
+from ..utils.log_tail import LogTail
+from ..utils.task_scheduler import TaskScheduler
+from ..utils.search_index import GuestSearchIndex
+
 # Configure CustomTkinter
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
@@ -126,8 +133,16 @@ class NFCApp(ctk.CTk):
     SYNC_STATUS_ERROR = "Sync Failed  ✕"
     
     # Internet connectivity test constants
-    TEST_INTERNET_URL = "http://www.google.com"
-    TEST_INTERNET_TIMEOUT = 4
+    CONNECTIVITY_POLL_MS = 500
+    LOG_VIEWER_MAX_LINES = 200
+    LOG_LEVEL_ICONS = {'CRITICAL': "🔴", 'ERROR': "🔴", 'WARNING': "🟡", 'INFO': "🔵", 'DEBUG': "⚪"}
+    LOG_VIEWER_FILTERS = {  # Filter label -> levels shown (None = everything)
+        "All": None,
+        "Info": ('INFO', 'WARNING', 'ERROR', 'CRITICAL'),
+        "Warning": ('WARNING', 'ERROR', 'CRITICAL'),
+        "Error": ('ERROR', 'CRITICAL'),
+    }
+    SEARCH_DEBOUNCE_MS = 150
     
 
     def __init__(self, config: dict, nfc_service, sheets_service, tag_manager, logger):
@@ -161,7 +176,12 @@ class NFCApp(ctk.CTk):
         self.show_all_stations = True  # False = current station only
         self.settings_visible = False  # Settings panel visibility
         self.is_rewrite_mode = False  # Rewrite tag mode
+        self._bulk_registration = None  # Active BulkRegistration while in bulk write mode
         self.guests_data = []
+        self._remote_redraw_job = None
+        self._search_index = GuestSearchIndex()  # Rebuilt lazily when guests_data changes
+        self._search_job = None  # Pending debounced search
+        self.summary_counters = SummaryCounters()  # Shown guests as a GuestTable: summary counts and completion
         self.is_scanning = False
         self._scanning_thread_active = False  # Track active scanning thread
         self.erase_confirmation_state = False  # Track erase button confirmation state
@@ -198,8 +218,9 @@ class NFCApp(ctk.CTk):
         self._gui_cached_stations = None
         self._station_cache_time = 0
 
-        # Thread pool management
-        self.thread_pool = ThreadPoolExecutor(max_workers=3)
+        # Background work runs on named lanes (NFC, sync, refresh, UI probes) so slow
+        # Sheets refreshes never hold up a scan
+        self.task_scheduler = TaskScheduler(self.logger)
         self._shutdown_event = threading.Event()
 
         # Window setup
@@ -247,12 +268,20 @@ class NFCApp(ctk.CTk):
         
         # Also refresh stations after a short delay to catch any initially failed dynamic station loading
         self.after(1000, self._delayed_station_refresh)
+
+        # Pre-load the other event tabs so switching events is instant
+        if len(self._event_tabs()) > 1:
+            self.after(3000, lambda: self.submit_background_task(
+                self.sheets_service.warm_tabs, self._event_tabs(),
+                lane=TaskScheduler.LANE_REFRESH, key="warm_tabs"))
         
         # Start periodic connection status check
         self.after(5000, self._periodic_status_check)
         
-        # Start lightweight internet monitoring (after initial load)
-        self.after(10000, self._check_internet_periodically)
+        # Start background connectivity monitoring; the UI only drains its state queue
+        self.connectivity_monitor = ConnectivityMonitor(self.logger, sheets_probe=self.sheets_service.get_available_stations)
+        self.connectivity_monitor.start()
+        self.after(self.CONNECTIVITY_POLL_MS, self._poll_connectivity)
 
         # Set up sync completion callback to update UI when background syncs complete
         self.tag_manager.set_sync_completion_callback(self.on_sync_complete)
@@ -310,10 +339,21 @@ class NFCApp(ctk.CTk):
             message, color
         )
 
-    def submit_background_task(self, func, *args):
-        """Submit background task to managed pool."""
+    def submit_background_task(self, func, *args, lane=TaskScheduler.LANE_NFC, **options):
+        """Submit background task to a scheduler lane (NFC by default).
+
+        Options (key, supersede, with_token, on_cancel) are passed to TaskScheduler.submit.
+        """
         if not self._shutdown_event.is_set():
-            return self.thread_pool.submit(func, *args)
+            return self.task_scheduler.submit(lane, func, *args, **options)
+        on_cancel = options.get('on_cancel')
+        if on_cancel:
+            on_cancel()
+
+    def _retry_scan_loop(self, loop):
+        """Re-run a scan loop whose scan task was dropped before it ran (lane full or cancelled)."""
+        if not self._shutdown_event.is_set():
+            self.after(500, loop)
 
     def on_closing(self):
         """Handle window close event."""
@@ -322,7 +362,7 @@ class NFCApp(ctk.CTk):
         if self._check_nfc_connection_timer:
             self.after_cancel(self._check_nfc_connection_timer)
         self.cleanup_widgets()
-        self.thread_pool.shutdown(wait=True, timeout=5)
+        self.task_scheduler.shutdown(wait=True, timeout=5)
         self.destroy()
         
     def start_nfc_connection_monitoring(self):
@@ -351,9 +391,29 @@ class NFCApp(ctk.CTk):
         """Check NFC reader connection status periodically."""
         if self._shutdown_event.is_set():
             return
-            
+
+        # Probe the reader on the UI-probe lane - reader enumeration can block
+        self.submit_background_task(
+            self._probe_nfc_connection,
+            lane=TaskScheduler.LANE_UI_PROBE,
+            key="nfc_probe",
+            supersede=True
+        )
+
+        # Schedule next check - more frequent when disconnected
+        check_interval = 2000 if self._nfc_connected else 5000  # 2s when connected, 5s when disconnected
+        self._check_nfc_connection_timer = self.after(check_interval, self.check_nfc_connection)
+
+    def _probe_nfc_connection(self):
+        """Read the reader connection state in the background and hand it to the UI thread."""
+        connected = self.nfc_service.is_connected
+        if not self._shutdown_event.is_set():
+            self.after(0, self._apply_nfc_connection_state, connected)
+
+    def _apply_nfc_connection_state(self, connected):
+        """Update UI for the probed NFC reader connection state."""
         was_connected = self._nfc_connected
-        self._nfc_connected = self.nfc_service.is_connected
+        self._nfc_connected = connected
         
         # Connection status changed
         if was_connected != self._nfc_connected:
@@ -388,12 +448,7 @@ class NFCApp(ctk.CTk):
                 # Update registration content to hide UI elements
                 elif self.is_registration_mode and not self.settings_visible:
                     self.update_mode_content()
-                
-                
-        # Schedule next check - more frequent when disconnected
-        check_interval = 2000 if self._nfc_connected else 5000  # 2s when connected, 5s when disconnected
-        self._check_nfc_connection_timer = self.after(check_interval, self.check_nfc_connection)
-        
+
     def _resume_appropriate_scanning(self):
         """Resume the appropriate scanning mode after NFC reconnection."""
         # Don't start if in settings or operation in progress
@@ -779,10 +834,9 @@ class NFCApp(ctk.CTk):
 
     def cleanup_widgets(self):
         """Clean up widget references to prevent memory leaks."""
-        if hasattr(self, 'guest_tree'):
+        if hasattr(self, 'guest_table'):
             # Clear all items before destroying
-            for item in self.guest_tree.get_children():
-                self.guest_tree.delete(item)
+            self.guest_table.clear()
 
         # Explicit cleanup of large data structures
         self.guests_data.clear()
@@ -1099,12 +1153,15 @@ class NFCApp(ctk.CTk):
         self.guest_tree = ttk.Treeview(
             table_container,
             columns=columns,
-            show="headings",
-            yscrollcommand=scrollbar.set
+            show="headings"
         )
-        scrollbar.configure(command=self.guest_tree.yview)
         self.guest_tree.pack(fill="both", expand=True)
 
+        # Virtualized row model: holds every guest row (A-Ö), materializes only the visible
+        # window in the Treeview and drives the scrollbar itself
+        self.guest_table = GuestTableModel(self.guest_tree, scrollbar)
+        scrollbar.configure(command=self.guest_table.yview)
+
         # Configure column headers and widths for both trees
         for tree in [self.summary_tree, self.guest_tree]:
             # Set initial headers (will be updated with guest count later)
@@ -1145,10 +1202,12 @@ class NFCApp(ctk.CTk):
         # Track editing state
         self.edit_entry = None
         self.edit_item = None
+        self.edit_guest_id = None
         self.edit_column = None
         
-        # Track internet connection status
+        # Track internet connection status (published by the connectivity monitor)
         self._internet_connected = True
+        self._sheets_status = ConnectivityMonitor.SHEETS_CONNECTED
 
         # Bind mouse motion for cursor changes and tooltips
         self.guest_tree.bind("<Motion>", self.on_tree_motion)
@@ -1178,58 +1237,17 @@ class NFCApp(ctk.CTk):
         self.guest_tree.tag_configure("complete", background=THEME_COLORS['treeview_complete_bg'], foreground=THEME_COLORS['treeview_complete_fg'])
         # Tag configurations moved to _update_treeview_theme() for theme consistency
 
-    def _is_guest_fully_checked_in(self, guest, available_stations):
-        """Check if guest is checked in at all available stations."""
-        for station in available_stations:
-            station_key = station.lower()
-            
-            # Check both local and sheets data
-            local_time = None
-            sheets_time = None
-            
-            # Get local check-ins
-            if hasattr(self, 'tag_manager'):
-                local_check_ins = self.tag_manager.get_all_local_check_ins()
-                guest_local_data = local_check_ins.get(guest.original_id, {})
-                local_time = guest_local_data.get(station_key)
-            
-            # Get Google Sheets data
-            if hasattr(guest, 'get_check_in_time'):
-                sheets_time = guest.get_check_in_time(station_key)
-            
-            # If neither local nor sheets has data for this station, not complete
-            if not sheets_time and not local_time:
-                return False
-        
-        return True
-
     def _update_row_styling(self, item, guest_id):
         """Update row styling after edit to reflect complete status."""
         try:
-            # Get stations based on current view mode
-            view_stations = self._get_filtered_stations_for_view()
-            
-            # Get the current values from the tree item
-            item_values = self.guest_tree.item(item)['values']
-            
-            # Check completion based on view mode
-            if self.show_all_stations:
-                # All stations mode: must have check-ins at ALL stations
-                fully_checked_in = self._is_guest_complete_all_stations(int(guest_id), view_stations, item_values)
-            else:
-                # Current station mode: only need check-in at current station
-                fully_checked_in = self._is_guest_complete_current_station(int(guest_id), item_values)
+            # Completion is checked against the stations of the current view mode
+            # (all stations, or only the current station)
+            fully_checked_in = self.summary_counters.table.is_complete(
+                int(guest_id), self._get_filtered_stations_for_view())
             
             # Apply appropriate styling
-            if fully_checked_in:
-                self.guest_tree.item(item, tags=["complete"])
-            else:
-                # Determine alternate row color
-                row_index = self.guest_tree.index(item)
-                if row_index % 2 == 0:
-                    self.guest_tree.item(item, tags=["even"])
-                else:
-                    self.guest_tree.item(item, tags=["odd"])
+            # Without tags the table model applies the alternate row color
+            self.guest_table.set_row(item, tags=["complete"] if fully_checked_in else [])
         except Exception as e:
             self.logger.debug(f"Error updating row styling: {e}")
 
@@ -1585,6 +1603,21 @@ class NFCApp(ctk.CTk):
         self.dev_mode_btn.bind("<Leave>", on_advanced_leave)
         self.dev_mode_btn.pack(pady=10)
 
+        # Event selector (one sheet tab per event), only if more than one is configured
+        event_tabs = self._event_tabs()
+        if len(event_tabs) > 1:
+            self.event_menu = ctk.CTkOptionMenu(
+                buttons_container,
+                values=event_tabs,
+                command=self.switch_event,
+                width=200,
+                height=40,
+                corner_radius=8,
+                font=self.fonts['button']
+            )
+            self.event_menu.set(self.sheets_service.sheet_name)
+            self.event_menu.pack(pady=10)
+
 
     def toggle_settings(self):
         """Toggle settings panel visibility or close register mode."""
@@ -1915,7 +1948,8 @@ class NFCApp(ctk.CTk):
             return
             
         if self.is_rewrite_mode and self.is_scanning:
-            self.submit_background_task(self._scan_for_rewrite)
+            self.submit_background_task(self._scan_for_rewrite,
+                                        on_cancel=lambda: self._retry_scan_loop(self._rewrite_scan_loop))
 
     def _scan_for_rewrite(self):
         """Scan for tag in rewrite mode with helpful status messages."""
@@ -2002,7 +2036,8 @@ class NFCApp(ctk.CTk):
             return
             
         if self.is_registration_mode and not self.is_checkpoint_mode and self.is_scanning:
-            self.submit_background_task(self._scan_for_registration)
+            self.submit_background_task(self._scan_for_registration,
+                                        on_cancel=lambda: self._retry_scan_loop(self._registration_scan_loop))
 
     def _scan_for_registration(self):
         """Scan for tag info in registration mode."""
@@ -2499,7 +2534,9 @@ class NFCApp(ctk.CTk):
         if should_scan and not self._scanning_thread_active:
             # Start scan in thread
             self._scanning_thread_active = True
-            self.submit_background_task(self._scan_for_checkin)
+            # A scan that never runs (lane full) must not block the next one
+            self.submit_background_task(self._scan_for_checkin,
+                                        on_cancel=lambda: setattr(self, '_scanning_thread_active', False))
         
         # Always schedule next check to keep scanning alive (reduced frequency for better lock responsiveness)
         if self.is_scanning:
@@ -2718,6 +2755,7 @@ class NFCApp(ctk.CTk):
                 f"✓ {result['guest_name']} checked in at {result['timestamp']}",
                 "#4CAF50"
             )
+            self._record_check_in(result['original_id'], result.get('station', self.current_station))
 
             # Delay refresh to ensure status is visible and sync has time to complete
             self.after(3000, lambda: self._checkin_processing_complete(True))
@@ -3305,42 +3343,23 @@ class NFCApp(ctk.CTk):
         )
         log_text.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Load and display logs
-        try:
-            log_file = Path(self.config['log_file'])
-            if log_file.exists():
-                with open(log_file, 'r') as f:
-                    log_content = f.read()
-
-                # Pretty format the logs
-                lines = log_content.split('\n')
-                formatted_lines = []
-
-                for line in lines:
-                    if not line.strip():
-                        continue
-
-                    # Color code by log level
-                    if ' - ERROR - ' in line:
-                        formatted_lines.append(f"🔴 {line}")
-                    elif ' - WARNING - ' in line:
-                        formatted_lines.append(f"🟡 {line}")
-                    elif ' - INFO - ' in line:
-                        formatted_lines.append(f"🔵 {line}")
-                    elif ' - DEBUG - ' in line:
-                        formatted_lines.append(f"⚪ {line}")
-                    else:
-                        formatted_lines.append(line)
-
-                # Show latest 200 lines
-                recent_lines = formatted_lines[-200:] if len(formatted_lines) > 200 else formatted_lines
-                log_text.insert("1.0", "\n".join(recent_lines))
+        # Level filter - shows lines at or above the selected level, taken from the tail's level index
+        log_tail = LogTail(self.config['log_file'], max_lines=self.LOG_VIEWER_MAX_LINES)
+        level_filter = ctk.CTkSegmentedButton(
+            log_window,
+            values=list(self.LOG_VIEWER_FILTERS),
+            command=lambda choice: self._render_log_lines(log_text, log_tail, choice)
+        )
+        level_filter.set("All")
+        level_filter.pack(before=log_frame, pady=(0, 5))
 
-                # Scroll to bottom
-                log_text.see("end")
+        # Load and display logs (only the tail of the file is read)
+        try:
+            log_tail.read_new()
+            if log_tail.path.exists():
+                self._render_log_lines(log_text, log_tail, "All")
             else:
                 log_text.insert("1.0", "No log file found.")
-
         except Exception as e:
             log_text.insert("1.0", f"Error loading logs: {e}")
 
@@ -3378,52 +3397,47 @@ class NFCApp(ctk.CTk):
         close_btn.pack(pady=(0, 20))
         
         # Set up auto-refresh
-        self._setup_log_auto_refresh(log_text, log_window)
-
-    def _setup_log_auto_refresh(self, text_widget, window):
-        """Set up auto-refresh for log content."""
+        self._setup_log_auto_refresh(log_text, log_window, log_tail, level_filter)
+
+    def _format_log_line(self, level, line):
+        """Decorate a log line with its level icon."""
+        icon = self.LOG_LEVEL_ICONS.get(level)
+        return f"{icon} {line}" if icon else line
+
+    def _render_log_lines(self, text_widget, log_tail, choice):
+        """Redraw the log viewer from the tail's in-memory index for the selected level filter."""
+        entries = log_tail.lines(self.LOG_VIEWER_FILTERS.get(choice))
+        text_widget.delete("1.0", "end")
+        text_widget.insert("1.0", "\n".join(self._format_log_line(level, line) for _, level, line in entries))
+        text_widget.see("end")
+
+    def _setup_log_auto_refresh(self, text_widget, window, log_tail, level_filter):
+        """Set up auto-refresh for log content (appends only lines written since the last poll)."""
         def refresh_logs():
             if not window.winfo_exists():
                 return
                 
             try:
-                # Clear current content
-                text_widget.delete("1.0", "end")
-                
-                # Reload log file
-                log_file = Path(self.config['log_file'])
-                if log_file.exists():
-                    with open(log_file, 'r') as f:
-                        log_content = f.read()
-
-                    # Pretty format the logs
-                    lines = log_content.split('\n')
-                    formatted_lines = []
-
-                    for line in lines:
-                        if not line.strip():
-                            continue
-
-                        # Color code by log level
-                        if ' - ERROR - ' in line:
-                            formatted_lines.append(f"🔴 {line}")
-                        elif ' - WARNING - ' in line:
-                            formatted_lines.append(f"🟡 {line}")
-                        elif ' - INFO - ' in line:
-                            formatted_lines.append(f"🔵 {line}")
-                        elif ' - DEBUG - ' in line:
-                            formatted_lines.append(f"⚪ {line}")
-                        else:
-                            formatted_lines.append(line)
-
-                    # Show latest 100 lines for better performance
-                    recent_lines = formatted_lines[-100:] if len(formatted_lines) > 100 else formatted_lines
-                    text_widget.insert("1.0", "\n".join(recent_lines))
+                new_entries = log_tail.read_new()
+
+                # Only append lines that pass the current level filter
+                levels = self.LOG_VIEWER_FILTERS.get(level_filter.get())
+                new_lines = [
+                    self._format_log_line(level, line)
+                    for _, level, line in new_entries
+                    if levels is None or level in levels
+                ]
+                if new_lines:
+                    prefix = "" if text_widget.compare("end-1c", "==", "1.0") else "\n"
+                    text_widget.insert("end", prefix + "\n".join(new_lines))
+
+                    # Keep the widget bounded to the most recent lines
+                    line_count = int(text_widget.index("end-1c").split(".")[0])
+                    if line_count > self.LOG_VIEWER_MAX_LINES:
+                        text_widget.delete("1.0", f"{line_count - self.LOG_VIEWER_MAX_LINES + 1}.0")
 
                     # Scroll to bottom
                     text_widget.see("end")
-                else:
-                    text_widget.insert("1.0", "No log file found.")
                     
                 # Schedule next refresh in 2 seconds
                 window.after(2000, refresh_logs)
@@ -3853,7 +3867,7 @@ class NFCApp(ctk.CTk):
         self.update_status("Clearing all data...", "warning")
 
         # Run in thread to avoid blocking UI
-        self.submit_background_task(self._clear_all_data_thread)
+        self.submit_background_task(self._clear_all_data_thread, lane=TaskScheduler.LANE_SYNC)
 
     def _clear_all_data_thread(self):
         """Thread function to clear all data."""
@@ -3903,6 +3917,11 @@ class NFCApp(ctk.CTk):
         # Set bulk write mode flag
         self.is_bulk_write_mode = True
         self.logger.info(f"Bulk write mode flag set: {self.is_bulk_write_mode}")
+
+        # Bindings are made locally and written to Google Sheets in batches
+        self._bulk_registration = BulkRegistration(
+            self.tag_manager, sorted(self.guests_data, key=lambda g: g.original_id), self.logger)
+        self._bulk_registration.start()
         
         # Update UI for bulk write mode
         self.update_settings_button()
@@ -3961,14 +3980,8 @@ class NFCApp(ctk.CTk):
             self.update_status("Invalid Guest ID format", "error")
             return
         
-        # Verify guest exists
-        guest_found = False
-        for guest in self.guests_data:
-            if guest.original_id == guest_id:
-                guest_found = True
-                break
-        
-        if not guest_found:
+        # Verify guest exists (and continue the guest list from there)
+        if not self._bulk_registration.seek(guest_id):
             self.update_status("Guest not found", "error")
             return
         
@@ -4046,27 +4059,16 @@ class NFCApp(ctk.CTk):
                 self.after(0, lambda: self.update_status("Could not read tag UUID", "error"))
                 return
             
-            # Register tag using the same mechanism as normal registration
+            # Bind locally; column E and the registry file are written in the next batch
             self.logger.info(f"Registering tag {tag_uuid} to guest {guest_id} using bulk write mode")
-            result = self.tag_manager.register_tag_to_guest_with_existing_tag(guest_id, tag)
+            result = self._bulk_registration.register(tag)
             
             if result:
-                # Also write UUID to Google Sheets column E (bulk write specific feature)
-                self.logger.info(f"Writing UUID {tag_uuid} to Google Sheets column E for guest {guest_id}")
-                sheets_success = self.sheets_service.write_wristband_uuid(guest_id, tag_uuid)
-                
-                if sheets_success:
-                    self.logger.info(f"Successfully registered tag {tag_uuid} to guest {guest_id} and wrote to column E")
-                    self.after(0, lambda: self.update_status("Tag registered", "success"))
-                else:
-                    self.logger.warning(f"Tag registered locally but failed to write UUID to Google Sheets column E for guest {guest_id}")
-                    self.after(0, lambda: self.update_status("Tag registered (local only)", "warning"))
-                    
-                # Clear the entry after successful write
-                self.after(2000, lambda: self.bulk_id_entry.delete(0, 'end') if hasattr(self, 'bulk_id_entry') else None)
-                self.after(2000, lambda: self.bulk_guest_name_label.configure(text="") if hasattr(self, 'bulk_guest_name_label') else None)
+                self.after(0, lambda: self.update_status(f"Tag registered: {result['guest_name']}", "success"))
+                # Move the entry on to the next guest in the list
+                self.after(0, self._show_next_bulk_guest)
             else:
-                self.after(0, lambda: self.update_status("Failed to register tag", "error"))
+                self.after(0, lambda: self.update_status("Tag already used for another guest", "error"))
         
         except Exception as e:
             self.logger.error(f"Bulk write error: {e}")
@@ -4087,9 +4089,24 @@ class NFCApp(ctk.CTk):
             
             self.after(0, lambda: self.update_status(display_msg, "error"))
 
+    def _show_next_bulk_guest(self):
+        """Prefill the bulk write entry with the next guest in the list."""
+        if not hasattr(self, 'bulk_id_entry'):
+            return
+        guest = self._bulk_registration.current
+        self.bulk_id_entry.delete(0, 'end')
+        if guest:
+            self.bulk_id_entry.insert(0, str(guest.original_id))
+        self._on_bulk_guest_id_change()
+
     def close_bulk_write_mode(self):
         """Close bulk write mode and return to main station."""
         self.is_bulk_write_mode = False
+
+        # Write the remaining bindings to Google Sheets
+        if self._bulk_registration:
+            self.submit_background_task(self._bulk_registration.stop, lane=TaskScheduler.LANE_SYNC)
+            self._bulk_registration = None
         
         # Update UI to show station buttons and normal hamburger menu
         self.update_settings_button()
@@ -4538,9 +4555,12 @@ class NFCApp(ctk.CTk):
             for tree in [self.summary_tree, self.guest_tree]:
                 # Configure the tree with registration columns
                 tree.configure(columns=columns)
-                
+
                 # Force column deletion and recreation to ensure clean state
-                tree.delete(*tree.get_children())
+                if tree is self.guest_tree:
+                    self.guest_table.clear()
+                else:
+                    tree.delete(*tree.get_children())
                 
                 # IMPORTANT: Hide all old station columns that might be lingering
                 # This ensures the TreeView recalculates its width properly
@@ -4621,50 +4641,6 @@ class NFCApp(ctk.CTk):
             # Return only current station
             return [self.current_station] if self.current_station in all_stations else [self.current_station]
 
-    def _is_guest_complete_all_stations(self, guest_id, available_stations, item_values):
-        """Check if guest has check-ins at all stations (original logic)."""
-        # Get local check-ins for this guest
-        local_checkins = self.tag_manager.get_all_local_check_ins().get(guest_id, {})
-        
-        # Station columns start at index 3 (after id, first, last)
-        for i, station in enumerate(available_stations):
-            col_index = i + 3
-            station_lower = station.lower()
-            
-            # Check tree value first
-            tree_has_checkin = False
-            if col_index < len(item_values):
-                value = item_values[col_index]
-                # A check-in exists if it starts with ✓ or has actual timestamp data
-                tree_has_checkin = value.startswith("✓") or (value not in ["-", "", "Check-in"])
-            
-            # Check local queue
-            local_has_checkin = station_lower in local_checkins
-            
-            # If neither tree nor local has check-in, not fully checked in
-            if not tree_has_checkin and not local_has_checkin:
-                return False
-        
-        return True
-
-    def _is_guest_complete_current_station(self, guest_id, item_values):
-        """Check if guest has check-in at current station only."""
-        # Get local check-ins for this guest
-        local_checkins = self.tag_manager.get_all_local_check_ins().get(guest_id, {})
-        current_station_lower = self.current_station.lower()
-        
-        # Find current station column (always at index 3 in single-station view)
-        if len(item_values) > 3:
-            value = item_values[3]
-            # Check tree value
-            tree_has_checkin = value.startswith("✓") or (value not in ["-", "", "Check-in"])
-            # Check local queue
-            local_has_checkin = current_station_lower in local_checkins
-            
-            return tree_has_checkin or local_has_checkin
-        
-        return False
-
     def on_sync_complete(self):
         """Called when background sync completes - refresh UI."""
         # Always refresh after sync completes to show updated data
@@ -4672,6 +4648,21 @@ class NFCApp(ctk.CTk):
         # Schedule refresh on main thread with slight delay to ensure data is ready
         self.after(500, lambda: self.refresh_guest_data(user_initiated=False))
 
+    def on_remote_update(self):
+        """Called from the hub client thread when another station checked in a guest or bound a tag."""
+        self.after(0, self._schedule_remote_redraw)
+
+    def _schedule_remote_redraw(self):
+        """Redraw the guest list from local data (no Google Sheets request), coalescing bursts."""
+        if self._remote_redraw_job is None:
+            self._remote_redraw_job = self.after(200, self._apply_remote_redraw)
+
+    def _apply_remote_redraw(self):
+        self._remote_redraw_job = None
+        if self.edit_entry or not self.guests_data:
+            return
+        self._update_guest_table_silent(self.guests_data)
+
     def _safe_background_refresh(self):
         """Safely refresh guest list in background."""
         if self.is_refreshing or self._active_operations > 0:
@@ -4679,13 +4670,77 @@ class NFCApp(ctk.CTk):
 
         self.is_refreshing = True
 
-        # Run refresh in background thread
-        self.submit_background_task(self._background_refresh_thread)
+        # Run refresh in background thread (repeated requests collapse into one)
+        self.submit_background_task(
+            self._background_refresh_thread,
+            lane=TaskScheduler.LANE_REFRESH,
+            key="background_refresh",
+            supersede=True,
+            on_cancel=lambda: setattr(self, 'is_refreshing', False)
+        )
+
+    def _event_tabs(self) -> List[str]:
+        """Sheet tabs that can be switched between (google_sheets.event_tabs, plus the active tab)."""
+        tabs = list(self.config.get('google_sheets', {}).get('event_tabs', []))
+        if self.sheets_service.sheet_name not in tabs:
+            tabs.insert(0, self.sheets_service.sheet_name)
+        return tabs
+
+    def switch_event(self, sheet_name: str):
+        """
+        Switch to another event's sheet tab.
+
+        The table is redrawn at once from the tab's cached guests (pre-loaded
+        at startup), then refreshed from the sheet in the background.
+
+        Args:
+            sheet_name: Tab name
+        """
+        if sheet_name == self.sheets_service.sheet_name:
+            return
+        try:
+            self.sheets_service = self.tag_manager.switch_sheet_tab(sheet_name)
+        except Exception as e:
+            self.logger.error(f"Failed to switch to event '{sheet_name}': {e}")
+            self.update_status(f"Could not open event '{sheet_name}'", "error")
+            return
+
+        self._gui_cached_stations = None
+        self.update_status(f"Event: {sheet_name}", "success")
+        cached_guests = list(self.sheets_service._cached_guests)
+        if cached_guests:
+            self._update_guest_table(cached_guests)
+        self.refresh_guest_data(user_initiated=False)
+
+    def _fetch_guests_for_view(self, full: bool = False) -> Optional[List]:
+        """
+        Fetch guests, reading only the columns the current view shows.
+
+        Single-station view refreshes just the current station column and
+        rewrite mode just the wristband column. Unless full is set, a cheap
+        fingerprint probe runs first and None is returned when nothing in
+        the view changed since the last refresh.
+
+        Args:
+            full: Read every column regardless of the view, without probing
+
+        Returns:
+            Optional[List]: Guests, or None if the view's data is unchanged
+        """
+        if full:
+            return self.sheets_service.get_all_guests()
+        if self.is_rewrite_mode:
+            return self.sheets_service.get_guests_if_changed(stations=[], wristbands=True)
+        if self.show_all_stations:
+            return self.sheets_service.get_guests_if_changed()
+        return self.sheets_service.get_guests_if_changed(stations=[self.current_station])
 
     def _background_refresh_thread(self):
         """Background thread for refreshing guest data."""
         try:
-            guests = self.sheets_service.get_all_guests()
+            guests = self._fetch_guests_for_view()
+            if guests is None:
+                return  # Unchanged - nothing to download or redraw
             # Update table on main thread
             self.after(0, self._update_guest_table_silent, guests)
         except Exception as e:
@@ -4727,11 +4782,7 @@ class NFCApp(ctk.CTk):
         # Get all local check-ins
         local_check_ins = self.tag_manager.get_all_local_check_ins()
 
-        # Clear table
-        for item in self.guest_tree.get_children():
-            self.guest_tree.delete(item)
-
-        # Get dynamic stations for summary row
+        # Get dynamic stations for summary row and table population
         try:
             available_stations = self._get_filtered_stations_for_view()
         except:
@@ -4740,21 +4791,16 @@ class NFCApp(ctk.CTk):
         # Add summary row showing checked-in counts per station
         self._add_summary_row(guests, available_stations, local_check_ins)
 
-        # Add guests
-        for i, guest in enumerate(guests):
+        # Build rows for all guests
+        rows = []
+        complete_ids = set(self.summary_counters.table.complete_ids(available_stations))
+        for guest in guests:
             values = [
                 guest.original_id,
                 guest.firstname,
                 guest.lastname
             ]
 
-            # Get dynamic stations
-            # Use cached stations for table population
-            try:
-                available_stations = self._get_filtered_stations_for_view()
-            except:
-                available_stations = self.config['stations']
-            
             # Add check-in status for each station
             for station in available_stations:
                 station_key = station.lower()
@@ -4782,23 +4828,20 @@ class NFCApp(ctk.CTk):
                 else:
                     values.append("-")
 
-            # Determine row styling
+            # No tags: the table model alternates row colors in display order
             tags = []
             
-            # Add alternate row coloring
-            row_index = len(self.guest_tree.get_children())
-            if row_index % 2 == 0:
-                tags.append("even")
-            else:
-                tags.append("odd")
-            
             # Check if guest is fully checked in at all stations
-            if self._is_guest_fully_checked_in(guest, available_stations):
+            if guest.original_id in complete_ids:
                 tags = ["complete"]  # Override alternate colors with green
             
-            item = self.guest_tree.insert("", "end", values=values, tags=tags)
+            rows.append((guest.original_id, values, tags))
 
-        # Ensure tags are configured after table rebuild (using THEME_COLORS constants)
+        # Apply only the rows that changed (sorted by Last Name A-Ö incrementally)
+        self._clear_hovered_item()
+        self.guest_table.sync(rows)
+
+        # Ensure tags are configured (using THEME_COLORS constants)
         if self.is_light_mode:
             odd_bg = THEME_COLORS['treeview_odd_row_light']
             even_bg = THEME_COLORS['treeview_even_row_light']
@@ -4814,9 +4857,6 @@ class NFCApp(ctk.CTk):
         # ALWAYS force orange hover (works in both light/dark themes)
         self.guest_tree.tag_configure("checkin_hover", background=THEME_COLORS['treeview_hover_bg'], foreground=THEME_COLORS['treeview_hover_fg'])
 
-        # Sort by Last Name A-Ö permanently
-        self._sort_by_lastname()
-
         # Update Google Sheets connection status
         self._update_sheets_connection_status()
             
@@ -4825,180 +4865,30 @@ class NFCApp(ctk.CTk):
 
     def _add_summary_row(self, guests, available_stations, local_check_ins):
         """Add a summary row showing checked-in counts per station or wristband stats."""
-        # Build summary values: show total guests in first column, other columns empty
-        total_guests = len(guests)
-        
-        # Registration mode - show wristband stats
-        if self.is_rewrite_mode:
-            # Count guests with wristbands
-            wristband_count = sum(1 for guest in guests if guest.wristband_uuid)
-            summary_values = [f"{wristband_count}/{total_guests}", "", "", ""]
-        # In single station mode, also show unchecked count
-        elif not self.show_all_stations and len(available_stations) == 1:
-            # Calculate unchecked count for the single station
-            station_key = available_stations[0].lower()
-            checked_count = 0
-            
-            for guest in guests:
-                sheets_time = guest.get_check_in_time(station_key)
-                local_time = local_check_ins.get(guest.original_id, {}).get(station_key)
-                
-                if sheets_time or local_time:
-                    checked_count += 1
-            
-            unchecked_count = total_guests - checked_count
-            summary_values = [f"{total_guests} guests ({unchecked_count} unchecked)", "", ""]
-        else:
-            # All stations mode - just show total guests
-            summary_values = [f"{total_guests} guests", "", ""]
-        
-        # Calculate checked-in count for each station
-        for station in available_stations:
-            station_key = station.lower()
-            checked_in_count = 0
-            
-            for guest in guests:
-                # Check both Google Sheets data and local queue
-                sheets_time = guest.get_check_in_time(station_key)
-                local_time = local_check_ins.get(guest.original_id, {}).get(station_key)
-                
-                if sheets_time or local_time:
-                    checked_in_count += 1
-            
-            # Add count - just the checked in number
-            summary_values.append(str(checked_in_count))
-        
-        # Clear and add to fixed summary tree
-        for item in self.summary_tree.get_children():
-            self.summary_tree.delete(item)
-        
-        summary_item = self.summary_tree.insert("", "end", values=summary_values, tags=["summary"])
-        
-        # Configure summary row styling - will be updated by theme system
-        # self.summary_tree.tag_configure("summary", background="#323232", foreground="white", font=("TkFixedFont", 14, "bold"))
-
-    def _sort_by_lastname(self):
-        """Sort guest list by Last Name A-Ö"""
-        items = self.guest_tree.get_children('')
-        
-        if not items:
-            return
-            
-        # Get guest data with last names for sorting
-        guest_data = []
-        for item in items:
-            values = self.guest_tree.item(item)['values']
-            if len(values) >= 3:  # Ensure we have lastname
-                lastname = values[2]  # Last name is in column 2
-                guest_data.append((lastname.lower(), item))  # Lowercase for proper sorting
-        
-        # Sort by lastname A-Ö
-        guest_data.sort(key=lambda x: x[0])
-        
-        # Reorder items
-        for index, (lastname, item) in enumerate(guest_data):
-            self.guest_tree.move(item, '', index)
+        # Full recount - only happens when the shown guest data is reloaded
+        self.summary_counters.reload(guests, available_stations, local_check_ins)
+        self._render_summary_row()
+
+    def _render_summary_row(self):
+        """Write the current summary counters into the fixed summary tree."""
+        summary_values = self.summary_counters.summary_values(
+            rewrite_mode=self.is_rewrite_mode,
+            single_station=not self.show_all_stations
+        )
 
-    def _update_summary_row_immediate(self):
-        """Update just the summary row immediately without refreshing the entire table."""
-        # Get all guest items from main tree (no summary row here now)
-        guest_items = self.guest_tree.get_children('')
-        
-        if not guest_items:
-            return
-            
-        # Get dynamic stations
-        try:
-            available_stations = self._get_filtered_stations_for_view()
-        except:
-            available_stations = self.config['stations']
-        
-        # Build new summary values: show total guests in first column, other columns empty
-        total_guests = len(guest_items)
-        
-        # Get local check-ins for current counts
-        local_check_ins = self.tag_manager.get_all_local_check_ins()
-        
-        # In single station mode, also show unchecked count
-        if not self.show_all_stations and len(available_stations) == 1:
-            # Calculate unchecked count for the single station
-            station_key = available_stations[0].lower()
-            checked_count = 0
-            
-            for guest_item in guest_items:
-                guest_values = self.guest_tree.item(guest_item)['values']
-                if len(guest_values) >= 3:
-                    guest_id = int(guest_values[0])
-                    
-                    # Find the station column index
-                    station_col_index = None
-                    for i, col_station in enumerate(available_stations):
-                        if col_station.lower() == station_key:
-                            station_col_index = i + 3  # +3 for id, first, last columns
-                            break
-                    
-                    if station_col_index and station_col_index < len(guest_values):
-                        # Check tree value
-                        tree_value = guest_values[station_col_index]
-                        tree_has_checkin = tree_value not in ["-", "", "Check-in"]
-                        
-                        # Check local queue
-                        local_has_checkin = local_check_ins.get(guest_id, {}).get(station_key)
-                        
-                        if tree_has_checkin or local_has_checkin:
-                            checked_count += 1
-            
-            unchecked_count = total_guests - checked_count
-            summary_values = [f"{total_guests} guests ({unchecked_count} unchecked)", "", ""]
-        else:
-            # All stations mode - just show total guests
-            summary_values = [f"{total_guests} guests", "", ""]
-        
-        # Calculate checked-in count for each station based on current tree values
-        for station in available_stations:
-            station_key = station.lower()
-            checked_in_count = 0
-            
-            for guest_item in guest_items:
-                guest_values = self.guest_tree.item(guest_item)['values']
-                if len(guest_values) >= 3:
-                    guest_id = int(guest_values[0])
-                    
-                    # Find the station column index
-                    station_col_index = None
-                    for i, col_station in enumerate(available_stations):
-                        if col_station.lower() == station_key:
-                            station_col_index = i + 3  # +3 for id, first, last columns
-                            break
-                    
-                    if station_col_index and station_col_index < len(guest_values):
-                        # Check tree value
-                        tree_value = guest_values[station_col_index]
-                        tree_has_checkin = tree_value not in ["-", "", "Check-in"]
-                        
-                        # Check local queue
-                        local_has_checkin = local_check_ins.get(guest_id, {}).get(station_key)
-                        
-                        if tree_has_checkin or local_has_checkin:
-                            checked_in_count += 1
-            
-            # Add count - just the checked in number
-            summary_values.append(str(checked_in_count))
-        
-        # Update the summary tree
         summary_items = self.summary_tree.get_children('')
         if summary_items:
             self.summary_tree.item(summary_items[0], values=summary_values)
+        else:
+            self.summary_tree.insert("", "end", values=summary_values, tags=["summary"])
 
-    def _check_internet_connection(self):
-        """Check internet connectivity with simple HTTP request."""
-        try:
-            response = requests.get(self.TEST_INTERNET_URL, timeout=self.TEST_INTERNET_TIMEOUT, stream=True)
-            response.raise_for_status()
-            response.close()
-            return True
-        except:
-            return False
+        # Configure summary row styling - will be updated by theme system
+        # self.summary_tree.tag_configure("summary", background="#323232", foreground="white", font=("TkFixedFont", 14, "bold"))
+
+    def _record_check_in(self, guest_id, station, checked=True):
+        """Apply a single check-in (or clear) to the shown guest table and the summary row."""
+        if self.summary_counters.set_checked(int(guest_id), station, checked):
+            self._render_summary_row()
 
     def _periodic_status_check(self):
         """Periodically check connection status and update sync indicator."""
@@ -5008,6 +4898,13 @@ class NFCApp(ctk.CTk):
                 self._update_sheets_connection_status()
             finally:
                 self._sheets_refresh_lock.release()
+
+        # Report background queue depths when work is backing up
+        metrics = self.task_scheduler.metrics()
+        if any(lane['queued'] for lane in metrics.values()):
+            self.logger.debug("Task queues: " + ", ".join(
+                f"{name}={lane['queued']} queued/{lane['running']} running" for name, lane in metrics.items()
+            ))
         
         # Schedule next check in 10 seconds
         self.after(10000, self._periodic_status_check)
@@ -5034,67 +4931,43 @@ class NFCApp(ctk.CTk):
                 # Widget was destroyed, ignore the error
                 pass
 
-    def _check_internet_periodically(self):
-        """Lightweight periodic internet check that updates status only."""
+    def _poll_connectivity(self):
+        """Apply connectivity changes published by the background monitor (no network I/O here)."""
         try:
-            # Quick check without blocking
-            current_status = self._check_internet_connection()
-            old_status = self._internet_connected
-            
-            # Update status if changed
-            if current_status != old_status:
-                self._internet_connected = current_status
-                if not current_status:
-                    # Internet lost
-                    self.sync_status_label.configure(text=self.SYNC_STATUS_NO_INTERNET, text_color="#f44336")
-                else:
-                    # Internet restored - check Google Sheets and refresh data
-                    self.logger.info("Internet connection restored - triggering data refresh")
-                    self._update_sheets_connection_status()
-                    # Trigger refresh like Cmd+R to sync any changes that occurred while offline
-                    self.refresh_guest_data()
-                    
-        except Exception as e:
-            # Don't log errors to avoid spam
+            while True:
+                self._apply_connectivity_state(self.connectivity_monitor.updates.get_nowait())
+        except queue.Empty:
             pass
-        
-        # Schedule next check in 10 seconds
-        self.after(10000, self._check_internet_periodically)
 
+        self.after(self.CONNECTIVITY_POLL_MS, self._poll_connectivity)
 
-    def _update_sheets_connection_status(self):
-        """Update Google Sheets connection status in sync label."""
-        try:
-            # First check if we have internet (from background monitoring)
-            if not self._internet_connected:
-                self.sync_status_label.configure(text=self.SYNC_STATUS_NO_INTERNET, text_color="#f44336")
-                return
+    def _apply_connectivity_state(self, state):
+        """Update connection status from a monitor state change."""
+        old_status = self._internet_connected
+        self._internet_connected = state.internet
+        self._sheets_status = state.sheets_status
+        self._update_sheets_connection_status()
 
-            # Then check Google Sheets specifically
-            if hasattr(self, 'sheets_service') and self.sheets_service:
-                # Try a simple operation to test connectivity
-                stations = self.sheets_service.get_available_stations()
-                if stations:
-                    # Successfully connected
-                    self.sync_status_label.configure(text=self.SYNC_STATUS_CONNECTED, text_color="#4CAF50")
-                else:
-                    # Connected but no data
-                    self.sync_status_label.configure(text=self.SYNC_STATUS_EMPTY, text_color="#ff9800")
-            else:
-                # No sheets service
-                self.sync_status_label.configure(text=self.SYNC_STATUS_OFFLINE, text_color="#f44336")
-        except Exception as e:
-            # Check if it's a rate limiting issue first
-            if "429" in str(e) or "quota" in str(e).lower():
-                self.sync_status_label.configure(text=self.SYNC_STATUS_RATE_LIMITED, text_color="#ff9800")
-            else:
-                # For other Google Sheets specific errors, check internet again
-                if self._check_internet_connection():
-                    # Internet is fine, Google Sheets service issue
-                    self.sync_status_label.configure(text=self.SYNC_STATUS_OFFLINE, text_color="#f44336")
-                else:
-                    # No internet connection
-                    self.sync_status_label.configure(text=self.SYNC_STATUS_NO_INTERNET, text_color="#f44336")
+        if state.internet and not old_status:
+            # Internet restored - refresh like Cmd+R to sync any changes that occurred while offline
+            self.logger.info("Internet connection restored - triggering data refresh")
+            self.refresh_guest_data()
+
+    def _update_sheets_connection_status(self):
+        """Update Google Sheets connection status in sync label from the last monitored state."""
+        if not self._internet_connected:
+            text, color = self.SYNC_STATUS_NO_INTERNET, "#f44336"
+        elif not getattr(self, 'sheets_service', None):
+            text, color = self.SYNC_STATUS_OFFLINE, "#f44336"
+        elif self._sheets_status == ConnectivityMonitor.SHEETS_CONNECTED:
+            text, color = self.SYNC_STATUS_CONNECTED, "#4CAF50"
+        elif self._sheets_status == ConnectivityMonitor.SHEETS_EMPTY:
+            text, color = self.SYNC_STATUS_EMPTY, "#ff9800"
+        elif self._sheets_status == ConnectivityMonitor.SHEETS_RATE_LIMITED:
+            text, color = self.SYNC_STATUS_RATE_LIMITED, "#ff9800"
+        else:
+            text, color = self.SYNC_STATUS_OFFLINE, "#f44336"
+        self.safe_update_widget('sync_status_label', lambda w, t, tc: w.configure(text=t, text_color=tc), text, color)
 
     def toggle_theme(self):
         """Toggle between light and dark mode."""
@@ -5269,8 +5142,8 @@ class NFCApp(ctk.CTk):
         if user_initiated:
             self.logger.info("Manual refresh guest data requested")
             
-        # Quick internet check (no logging for performance)
-        internet_check = self._check_internet_connection()
+        # Ask for a fresh connectivity probe; this refresh uses the last known state
+        self.connectivity_monitor.check_now()
             
         # Skip if editing is in progress
         if self.edit_entry:
@@ -5278,15 +5151,8 @@ class NFCApp(ctk.CTk):
                 self.update_status("Cannot refresh while editing", "warning")
             return
             
-        # Skip if already refreshing
-        if not self._sheets_refresh_lock.acquire(blocking=False):
-            if user_initiated:
-                self.update_status("Refresh already in progress", "warning")
-            return
-            
-        # Update internet connection status
-        self._internet_connected = internet_check
-        if not internet_check:
+        # Report last known internet connection status
+        if not self._internet_connected:
             self.logger.info(f"No internet connection detected - will attempt to use cached data (user_initiated: {user_initiated})")
             self.sync_status_label.configure(text=self.SYNC_STATUS_NO_INTERNET, text_color="#f44336")
 
@@ -5301,16 +5167,33 @@ class NFCApp(ctk.CTk):
 
         self._is_user_initiated_refresh = user_initiated
 
-        # Run in thread
-        self.submit_background_task(self._refresh_guest_data_thread)
+        # Run in thread; a newer refresh cancels a queued or running older one
+        self.submit_background_task(
+            self._refresh_guest_data_thread,
+            lane=TaskScheduler.LANE_REFRESH,
+            key="refresh",
+            supersede=True,
+            with_token=True
+        )
 
-    def _refresh_guest_data_thread(self):
+    def _refresh_guest_data_thread(self, token=None):
         """Thread function for refreshing data."""
+        # Held while refreshing so the periodic status check skips its own Sheets probe
+        self._sheets_refresh_lock.acquire()
         try:
             # Always try to get guests - the sheets service will return cached data if offline
             self.logger.info(f"Attempting to get guests. Internet connected: {self._internet_connected}")
-            guests = self.sheets_service.get_all_guests()
+            # User-initiated refreshes re-read every column (picks up name and phone edits)
+            guests = self._fetch_guests_for_view(full=getattr(self, '_is_user_initiated_refresh', False))
+            if guests is None:
+                self.logger.debug("Guest data unchanged - skipping table update")
+                self.after(0, self._update_sheets_connection_status)
+                return
             self.logger.info(f"Retrieved {len(guests)} guests from sheets service")
+
+            # Superseded or shutting down - don't apply stale data
+            if token and token.cancelled:
+                return
             
             # Show offline message if no internet and user initiated
             if not self._internet_connected and hasattr(self, '_is_user_initiated_refresh') and self._is_user_initiated_refresh:
@@ -5326,13 +5209,12 @@ class NFCApp(ctk.CTk):
             self.logger.error(f"Failed to fetch from Google Sheets: {e}")
             # Try to get cached data from sheets service as fallback
             try:
+                # No tag registry sync: cached data may predate recent bindings
                 cached_guests = getattr(self.sheets_service, '_cached_guests', [])
                 self.logger.info(f"Using fallback cached data: {len(cached_guests)} guests")
-                self.tag_manager.sync_tag_registry_with_sheets(cached_guests)
                 self.after(0, self._update_guest_table, cached_guests)
             except:
                 # Final fallback to existing app data
-                self.tag_manager.sync_tag_registry_with_sheets(self.guests_data)
                 self.after(0, self._update_guest_table, self.guests_data)
             # Only show cached data message for user-initiated refreshes, not automatic ones
             if hasattr(self, '_is_user_initiated_refresh') and self._is_user_initiated_refresh:
@@ -5352,14 +5234,7 @@ class NFCApp(ctk.CTk):
         registry_stats = self.tag_manager.get_registry_stats()
         sync_complete = registry_stats['pending_syncs'] == 0
 
-        # Clear table
-        for item in self.guest_tree.get_children():
-            self.guest_tree.delete(item)
-
-        # Reset hover state since all items are deleted
-        self.hovered_item = None
-
-        # Get dynamic stations for summary row
+        # Get dynamic stations for summary row and table population
         try:
             available_stations = self._get_filtered_stations_for_view()
         except:
@@ -5371,8 +5246,10 @@ class NFCApp(ctk.CTk):
         # Track discrepancies for re-sync
         discrepancies = []
 
-        # Add guests
-        for i, guest in enumerate(guests):
+        # Build rows for all guests
+        rows = []
+        complete_ids = set(self.summary_counters.table.complete_ids(available_stations))
+        for guest in guests:
             values = [
                 guest.original_id,
                 guest.firstname,
@@ -5387,13 +5264,6 @@ class NFCApp(ctk.CTk):
                 else:
                     values.append("-")  # No wristband registered
             else:
-                # Get dynamic stations
-                # Use cached stations for table population
-                try:
-                    available_stations = self._get_filtered_stations_for_view()
-                except:
-                    available_stations = self.config['stations']
-                
                 # Add check-in status for each station
                 for station in available_stations:
                     station_key = station.lower()
@@ -5427,33 +5297,30 @@ class NFCApp(ctk.CTk):
                     else:
                         values.append("-")
 
-            # Determine row styling
+            # No tags: the table model alternates row colors in display order
             tags = []
             
-            # Add alternate row coloring
-            row_index = len(self.guest_tree.get_children())
-            if row_index % 2 == 0:
-                tags.append("even")
-            else:
-                tags.append("odd")
-            
             if self.is_rewrite_mode:
                 # Registration mode: highlight guests with registered wristbands
                 if guest.wristband_uuid:
                     tags = ["complete"]  # Use green highlighting for registered wristbands
             else:
                 # Check if guest is fully checked in at all stations
-                if self._is_guest_fully_checked_in(guest, available_stations):
+                if guest.original_id in complete_ids:
                     tags = ["complete"]  # Override alternate colors with green
             
-            item = self.guest_tree.insert("", "end", values=values, tags=tags)
+            rows.append((guest.original_id, values, tags))
+
+        # Apply only the rows that changed (sorted by Last Name A-Ö incrementally)
+        self._clear_hovered_item()
+        self.guest_table.sync(rows)
 
         # Handle discrepancies - re-sync items that should be synced but aren't
         if discrepancies:
             self.logger.warning(f"Found {len(discrepancies)} sync discrepancies, re-syncing...")
             self._handle_sync_discrepancies(discrepancies)
 
-        # Ensure tags are configured after table rebuild (using THEME_COLORS constants)
+        # Ensure tags are configured (using THEME_COLORS constants)
         if self.is_light_mode:
             odd_bg = THEME_COLORS['treeview_odd_row_light']
             even_bg = THEME_COLORS['treeview_even_row_light']
@@ -5469,9 +5336,6 @@ class NFCApp(ctk.CTk):
         # ALWAYS force orange hover (works in both light/dark themes)
         self.guest_tree.tag_configure("checkin_hover", background=THEME_COLORS['treeview_hover_bg'], foreground=THEME_COLORS['treeview_hover_fg'])
 
-        # Sort by Last Name A-Ö permanently
-        self._sort_by_lastname()
-
         # Update Google Sheets connection status
         self._update_sheets_connection_status()
 
@@ -5527,14 +5391,21 @@ class NFCApp(ctk.CTk):
             # Refresh after re-sync attempts
             self.after(1000, lambda: self.refresh_guest_data(user_initiated=False))
 
-        # Run re-sync in background thread
-        thread = threading.Thread(target=_resync_thread)
-        thread.daemon = True
-        thread.start()
+        # Run re-sync in background (one pending re-sync at a time)
+        self.submit_background_task(_resync_thread, lane=TaskScheduler.LANE_SYNC, key="resync", supersede=True)
 
     def _on_search_change(self):
-        """Handle search field changes - restart timer and filter list."""
+        """Handle search field changes - restart timer and filter list once typing pauses."""
         self._restart_settings_timer()  # Restart timer on search interaction
+
+        # Debounce keystrokes so fast typing filters once instead of per character
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self):
+        """Run the debounced search."""
+        self._search_job = None
         self.filter_guest_list()
 
     def clear_search(self):
@@ -5544,54 +5415,35 @@ class NFCApp(ctk.CTk):
 
     def filter_guest_list(self):
         """Filter guest list based on search with smart multi-word matching."""
-        search_term = self.search_var.get().strip().lower()
+        search_term = self.search_var.get().strip()
 
         if not search_term:
             # Show all guests if search is empty
             self._update_guest_table(self.guests_data)
             return
 
+        # Rebuild the search index only when the guest data has changed
+        if not self._search_index.is_current(self.guests_data):
+            self._search_index.build(self.guests_data)
+
         # Get all local check-ins
         local_check_ins = self.tag_manager.get_all_local_check_ins()
 
-        # Clear table
-        for item in self.guest_tree.get_children():
-            self.guest_tree.delete(item)
-
-        # Split search into words for smart matching
-        search_words = search_term.split()
-
         # Get dynamic stations for summary row
         try:
             available_stations = self._get_filtered_stations_for_view()
         except:
             available_stations = self.config['stations']
 
-        # Collect filtered guests first to calculate summary
-        filtered_guests = []
-        
-        # Filter guests based on search
-        for guest in self.guests_data:
-            # Create searchable text from all guest fields
-            guest_text = f"{guest.original_id} {guest.firstname} {guest.lastname} {guest.full_name}".lower()
-
-            # Check if guest matches search
-            matches = False
-
-            if len(search_words) == 1:
-                # Single word search - check if it appears anywhere
-                matches = search_words[0] in guest_text
-            else:
-                # Multi-word search - all words must appear somewhere (order independent)
-                matches = all(word in guest_text for word in search_words)
-
-            if matches:
-                filtered_guests.append(guest)
+        # Multi-word, accent-insensitive search - all words must appear somewhere (order independent)
+        filtered_guests = self._search_index.search(search_term)
 
         # Add summary row for filtered results
         self._add_summary_row(filtered_guests, available_stations, local_check_ins)
 
-        # Add filtered guests to table
+        # Build rows for filtered guests
+        rows = []
+        complete_ids = set(self.summary_counters.table.complete_ids(available_stations))
         for guest in filtered_guests:
             values = [
                 guest.original_id,
@@ -5622,24 +5474,18 @@ class NFCApp(ctk.CTk):
                 else:
                     values.append("-")
 
-            # Determine row styling
+            # No tags: the table model alternates row colors in display order
             tags = []
             
-            # Add alternate row coloring
-            row_index = len(self.guest_tree.get_children())
-            if row_index % 2 == 0:
-                tags.append("even")
-            else:
-                tags.append("odd")
-            
             # Check if guest is fully checked in at all stations
-            if self._is_guest_fully_checked_in(guest, available_stations):
+            if guest.original_id in complete_ids:
                 tags = ["complete"]  # Override alternate colors with green
             
-            item = self.guest_tree.insert("", "end", values=values, tags=tags)
+            rows.append((guest.original_id, values, tags))
 
-        # Sort by Last Name A-Ö permanently
-        self._sort_by_lastname()
+        # Apply only the rows that changed (sorted by Last Name A-Ö incrementally)
+        self._clear_hovered_item()
+        self.guest_table.sync(rows, keep_position=False)
 
     def on_cell_double_click(self, event):
         """Handle double-click on treeview cell for editing or selection."""
@@ -5680,6 +5526,7 @@ class NFCApp(ctk.CTk):
         # Create entry widget
         self.edit_entry = tk.Entry(self.guest_tree, justify='center')
         self.edit_item = item
+        self.edit_guest_id = self.guest_table.guest_for_item(item)
         self.edit_column = col_num
         
         # Set current value
@@ -5723,13 +5570,12 @@ class NFCApp(ctk.CTk):
         self._saving_edit = True
         
         try:
-            # Check if the item still exists
-            try:
-                item_values = list(self.guest_tree.item(self.edit_item)['values'])
-            except Exception:
-                # Item was deleted (likely from a refresh)
+            # Check the row still shows the guest being edited (pooled rows are recycled on scroll/refresh)
+            item_values = self.guest_table.row_values(self.edit_guest_id)
+            if item_values is None or self.guest_table.guest_for_item(self.edit_item) != self.edit_guest_id:
                 self.cancel_edit()
                 return
+            item_values = list(item_values)
             
             new_value = self.edit_entry.get().strip()
             guest_id = item_values[0]
@@ -5753,14 +5599,14 @@ class NFCApp(ctk.CTk):
                 item_values[edited_column] = "-"
             
             # Update the tree immediately
-            self.guest_tree.item(edited_item, values=item_values)
+            self.guest_table.set_row(edited_item, values=item_values)
+            
+            # Update the guest's station mask and the summary row immediately
+            self._record_check_in(guest_id, station_name, bool(new_value))
             
             # Check if we need to update row styling (for complete status)
             self._update_row_styling(edited_item, guest_id)
             
-            # Update summary row immediately to reflect the change
-            self._update_summary_row_immediate()
-            
             # Use queue system to avoid rate limiting, but don't refresh immediately
             # The sync completion callback will handle refreshes automatically
             def update_checkin():
@@ -5785,7 +5631,7 @@ class NFCApp(ctk.CTk):
                     self.logger.error(f"Error updating check-in: {e}")
             
             # Run in background thread
-            self.thread_pool.submit(update_checkin)
+            self.submit_background_task(update_checkin, lane=TaskScheduler.LANE_CHECKIN)
         
         finally:
             self._saving_edit = False
@@ -5796,6 +5642,7 @@ class NFCApp(ctk.CTk):
             self.edit_entry.destroy()
             self.edit_entry = None
         self.edit_item = None
+        self.edit_guest_id = None
         self.edit_column = None
         self._saving_edit = False
         # Unbind global click
@@ -5957,9 +5804,7 @@ class NFCApp(ctk.CTk):
         self._countdown_rewrite_check(5)
 
         # Start tag check operation
-        thread = threading.Thread(target=self._check_tag_registration_thread, args=(guest_id,))
-        thread.daemon = True
-        thread.start()
+        self.submit_background_task(self._check_tag_registration_thread, guest_id)
 
     def _countdown_rewrite_check(self, countdown: int):
         """Show countdown for register operation."""
@@ -6121,9 +5966,7 @@ class NFCApp(ctk.CTk):
             # Exit button handled by red X settings button - no separate exit button needed
 
             # Execute rewrite in background thread
-            thread = threading.Thread(target=self._execute_rewrite_thread, args=(guest_id, tag))
-            thread.daemon = True
-            thread.start()
+            self.submit_background_task(self._execute_rewrite_thread, guest_id, tag)
 
         rewrite_btn = ctk.CTkButton(
             button_frame,
@@ -6198,9 +6041,7 @@ class NFCApp(ctk.CTk):
         self.update_status("Writing to tag...", "info")
 
         # Execute rewrite using the already-detected tag
-        thread = threading.Thread(target=self._execute_rewrite_thread, args=(guest_id, tag))
-        thread.daemon = True
-        thread.start()
+        self.submit_background_task(self._execute_rewrite_thread, guest_id, tag)
 
     def _execute_rewrite_thread(self, guest_id: int, tag):
         """Execute the actual rewrite operation."""
@@ -6223,8 +6064,7 @@ class NFCApp(ctk.CTk):
 
             # Register the tag locally first
             tag.register_to_guest(guest_id, guest.full_name)
-            self.tag_manager.tag_registry[tag.uid] = guest_id
-            self.tag_manager.save_registry()
+            self.tag_manager.bind_tag(tag.uid, guest_id)
 
             # Create result dict for immediate UI update
             result = {
@@ -6407,15 +6247,7 @@ class NFCApp(ctk.CTk):
         if region == "heading":
             # Clear any existing hover and tooltip when over headers
             self._clear_tooltip()
-            if self.hovered_item:
-                try:
-                    current_tags = list(self.guest_tree.item(self.hovered_item, "tags"))
-                    if "checkin_hover" in current_tags:
-                        current_tags.remove("checkin_hover")
-                        self.guest_tree.item(self.hovered_item, tags=current_tags)
-                except tk.TclError:
-                    pass
-                self.hovered_item = None
+            self._clear_hovered_item()
             return
         
         # Get the item and column under mouse
@@ -6438,21 +6270,8 @@ class NFCApp(ctk.CTk):
             if column_index >= 3 and column_index < 3 + len(available_stations):
                 values = self.guest_tree.item(item, "values")
                 if len(values) > column_index and values[column_index] == "Check-in":
-                    # Clear previous hover
-                    if self.hovered_item:
-                        try:
-                            current_tags = list(self.guest_tree.item(self.hovered_item, "tags"))
-                            if "checkin_hover" in current_tags:
-                                current_tags.remove("checkin_hover")
-                                self.guest_tree.item(self.hovered_item, tags=current_tags)
-                        except tk.TclError:
-                            pass
-                    
-                    # Apply hover styling to check-in button
-                    current_tags = list(self.guest_tree.item(item, "tags"))
-                    if "checkin_hover" not in current_tags:
-                        current_tags.append("checkin_hover")
-                        self.guest_tree.item(item, tags=current_tags)
+                    # Apply hover styling to check-in button (moves it off the previous row)
+                    self.guest_table.set_hover(item)
                     self.hovered_item = item
 
                     # Set hand cursor
@@ -6468,77 +6287,64 @@ class NFCApp(ctk.CTk):
     def on_tree_leave(self, event):
         """Clear hover effect when the mouse leaves the Treeview."""
         self._clear_tooltip()
-        
+
         # Clear hover styling when mouse leaves tree
+        self._clear_hovered_item()
+
+    def _clear_hovered_item(self):
+        """Remove hover styling from the currently hovered row, if any."""
         if self.hovered_item:
-            try:
-                current_tags = list(self.guest_tree.item(self.hovered_item, "tags"))
-                if "checkin_hover" in current_tags:
-                    current_tags.remove("checkin_hover")
-                    self.guest_tree.item(self.hovered_item, tags=current_tags)
-            except tk.TclError:
-                pass  # Item was already removed
+            self.guest_table.set_hover(None)
             self.hovered_item = None
 
+    def _set_hovered_item(self, item):
+        """Track the row under the mouse, styling it unless in manual check-in mode."""
+        if item != self.hovered_item:
+            # In manual check-in mode, the motion handler handles button-specific hover
+            self.guest_table.set_hover(item if item and not self.checkin_buttons_visible else None)
+            self.hovered_item = item
+
     def _update_hover(self, event):
         """A single method to handle all hover effect updates."""
         # Check if mouse is over header area - if so, don't apply hover
         region = self.guest_tree.identify("region", event.x, event.y)
         if region == "heading":
             # Mouse is over header, don't apply hover effects
-            if self.hovered_item:
-                # Clear any existing hover
-                try:
-                    current_tags = list(self.guest_tree.item(self.hovered_item, "tags"))
-                    if "checkin_hover" in current_tags:
-                        current_tags.remove("checkin_hover")
-                        self.guest_tree.item(self.hovered_item, tags=current_tags)
-                except tk.TclError:
-                    pass
-                self.hovered_item = None
+            self._clear_hovered_item()
             return
         
         # Get the item under the cursor directly
-        item = self.guest_tree.identify_row(event.y)
-
-        # If the hovered item has changed since the last event, update the styling
-        if item != self.hovered_item:
-            # First, remove the hover tag from the previously hovered item (if any)
-            if self.hovered_item:
-                try:
-                    current_tags = list(self.guest_tree.item(self.hovered_item, "tags"))
-                    if "checkin_hover" in current_tags:
-                        current_tags.remove("checkin_hover")
-                        self.guest_tree.item(self.hovered_item, tags=current_tags)
-                except tk.TclError:
-                    # This can happen if a refresh occurs while hovered
-                    pass
-
-            # Now, apply the hover tag to the new item
-            if item:
-                # In normal mode, apply hover to any row
-                # In manual check-in mode, the motion handler handles button-specific hover
-                if not self.checkin_buttons_visible:
-                    current_tags = list(self.guest_tree.item(item, "tags"))
-                    if "checkin_hover" not in current_tags:
-                        current_tags.append("checkin_hover")
-                        self.guest_tree.item(item, tags=current_tags)
-
-            # Update the reference to the currently hovered item
-            self.hovered_item = item
-
+        self._set_hovered_item(self.guest_tree.identify_row(event.y))
 
     def _on_scroll(self, event):
-        """Handle scroll events by updating hover at current mouse position."""
+        """Scroll the virtualized guest list and update hover at current mouse position."""
         # Clear any pending tooltip first since content has moved under mouse
         self._clear_tooltip()
-        
-        # Use a very short delay to allow the treeview to process the scroll
-        # before we update the hover. This prevents lag and inaccuracy.
+
+        # Rows are recycled while scrolling, so an open editor would end up over another guest
+        if self.edit_entry:
+            self.save_edit()
+
+        # Pooled rows stay in place on screen; drop the hover so it is re-evaluated for the new content
+        self._clear_hovered_item()
+
+        if event.num == 4:
+            rows = -3
+        elif event.num == 5:
+            rows = 3
+        elif platform.system() == "Darwin":
+            rows = -event.delta
+        else:
+            rows = -3 * int(event.delta / 120)
+        self.guest_table.scroll(rows)
+
+        # Use a very short delay to allow the treeview to redraw before we update the hover.
+        # This prevents lag and inaccuracy.
         if hasattr(self, '_scroll_hover_job'):
             self.after_cancel(self._scroll_hover_job)
         
         self._scroll_hover_job = self.after(1, self._update_hover_on_scroll)
+        return "break"
     
     def _update_hover_on_scroll(self):
         """Update the hover effect after a scroll event."""
@@ -6549,33 +6355,7 @@ class NFCApp(ctk.CTk):
 
             # Identify the item directly under the cursor
             new_item = self.guest_tree.identify_row(y)
-
-            # Update styling if the hovered item has changed
-            if new_item != self.hovered_item:
-                # Remove hover from the old item
-                if self.hovered_item:
-                    try:
-                        tags = list(self.guest_tree.item(self.hovered_item, "tags"))
-                        if "checkin_hover" in tags:
-                            tags.remove("checkin_hover")
-                            self.guest_tree.item(self.hovered_item, tags=tags)
-                    except tk.TclError:
-                        pass  # Item might have been deleted
-
-                # Apply hover to the new item
-                if new_item:
-                    try:
-                        # Only apply hover if not in manual check-in mode,
-                        # as that mode has its own button-specific hover.
-                        if not self.checkin_buttons_visible:
-                            tags = list(self.guest_tree.item(new_item, "tags"))
-                            if "checkin_hover" not in tags:
-                                tags.append("checkin_hover")
-                                self.guest_tree.item(new_item, tags=tags)
-                    except tk.TclError:
-                        pass # Item might have been deleted during a refresh
-
-                self.hovered_item = new_item
+            self._set_hovered_item(new_item)
                 
             # Also re-evaluate tooltip for the new position after scroll
             if new_item:
@@ -6729,13 +6509,13 @@ class NFCApp(ctk.CTk):
                 timestamp = datetime.datetime.now().strftime("%H:%M")
                 item_values = list(values)
                 item_values[column_index] = f"✓ {timestamp} ⏳"
-                self.guest_tree.item(item, values=item_values)
+                self.guest_table.set_row(item, values=item_values)
+
+                # Update the guest's station mask and the summary row immediately
+                self._record_check_in(guest_id, station)
 
                 # Update row styling immediately
                 self._update_row_styling(item, guest_id)
-                
-                # Update summary row immediately to reflect the change
-                self._update_summary_row_immediate()
 
                 # Disable the click temporarily to prevent double-clicks
                 self.guest_tree.configure(cursor="wait")
@@ -6763,11 +6543,12 @@ class NFCApp(ctk.CTk):
         # Update status
         self.update_status(f"Checking in guest {guest_id} at {station}...", "info")
 
-        # Run in thread
-        thread = threading.Thread(target=self._quick_checkin_thread,
-                                args=(guest_id, station))
-        thread.daemon = True
-        thread.start()
+        # Run on the check-in lane (releases the operation lock if it never runs)
+        self.submit_background_task(
+            self._quick_checkin_thread, guest_id, station,
+            lane=TaskScheduler.LANE_CHECKIN,
+            on_cancel=self._release_quick_checkin_lock
+        )
 
     def _quick_checkin_thread(self, guest_id: int, station: str):
         """Thread function for quick check-in."""
@@ -6777,6 +6558,7 @@ class NFCApp(ctk.CTk):
 
             if result:
                 self.after(0, self.update_status, f"✓ Checked in {result['guest_name']} at {station}", "success")
+                self.after(0, self._record_check_in, guest_id, station)
                 # Auto-close manual check-in mode after successful check-in
                 if self.checkin_buttons_visible:
                     self.after(0, self.toggle_manual_checkin)
@@ -6789,14 +6571,16 @@ class NFCApp(ctk.CTk):
             self.after(0, self.update_status, f"Check-in failed: {str(e)}", "error")
         finally:
             # Always release operation lock
-            self.operation_in_progress = False
-            self._active_operations -= 1
+            self._release_quick_checkin_lock()
+
+    def _release_quick_checkin_lock(self):
+        """Release the operation lock taken by quick_checkin."""
+        self.operation_in_progress = False
+        self._active_operations -= 1
 
     def _force_sync_on_startup(self):
         """Force sync of pending items found at startup."""
-        thread = threading.Thread(target=self._force_sync_thread)
-        thread.daemon = True
-        thread.start()
+        self.submit_background_task(self._force_sync_thread, lane=TaskScheduler.LANE_SYNC, key="force_sync", supersede=True)
 
     def _force_sync_thread(self):
         """Background thread to force sync pending items."""
@@ -7050,6 +6834,12 @@ class NFCApp(ctk.CTk):
         self.is_scanning = False
         # Release any global locks
         self._nfc_operation_lock = False
+        if hasattr(self, 'connectivity_monitor'):
+            self.connectivity_monitor.stop()
+        if self._bulk_registration:
+            self._bulk_registration.stop()  # Don't lose batched wristband bindings
+        self._shutdown_event.set()
+        self.task_scheduler.shutdown(wait=False)
         if self.nfc_service:
             self.nfc_service.disconnect()
         self.destroy()
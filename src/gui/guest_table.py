@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diff-based, virtualized table model for the guest list Treeview.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from tkinter import ttk
+
+
+class GuestTableModel:
+    """Keeps the guest Treeview in step with guest data by diffing rows.
+
+    All guest rows live in the model, sorted by last name (A-Ö). The Treeview
+    only holds a small pool of items covering the visible window plus a few
+    buffer rows; scrolling recycles those items with the rows now in view.
+    Every render compares what a pool item shows with what it should show,
+    so a refresh only issues Tk calls for visible rows that actually changed.
+    Rows without tags get the alternate row color of their display position.
+    Rows are built by the app from GuestRecord lists, not from the columnar
+    GuestTable (src/models/guest_table.py).
+    """
+
+    BUFFER_ROWS = 5  # Extra rows materialized below the visible window
+    HOVER_TAG = "checkin_hover"
+    STRIPE_TAGS = ("even", "odd")  # Alternate row colors, by display position
+
+    def __init__(self, tree: ttk.Treeview, scrollbar=None, row_height: int = 25):
+        """
+        Initialize table model.
+
+        Args:
+            tree: Treeview that displays the guest rows
+            scrollbar: Scrollbar driven by the model (its command should be the model's yview)
+            row_height: Treeview row height in pixels, used to size the visible window
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+
+        # Full data set
+        self._rows: Dict[int, Tuple[tuple, tuple]] = {}  # guest_id -> (values, tags)
+        self._keys: Dict[int, tuple] = {}  # guest_id -> sort key
+        self._order: List[tuple] = []  # Sort keys in display order
+
+        # Materialized window
+        self._first = 0  # Index into _order of the top visible row
+        self._visible_rows = 20  # Updated from the Treeview height on <Configure>
+        self._slots: List[str] = []  # Pooled Treeview item IDs, top to bottom
+        self._slot_content: List[Optional[Tuple[int, tuple, tuple]]] = []  # (guest_id, values, tags) shown per slot
+        self._hover_slot: Optional[int] = None
+
+        self.tk_calls = 0  # Tk calls issued by the last sync/render (for diagnostics)
+
+        self.tree.bind("<Configure>", self._on_configure, add="+")
+
+    @staticmethod
+    def sort_key(guest_id: int, values: Sequence) -> tuple:
+        """Sort key for a row: last name (case-insensitive), then guest ID."""
+        lastname = values[2] if len(values) > 2 else ""
+        return (str(lastname).lower(), guest_id)
+
+    def sync(self, rows: Iterable[Tuple[int, Sequence, Sequence]], keep_position: bool = True) -> int:
+        """
+        Replace the model's rows and re-render the visible window.
+
+        Args:
+            rows: Iterable of (guest_id, values, tags) for every row that should be shown
+                (stripe tags are ignored, the model sets them)
+            keep_position: Keep the current top row in view; otherwise scroll to the top
+
+        Returns:
+            int: Number of Tk calls that were needed
+        """
+        wanted: Dict[int, Tuple[tuple, tuple]] = {}
+        for guest_id, values, tags in rows:
+            wanted[guest_id] = (tuple(values), self._own_tags(tags))
+
+        # Anchor the window on its top row so inserts/removals above it don't shift the view
+        anchor = self._order[self._first] if self._first < len(self._order) else None
+
+        removed = [guest_id for guest_id in self._rows if guest_id not in wanted]
+        moved = []
+        for guest_id in removed:
+            moved.append((self._keys.pop(guest_id), None))
+            del self._rows[guest_id]
+        for guest_id, row in wanted.items():
+            key = self.sort_key(guest_id, row[0])
+            old_key = self._keys.get(guest_id)
+            if key != old_key:
+                moved.append((old_key, key))
+                self._keys[guest_id] = key
+            self._rows[guest_id] = row
+
+        if len(moved) > 64:
+            # Large change (e.g. initial load) - a full sort is cheaper than repeated inserts
+            self._order = sorted(self._keys.values())
+        else:
+            for old_key, key in moved:
+                if old_key is not None:
+                    del self._order[bisect_left(self._order, old_key)]
+                if key is not None:
+                    insort(self._order, key)
+
+        if not keep_position:
+            self._first = 0
+        elif anchor is not None:
+            anchor_id = anchor[-1]
+            self._first = bisect_left(self._order, self._keys.get(anchor_id, anchor))
+
+        return self.render()
+
+    def render(self) -> int:
+        """
+        Write the rows in the current window into the pooled Treeview items.
+
+        Returns:
+            int: Number of Tk calls that were needed
+        """
+        self.tk_calls = 0
+        total = len(self._order)
+        self._first = max(0, min(self._first, total - self._visible_rows))
+        window = self._order[self._first:self._first + self._visible_rows + self.BUFFER_ROWS]
+
+        # Shrink the item pool to the window size (it grows in the loop below)
+        if len(self._slots) > len(window):
+            self.tree.delete(*self._slots[len(window):])
+            self.tk_calls += 1
+            del self._slots[len(window):]
+            del self._slot_content[len(window):]
+            if self._hover_slot is not None and self._hover_slot >= len(window):
+                self._hover_slot = None
+
+        for index, key in enumerate(window):
+            guest_id = key[-1]
+            values, tags = self._rows[guest_id]
+            tags = self._display_tags(self._first + index, tags)
+            if index == self._hover_slot and self.HOVER_TAG not in tags:
+                tags = tags + (self.HOVER_TAG,)
+            if index < len(self._slots):
+                self._write_slot(index, (guest_id, values, tags))
+            else:
+                self._slots.append(self.tree.insert("", "end", values=values, tags=tags))
+                self._slot_content.append((guest_id, values, tags))
+                self.tk_calls += 1
+
+        self._update_scrollbar()
+        return self.tk_calls
+
+    def set_row(self, item: str, values: Optional[Sequence] = None, tags: Optional[Sequence] = None) -> None:
+        """
+        Update a single displayed row in place (e.g. optimistic check-in feedback).
+
+        Args:
+            item: Treeview item ID
+            values: New row values, or None to keep current values
+            tags: New row tags, or None to keep current tags
+        """
+        guest_id = self.guest_for_item(item)
+        if guest_id is None:
+            return
+        current_values, current_tags = self._rows[guest_id]
+        new_values = tuple(values) if values is not None else current_values
+        new_tags = self._own_tags(tags) if tags is not None else current_tags
+
+        key = self.sort_key(guest_id, new_values)
+        old_key = self._keys[guest_id]
+        if key != old_key:
+            del self._order[bisect_left(self._order, old_key)]
+            insort(self._order, key)
+            self._keys[guest_id] = key
+        self._rows[guest_id] = (new_values, new_tags)
+        self.render()
+
+    def set_hover(self, item: Optional[str]) -> None:
+        """
+        Move hover styling to the given Treeview item (or remove it with None).
+
+        Args:
+            item: Treeview item ID to highlight, or None
+        """
+        slot = self._slots.index(item) if item in self._slots else None
+        if slot == self._hover_slot:
+            return
+        previous = self._hover_slot
+        self._hover_slot = slot
+        for index in (previous, slot):
+            if index is not None and index < len(self._slots) and self._slot_content[index]:
+                guest_id, values, _ = self._slot_content[index]
+                tags = self._display_tags(self._first + index, self._rows[guest_id][1])
+                if index == slot:
+                    tags = tags + (self.HOVER_TAG,)
+                self._write_slot(index, (guest_id, values, tags))
+
+    def clear(self) -> None:
+        """Remove all rows and pooled items from the Treeview."""
+        if self._slots:
+            self.tree.delete(*self._slots)
+        self._slots.clear()
+        self._slot_content.clear()
+        self._hover_slot = None
+        self._rows.clear()
+        self._keys.clear()
+        self._order.clear()
+        self._first = 0
+        self._update_scrollbar()
+
+    def scroll(self, rows: int) -> None:
+        """Scroll the window by a number of rows (negative scrolls up)."""
+        self._first += rows
+        self.render()
+
+    def yview(self, *args) -> None:
+        """Scrollbar command handler ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._first = int(float(args[1]) * len(self._order))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                amount *= self._visible_rows
+            self._first += amount
+        self.render()
+
+    def item_for_guest(self, guest_id: int) -> Optional[str]:
+        """Get the Treeview item ID showing a guest, if the guest is in the visible window."""
+        for slot, content in zip(self._slots, self._slot_content):
+            if content and content[0] == guest_id:
+                return slot
+        return None
+
+    def guest_for_item(self, item: str) -> Optional[int]:
+        """Get the guest ID shown by a Treeview item."""
+        if item in self._slots:
+            content = self._slot_content[self._slots.index(item)]
+            if content:
+                return content[0]
+        return None
+
+    def index_of_item(self, item: str) -> int:
+        """Get the position in the full (sorted) guest list of the row shown by an item."""
+        return self._first + self._slots.index(item)
+
+    def row_values(self, guest_id: int) -> Optional[tuple]:
+        """Get the values of a guest's row."""
+        row = self._rows.get(guest_id)
+        return row[0] if row else None
+
+    def guest_ids(self) -> List[int]:
+        """Get all guest IDs in display order."""
+        return [key[-1] for key in self._order]
+
+    def iter_values(self) -> Iterator[tuple]:
+        """Iterate over the values of all rows in display order."""
+        for key in self._order:
+            yield self._rows[key[-1]][0]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _own_tags(self, tags: Sequence) -> tuple:
+        """A row's own tags, without the stripe and hover tags the model manages."""
+        return tuple(tag for tag in tags if tag not in self.STRIPE_TAGS and tag != self.HOVER_TAG)
+
+    def _display_tags(self, position: int, tags: tuple) -> tuple:
+        """Tags shown for a row at a display position: its own tags, or else the stripe tag."""
+        return tags or (self.STRIPE_TAGS[position % 2],)
+
+    def _write_slot(self, index: int, content: Tuple[int, tuple, tuple]) -> None:
+        """Write a row into a pooled item, sending only what changed."""
+        current = self._slot_content[index]
+        changes = {}
+        if current is None or current[1] != content[1]:
+            changes['values'] = content[1]
+        if current is None or current[2] != content[2]:
+            changes['tags'] = content[2]
+        if changes:
+            self.tree.item(self._slots[index], **changes)
+            self.tk_calls += 1
+        self._slot_content[index] = content
+
+    def _update_scrollbar(self) -> None:
+        """Reflect the window position in the scrollbar."""
+        if not self.scrollbar:
+            return
+        total = len(self._order)
+        if total <= self._visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._first / total, min(1.0, (self._first + self._visible_rows) / total))
+
+    def _on_configure(self, event) -> None:
+        """Resize the visible window when the Treeview changes height."""
+        # The heading row takes roughly one row of height
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self.render()
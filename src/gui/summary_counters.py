@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incrementally maintained counters for the guest list summary row.
+"""
+
+from typing import Dict, Iterable, List
+
+from ..models import GuestTable
+
+
+class SummaryCounters:
+    """Checked-in counts per station for the guests currently shown.
+
+    The shown guests are held in a GuestTable, rebuilt only when the shown
+    guest data is reloaded. Counts are popcounts of the station bitsets, and
+    individual check-ins and clears flip a single bit, so the summary row
+    can be redrawn without walking the guest list.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.table = GuestTable()
+
+    @property
+    def stations(self) -> List[str]:
+        """Station keys (lowercase) in column order."""
+        return self.table.stations
+
+    @property
+    def total(self) -> int:
+        return len(self.table)
+
+    @property
+    def wristbands(self) -> int:
+        return self.table.wristband_count()
+
+    def reload(self, guests: Iterable, stations: Iterable[str], local_check_ins: Dict[int, Dict[str, str]]) -> None:
+        """
+        Recompute all counters from guest data.
+
+        Args:
+            guests: Guest records currently shown
+            stations: Station names in column order
+            local_check_ins: Local (not yet synced) check-ins by guest ID and station
+        """
+        self.table = GuestTable(guests, stations, local_check_ins)
+
+    def set_checked(self, guest_id: int, station: str, checked: bool = True) -> bool:
+        """
+        Record a check-in (or a cleared check-in) for a shown guest.
+
+        Args:
+            guest_id: Guest ID
+            station: Station name
+            checked: True for a check-in, False for a clear
+
+        Returns:
+            bool: True if any counter changed
+        """
+        return self.table.set_checked(guest_id, station, checked)
+
+    def checked_count(self, station: str) -> int:
+        """Get the number of guests checked in at a station."""
+        return self.table.checked_count(station)
+
+    def unchecked_count(self, station: str) -> int:
+        """Get the number of guests not yet checked in at a station."""
+        return self.table.unchecked_count(station)
+
+    def summary_values(self, rewrite_mode: bool = False, single_station: bool = False) -> List[str]:
+        """
+        Build the summary row values.
+
+        Args:
+            rewrite_mode: Show wristband registration stats instead of check-ins
+            single_station: Also show the unchecked count for the single station
+
+        Returns:
+            List[str]: Values for the summary row
+        """
+        if rewrite_mode:
+            values = [f"{self.wristbands}/{self.total}", "", "", ""]
+        elif single_station and len(self.stations) == 1:
+            values = [f"{self.total} guests ({self.unchecked_count(self.stations[0])} unchecked)", "", ""]
+        else:
+            values = [f"{self.total} guests", "", ""]
+
+        values.extend(str(self.checked_count(station)) for station in self.stations)
+        return values
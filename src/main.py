@@ -10,7 +10,9 @@ Configuration parameters should be modified in config/config.json, not in this f
 import os
 import sys
 import json
+import signal
 import logging
+import argparse
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -18,7 +20,6 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.utils.logger import setup_logger
 from src.services import NFCService, GoogleSheetsService, TagManager
-from src.gui import create_gui
 
 
 def load_config():
@@ -32,16 +33,107 @@ def load_config():
         sys.exit(1)
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="TP_NFC attendance tracking system")
+    parser.add_argument('--headless', action='store_true',
+                        help="Run as an unattended check-in station without the GUI")
+    parser.add_argument('--hub', action='store_true',
+                        help="Run the LAN station hub instead of a station")
+    parser.add_argument('--station', help="Station name for headless mode (default: headless.station)")
+    parser.add_argument('--status-port', type=int,
+                        help="Port for the headless status endpoint (default: headless.status_port)")
+    # Ignore unknown arguments (e.g. -psn_* added by macOS app launchers)
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def run_headless(config, args, nfc_service, sheets_service, tag_manager, logger):
+    """Run the scan pipeline as a service until SIGINT/SIGTERM."""
+    from src.services.station_daemon import StationDaemon, CommandFeedback
+
+    headless_config = config.get('headless', {})
+    station = args.station or headless_config.get('station') or config['stations'][0]
+    status_port = args.status_port if args.status_port is not None else headless_config.get('status_port')
+
+    daemon = StationDaemon(
+        nfc_service, sheets_service, tag_manager, logger, station,
+        feedback=CommandFeedback(headless_config.get('feedback', {}), logger, nfc_service),
+        status_host=headless_config.get('status_host', '127.0.0.1'),
+        status_port=status_port,
+        guest_refresh_interval=headless_config.get('guest_refresh_interval', StationDaemon.GUEST_REFRESH_INTERVAL)
+    )
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    daemon.run()
+
+
+def run_hub(config, logger):
+    """Run the LAN station hub until SIGINT/SIGTERM."""
+    from src.services.station_hub import StationHub, DEFAULT_PORT
+
+    hub_config = config.get('hub', {})
+
+    # The hub writes Google Sheets for all stations when it has credentials; otherwise it only relays
+    sheets_service = GoogleSheetsService(config['google_sheets'], logger)
+    if not sheets_service.authenticate():
+        logger.warning("Failed to authenticate with Google Sheets - hub will relay events only")
+        sheets_service = None
+
+    hub = StationHub(
+        logger,
+        host=hub_config.get('bind', '0.0.0.0'),
+        port=hub_config.get('port', DEFAULT_PORT),
+        sheets_service=sheets_service,
+        auth_token=hub_config.get('token') or None,
+        flush_interval=hub_config.get('flush_interval', StationHub.FLUSH_INTERVAL)
+    )
+    hub.start()
+    signal.signal(signal.SIGINT, lambda signum, frame: hub.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: hub.stop())
+    hub.wait()
+    return 0
+
+
+def connect_hub(config, tag_manager, logger):
+    """Connect the tag manager to the LAN station hub if one is configured."""
+    hub_config = config.get('hub', {})
+    if not hub_config.get('enabled') or not hub_config.get('host'):
+        return
+    from src.services.station_hub import HubClient, DEFAULT_PORT
+
+    tag_manager.connect_hub(HubClient(
+        logger,
+        hub_config['host'],
+        hub_config.get('port', DEFAULT_PORT),
+        station_id=hub_config.get('station_id') or None,
+        auth_token=hub_config.get('token') or None
+    ))
+    logger.info(f"Station hub configured at {hub_config['host']}")
+
+
+def main(argv=None):
     """Main application entry point."""
+    args = parse_args(argv)
+
     # Load configuration
     config = load_config()
 
     # Setup logging
-    logger = setup_logger(config['app_name'], config['log_level'], config['log_file'])
+    logger = setup_logger(
+        config['app_name'],
+        config['log_level'],
+        config['log_file'],
+        max_bytes=config.get('log_max_size', '10MB'),
+        backup_count=config.get('log_backup_count', 5),
+        log_format=config.get('log_format', 'text')
+    )
 
     logger.info(f"Starting {config['app_name']} v{config['version']}")
 
+    if args.hub:
+        return run_hub(config, logger)
+
     try:
         # Initialize services
         logger.info("Initializing services...")
@@ -63,18 +155,28 @@ def main():
             logger.info("Google Sheets authenticated successfully")
 
         # Tag Manager
-        tag_manager = TagManager(nfc_service, sheets_service, logger)
+        registry_sync = config.get('registry_sync', {})
+        tag_manager = TagManager(nfc_service, sheets_service, logger,
+                                 replica_id=registry_sync.get('replica_id') or None)
         logger.info("Tag manager initialized")
+        connect_hub(config, tag_manager, logger)
+        if registry_sync.get('shared_folder'):
+            tag_manager.enable_shared_folder_replication(registry_sync['shared_folder'])
 
-        # Create and run GUI
-        logger.info("Starting GUI application...")
-        app = create_gui(config, nfc_service, sheets_service, tag_manager, logger)
+        if args.headless:
+            run_headless(config, args, nfc_service, sheets_service, tag_manager, logger)
+        else:
+            # Create and run GUI (imported here so headless mode never loads Tk)
+            from src.gui import create_gui
+            logger.info("Starting GUI application...")
+            app = create_gui(config, nfc_service, sheets_service, tag_manager, logger)
 
-        # Set sync completion callback after GUI is created
-        tag_manager.set_sync_completion_callback(app.on_sync_complete)
+            # Set sync completion callback after GUI is created
+            tag_manager.set_sync_completion_callback(app.on_sync_complete)
+            tag_manager.set_remote_update_callback(app.on_remote_update)
 
-        # Run the GUI main loop
-        app.mainloop()
+            # Run the GUI main loop
+            app.mainloop()
 
     except Exception as e:
         logger.error(f"An error occurred: {e}", exc_info=True)
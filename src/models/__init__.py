@@ -6,5 +6,7 @@ Models package.
 
 from .nfc_tag import NFCTag
 from .guest_record import GuestRecord
+from .guest_table import GuestTable
+from .tag_registry import TagRegistry
 
-__all__ = ['NFCTag', 'GuestRecord']
\ No newline at end of file
+__all__ = ['NFCTag', 'GuestRecord', 'GuestTable', 'TagRegistry']
\ No newline at end of file
@@ -4,17 +4,134 @@
 Guest record model for attendance tracking.
 """
 
-from typing import Optional, Dict, Union, List
+import sys
+from collections.abc import MutableMapping
+from typing import Optional, Dict, Union, List, Iterable, Tuple
 from datetime import datetime
 
+# Fallback stations for backward compatibility
+DEFAULT_STATIONS = ('reception', 'lio', 'juntos', 'experimental', 'unvrs')
+
+
+class StationLayout:
+    """Ordered, interned station keys shared by every guest with the same stations.
+
+    Guests store their check-in times in a list indexed by this layout, so a
+    guest list of thousands of rows holds one key tuple and one index dict
+    instead of one dict per guest.
+    """
+
+    __slots__ = ('keys', 'index', '_extended')
+
+    _layouts: Dict[Tuple[str, ...], 'StationLayout'] = {}
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self._extended: Dict[str, 'StationLayout'] = {}
+
+    @classmethod
+    def for_stations(cls, stations: Iterable[str]) -> 'StationLayout':
+        """
+        Get the shared layout for a list of station names.
+
+        Args:
+            stations: Station names in column order (any case)
+
+        Returns:
+            StationLayout: Layout with lowercased, interned keys
+        """
+        names = tuple(stations)
+        layout = cls._layouts.get(names)
+        if layout is None:
+            keys = []
+            for station in names:
+                key = sys.intern(station.lower())
+                if key not in keys:
+                    keys.append(key)
+            keys = tuple(keys)
+            layout = cls._layouts.get(keys)
+            if layout is None:
+                layout = cls._layouts[keys] = StationLayout(keys)
+            cls._layouts[names] = layout
+        return layout
+
+    def extended(self, key: str) -> 'StationLayout':
+        """Get the layout with one more station appended."""
+        layout = self._extended.get(key)
+        if layout is None:
+            layout = self._extended[key] = StationLayout.for_stations(self.keys + (key,))
+        return layout
+
+
+class CheckIns(MutableMapping):
+    """Dict-like view of a guest's check-ins (station key -> timestamp string or datetime).
+
+    Reads and writes go straight to the guest's station-index array; writing
+    an unknown station adds it to the guest's layout.
+    """
+
+    __slots__ = ('_guest',)
+
+    def __init__(self, guest: 'GuestRecord'):
+        self._guest = guest
+
+    def __getitem__(self, station: str):
+        index = self._guest._layout.index.get(station)
+        if index is None:
+            raise KeyError(station)
+        return self._guest._times[index]
+
+    def __setitem__(self, station: str, value) -> None:
+        self._guest._set_time(station, value)
+
+    def __delitem__(self, station: str) -> None:
+        guest = self._guest
+        index = guest._layout.index.get(station)
+        if index is None:
+            raise KeyError(station)
+        keys = guest._layout.keys
+        guest._layout = StationLayout.for_stations(keys[:index] + keys[index + 1:])
+        del guest._times[index]
+
+    def __iter__(self):
+        return iter(self._guest._layout.keys)
+
+    def __len__(self) -> int:
+        return len(self._guest._layout.keys)
+
+    def __contains__(self, station) -> bool:
+        return station in self._guest._layout.index
+
+    def get(self, station, default=None):
+        index = self._guest._layout.index.get(station)
+        return default if index is None else self._guest._times[index]
+
+    def items(self):
+        return list(zip(self._guest._layout.keys, self._guest._times))
+
+    def copy(self) -> Dict[str, Optional[Union[str, datetime]]]:
+        return dict(zip(self._guest._layout.keys, self._guest._times))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CheckIns):
+            other = other.copy()
+        return self.copy() == other
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
 
 class GuestRecord:
     """Model representing a guest record from the spreadsheet."""
-    
+
+    __slots__ = ('original_id', 'firstname', 'lastname', 'mobile_number', 'wristband_uuid',
+                 'nfc_tag_uid', 'row_number', '_layout', '_times', '_full_name')
+
     def __init__(self, original_id: int, firstname: str, lastname: str, stations: List[str] = None, mobile_number: str = None, wristband_uuid: str = None):
         """
         Initialize guest record.
-        
+
         Args:
             original_id: Unique identifier from the spreadsheet
             firstname: Guest's first name
@@ -26,106 +143,136 @@ class GuestRecord:
         self.original_id = original_id
         self.firstname = firstname
         self.lastname = lastname
-        self.full_name = f"{firstname} {lastname}"
+        self._full_name = None
         self.mobile_number = mobile_number
         self.wristband_uuid = wristband_uuid
-        
-        # Station check-ins (station_name -> timestamp string or datetime)
-        # Initialize with provided stations or default hardcoded ones
-        if stations:
-            self.check_ins: Dict[str, Optional[Union[str, datetime]]] = {
-                station.lower(): None for station in stations
-            }
-        else:
-            # Fallback to hardcoded stations for backward compatibility
-            self.check_ins: Dict[str, Optional[Union[str, datetime]]] = {
-                'reception': None,
-                'lio': None,
-                'juntos': None,
-                'experimental': None,
-                'unvrs': None
-            }
-        
+
+        # Station check-ins: times indexed by a layout shared with other guests
+        self._layout = StationLayout.for_stations(stations or DEFAULT_STATIONS)
+        self._times: List[Optional[Union[str, datetime]]] = [None] * len(self._layout.keys)
+
         # Associated NFC tag
         self.nfc_tag_uid: Optional[str] = None
         self.row_number: Optional[int] = None  # For Google Sheets updates
-        
+
+    @property
+    def full_name(self) -> str:
+        """Guest's full name (built on first use)."""
+        if self._full_name is None:
+            self._full_name = f"{self.firstname} {self.lastname}"
+        return self._full_name
+
+    @property
+    def check_ins(self) -> CheckIns:
+        """Station check-ins (station_name -> timestamp string or datetime)."""
+        return CheckIns(self)
+
+    @check_ins.setter
+    def check_ins(self, check_ins: Dict[str, Optional[Union[str, datetime]]]) -> None:
+        check_ins = dict(check_ins)
+        self._layout = StationLayout.for_stations(check_ins.keys())
+        self._times = [check_ins[key] for key in check_ins]
+
+    def set_check_in(self, station: str, value: Optional[Union[str, datetime]]) -> None:
+        """
+        Set the raw check-in value for a station (used when loading sheet rows).
+
+        Args:
+            station: Station name (any case)
+            value: Timestamp string, datetime or None
+        """
+        self._set_time(station.lower(), value)
+
+    def _set_time(self, key: str, value) -> None:
+        index = self._layout.index.get(key)
+        if index is None:
+            self._layout = self._layout.extended(sys.intern(key))
+            self._times.append(value)
+        else:
+            self._times[index] = value
+
     def check_in_at_station(self, station: str) -> bool:
         """
         Record check-in at a specific station.
-        
+
         Args:
             station: Station name (must be one of the predefined stations)
-            
+
         Returns:
             bool: True if check-in successful, False if already checked in
         """
         station = station.lower()
-        if station in self.check_ins:
-            if self.check_ins[station] is None:
-                self.check_ins[station] = datetime.now()
+        index = self._layout.index.get(station)
+        if index is not None:
+            if self._times[index] is None:
+                self._times[index] = datetime.now()
                 return True
             return False  # Already checked in
         raise ValueError(f"Unknown station: {station}")
-        
+
     def is_checked_in_at(self, station: str) -> bool:
         """Check if guest is checked in at a specific station."""
-        station = station.lower()
-        time_value = self.check_ins.get(station)
-        # Consider empty or whitespace-only strings as not checked in
-        if isinstance(time_value, str) and not time_value.strip():
-            return False
-        return time_value is not None
-        
+        return self.get_check_in_time(station) is not None
+
     def get_check_in_time(self, station: str) -> Optional[Union[str, datetime]]:
         """Get check-in time for a specific station."""
-        station = station.lower()
-        time_value = self.check_ins.get(station)
+        index = self._layout.index.get(station.lower())
+        if index is None:
+            return None
+        time_value = self._times[index]
         # Return None for empty or whitespace-only strings
         if isinstance(time_value, str) and not time_value.strip():
             return None
         return time_value
-        
+
+    def copy(self) -> 'GuestRecord':
+        """Copy of this guest (shares the station layout, check-in times are copied)."""
+        guest = GuestRecord.__new__(GuestRecord)
+        for slot in GuestRecord.__slots__:
+            setattr(guest, slot, getattr(self, slot))
+        guest._times = list(self._times)
+        return guest
+
     def assign_tag(self, tag_uid: str) -> None:
         """Assign an NFC tag to this guest."""
         self.nfc_tag_uid = tag_uid
-        
+
     def has_tag(self) -> bool:
         """Check if guest has an assigned NFC tag."""
         return self.nfc_tag_uid is not None
-    
+
     def ensure_station_exists(self, station: str) -> None:
         """
         Ensure a station exists in the check_ins dictionary.
         This supports dynamic station addition from Google Sheets.
-        
+
         Args:
             station: Station name to add if not present
         """
         station = station.lower()
-        if station not in self.check_ins:
-            self.check_ins[station] = None
-    
+        if station not in self._layout.index:
+            self._set_time(station, None)
+
     def get_all_stations(self) -> List[str]:
         """Get list of all available stations for this guest."""
-        return list(self.check_ins.keys())
-    
+        return list(self._layout.keys)
+
     def get_formatted_phone(self) -> str:
         """Get formatted phone number with + prefix, or 'No number' if empty."""
         if not self.mobile_number or not str(self.mobile_number).strip():
             return "No number"
-        
+
         # Clean the number (remove spaces, dashes, etc) and add + prefix
         phone = str(self.mobile_number).strip()
         if not phone.startswith('+'):
             phone = '+' + phone
         return phone
-        
+
     def __str__(self) -> str:
         """String representation of the guest."""
         tag_status = f"Tag: {self.nfc_tag_uid}" if self.has_tag() else "No tag assigned"
         return f"Guest {self.original_id}: {self.full_name} ({tag_status})"
-        
+
     def to_dict(self) -> dict:
         """Convert guest record to dictionary format."""
         return {
@@ -136,6 +283,6 @@ class GuestRecord:
             'nfc_tag_uid': self.nfc_tag_uid,
             'check_ins': {
                 station: time.isoformat() if isinstance(time, datetime) else time
-                for station, time in self.check_ins.items()
+                for station, time in zip(self._layout.keys, self._times)
             }
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Column-oriented guest table with per-station check-in bitsets.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def _popcount(bits: int) -> int:
+        return bin(bits).count('1')
+
+
+def iter_rows(bits: int) -> Iterator[int]:
+    """
+    Iterate the row numbers set in a bitset, lowest first.
+
+    Args:
+        bits: Bitset with bit N set for row N
+
+    Yields:
+        int: Row numbers
+    """
+    digits = bin(bits)[:1:-1]  # Least significant bit first, without the '0b' prefix
+    row = digits.find('1')
+    while row != -1:
+        yield row
+        row = digits.find('1', row + 1)
+
+
+def bits_from_rows(rows: Iterable[int], size: int) -> int:
+    """
+    Build a bitset from row numbers in one pass (instead of one big-int OR per row).
+
+    Args:
+        rows: Row numbers to set
+        size: Number of rows in the table
+
+    Returns:
+        int: Bitset with bit N set for every row N
+    """
+    if not size:
+        return 0
+    digits = bytearray(b'0' * size)
+    for row in rows:
+        digits[size - 1 - row] = 0x31  # '1'
+    return int(digits, 2)
+
+
+class GuestTable:
+    """Guest data stored as columns, with one check-in bitset per station.
+
+    Rows are numbered in load order. ID, name and phone columns are plain
+    arrays, an ID -> row dict gives O(1) lookups, and every station keeps
+    two Python ints used as bitsets: bit N is set when guest row N has a
+    check-in in Google Sheets or in the local queue. Counts, "not checked in
+    at X" lists and completion filters are then a few big-int operations
+    instead of a walk over every guest and station.
+
+    Only the summary counters and row completion read from it (see
+    SummaryCounters); the guest lists themselves (NFCApp.guests_data,
+    GoogleSheetsService._cached_guests) and their lookup, filter and search
+    paths still work on GuestRecord lists.
+    """
+
+    def __init__(self, guests: Iterable = (), stations: Optional[Iterable[str]] = None,
+                 local_check_ins: Optional[Dict[int, Dict[str, str]]] = None):
+        """
+        Initialize table, optionally loading guests.
+
+        Args:
+            guests: Guest records (GuestRecord-like objects)
+            stations: Station names in column order (defaults to the stations of the first guest)
+            local_check_ins: Local (not yet synced) check-ins by guest ID and station
+        """
+        self.stations: List[str] = []
+        self.ids = array('q')
+        self.firstnames: List[str] = []
+        self.lastnames: List[str] = []
+        self.phones: List[Optional[str]] = []
+        self.records: List = []  # Source records, for callers that need the full object
+        self._rows: Dict[int, int] = {}  # guest ID -> row
+        self._all = 0  # Bit set for every row
+        self._wristbands = 0
+        self._sheet: Dict[str, int] = {}  # station key -> rows checked in on Google Sheets
+        self._local: Dict[str, int] = {}  # station key -> rows checked in locally
+        self.load(guests, stations, local_check_ins)
+
+    def load(self, guests: Iterable, stations: Optional[Iterable[str]] = None,
+             local_check_ins: Optional[Dict[int, Dict[str, str]]] = None) -> None:
+        """
+        Replace the table contents.
+
+        Args:
+            guests: Guest records (GuestRecord-like objects)
+            stations: Station names in column order (defaults to the stations of the first guest)
+            local_check_ins: Local (not yet synced) check-ins by guest ID and station
+        """
+        guests = list(guests)
+        if stations is None:
+            stations = guests[0].get_all_stations() if guests else []
+        self.stations = []
+        self._sheet = {}
+        self._local = {}
+        for station in stations:
+            self.ensure_station(station)
+
+        self.ids = array('q', (guest.original_id for guest in guests))
+        self.firstnames = [guest.firstname for guest in guests]
+        self.lastnames = [guest.lastname for guest in guests]
+        self.phones = [getattr(guest, 'mobile_number', None) for guest in guests]
+        self.records = guests
+        self._rows = {guest_id: row for row, guest_id in enumerate(self.ids)}
+        self._all = (1 << len(guests)) - 1
+
+        size = len(guests)
+        self._wristbands = bits_from_rows(
+            (row for row, guest in enumerate(guests) if getattr(guest, 'wristband_uuid', None)), size)
+        for station in self.stations:
+            self._sheet[station] = bits_from_rows(
+                (row for row, guest in enumerate(guests) if guest.get_check_in_time(station)), size)
+
+        local_rows: Dict[str, List[int]] = {station: [] for station in self.stations}
+        for guest_id, check_ins in (local_check_ins or {}).items():
+            row = self._rows.get(guest_id)
+            if row is None:
+                continue
+            for station, timestamp in check_ins.items():
+                if timestamp and station in local_rows:
+                    local_rows[station].append(row)
+        for station, rows in local_rows.items():
+            self._local[station] = bits_from_rows(rows, size)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, guest_id) -> bool:
+        return guest_id in self._rows
+
+    def row_of(self, guest_id: int) -> Optional[int]:
+        """Get the row of a guest, or None if the guest is not in the table."""
+        return self._rows.get(guest_id)
+
+    def full_name(self, row: int) -> str:
+        """Get the full name for a row."""
+        return f"{self.firstnames[row]} {self.lastnames[row]}"
+
+    def ensure_station(self, station: str) -> str:
+        """Add an (empty) station column if it does not exist yet; returns the station key."""
+        station_key = station.lower()
+        if station_key not in self._sheet:
+            self.stations.append(station_key)
+            self._sheet[station_key] = 0
+            self._local[station_key] = 0
+        return station_key
+
+    def set_sheet_check_in(self, guest_id: int, station: str, checked: bool = True) -> bool:
+        """
+        Record a check-in (or clear) read from Google Sheets.
+
+        Returns:
+            bool: True if the guest's combined check-in state for the station changed
+        """
+        return self._set_bit(self._sheet, guest_id, station, checked)
+
+    def set_local_check_in(self, guest_id: int, station: str, checked: bool = True) -> bool:
+        """
+        Record a local (queued) check-in or its removal.
+
+        Returns:
+            bool: True if the guest's combined check-in state for the station changed
+        """
+        return self._set_bit(self._local, guest_id, station, checked)
+
+    def set_checked(self, guest_id: int, station: str, checked: bool = True) -> bool:
+        """
+        Record a check-in made on this station, or a cleared check-in (clears both sources).
+
+        Returns:
+            bool: True if the guest's combined check-in state for the station changed
+        """
+        if checked:
+            return self.set_local_check_in(guest_id, station)
+        was_checked = self.is_checked(guest_id, station)
+        self._set_bit(self._sheet, guest_id, station, False)
+        self._set_bit(self._local, guest_id, station, False)
+        return was_checked
+
+    def is_checked(self, guest_id: int, station: str) -> bool:
+        """Check whether a guest has a check-in (sheet or local) at a station."""
+        row = self._rows.get(guest_id)
+        return row is not None and bool(self.checked_bits(station) >> row & 1)
+
+    def checked_bits(self, station: str) -> int:
+        """Get the bitset of rows checked in at a station (sheet or local)."""
+        station_key = station.lower()
+        return self._sheet.get(station_key, 0) | self._local.get(station_key, 0)
+
+    def checked_count(self, station: str) -> int:
+        """Get the number of guests checked in at a station."""
+        return _popcount(self.checked_bits(station))
+
+    def unchecked_count(self, station: str) -> int:
+        """Get the number of guests not yet checked in at a station."""
+        return len(self) - self.checked_count(station)
+
+    def unchecked_ids(self, station: str) -> List[int]:
+        """Get the IDs of guests not yet checked in at a station, in row order."""
+        return self.ids_in(self._all & ~self.checked_bits(station))
+
+    def complete_bits(self, stations: Iterable[str]) -> int:
+        """Get the bitset of rows checked in at every given station."""
+        bits = self._all
+        for station in stations:
+            bits &= self.checked_bits(station)
+        return bits
+
+    def complete_ids(self, stations: Iterable[str]) -> List[int]:
+        """Get the IDs of guests checked in at every given station, in row order."""
+        return self.ids_in(self.complete_bits(stations))
+
+    def is_complete(self, guest_id: int, stations: Iterable[str]) -> bool:
+        """Check whether a guest is checked in at every given station."""
+        row = self._rows.get(guest_id)
+        return row is not None and bool(self.complete_bits(stations) >> row & 1)
+
+    def wristband_count(self) -> int:
+        """Get the number of guests with a registered wristband."""
+        return _popcount(self._wristbands)
+
+    def set_wristband(self, guest_id: int, registered: bool = True) -> None:
+        """Record a wristband registration (or removal) for a guest."""
+        row = self._rows.get(guest_id)
+        if row is not None:
+            if registered:
+                self._wristbands |= 1 << row
+            else:
+                self._wristbands &= ~(1 << row)
+
+    def ids_in(self, bits: int) -> List[int]:
+        """Get the guest IDs of the rows set in a bitset."""
+        ids = self.ids
+        return [ids[row] for row in iter_rows(bits & self._all)]
+
+    def _set_bit(self, bitsets: Dict[str, int], guest_id: int, station: str, checked: bool) -> bool:
+        row = self._rows.get(guest_id)
+        station_key = station.lower()
+        if row is None or station_key not in bitsets:
+            return False
+        before = self.checked_bits(station_key)
+        if checked:
+            bitsets[station_key] |= 1 << row
+        else:
+            bitsets[station_key] &= ~(1 << row)
+        return before != self.checked_bits(station_key)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tag registry: tag UID -> guest ID mapping with a maintained guest -> tags index.
+"""
+
+from threading import RLock
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple, Union
+
+_MISSING = object()
+
+
+class TagRegistry(dict):
+    """Tag UID -> guest ID dict that keeps a reverse index up to date.
+
+    Every mutation (item assignment, pop, del, update, clear) updates the
+    guest -> tag UIDs index as well, so a guest's tags, duplicate checks
+    and the number of guests with a tag are O(1) instead of a scan of the
+    whole registry. The number of guests with more than one tag is counted
+    as bindings change, so registry stats never walk the registry either.
+    It is still a plain dict for readers and for json.dump.
+
+    Mutations hold lock, which is shared with every thread that binds tags
+    (GUI, hub client, replication); code that iterates the registry off the
+    thread that mutates it should iterate snapshot() instead.
+    """
+
+    def __init__(self, bindings: Union[Mapping[str, int], Iterable[Tuple[str, int]], None] = None):
+        """
+        Build a registry.
+
+        Args:
+            bindings: Initial tag UID -> guest ID bindings
+        """
+        super().__init__()
+        self.lock = RLock()
+        self._by_guest: Dict[int, Set[str]] = {}
+        self._duplicate_guests = 0  # Guests with more than one tag
+        if bindings:
+            self.update(bindings)
+
+    def __setitem__(self, tag_uid: str, original_id: int) -> None:
+        original_id = int(original_id)
+        with self.lock:
+            previous = dict.get(self, tag_uid)
+            if previous == original_id:
+                return
+            if previous is not None:
+                self._unindex(tag_uid, previous)
+            dict.__setitem__(self, tag_uid, original_id)
+            tags = self._by_guest.setdefault(original_id, set())
+            tags.add(tag_uid)
+            if len(tags) == 2:
+                self._duplicate_guests += 1
+
+    def __delitem__(self, tag_uid: str) -> None:
+        with self.lock:
+            original_id = dict.pop(self, tag_uid)
+            self._unindex(tag_uid, original_id)
+
+    def pop(self, tag_uid: str, default=_MISSING):
+        """Remove a binding and return its guest ID (default if the tag is not bound)."""
+        with self.lock:
+            if tag_uid not in self:
+                if default is _MISSING:
+                    raise KeyError(tag_uid)
+                return default
+            original_id = dict.pop(self, tag_uid)
+            self._unindex(tag_uid, original_id)
+            return original_id
+
+    def popitem(self) -> Tuple[str, int]:
+        with self.lock:
+            tag_uid, original_id = dict.popitem(self)
+            self._unindex(tag_uid, original_id)
+            return tag_uid, original_id
+
+    def setdefault(self, tag_uid: str, original_id: Optional[int] = None) -> int:
+        with self.lock:
+            if tag_uid not in self:
+                self[tag_uid] = original_id
+            return self[tag_uid]
+
+    def update(self, *args, **kwargs) -> None:
+        with self.lock:
+            for tag_uid, original_id in dict(*args, **kwargs).items():
+                self[tag_uid] = original_id
+
+    def clear(self) -> None:
+        with self.lock:
+            dict.clear(self)
+            self._by_guest.clear()
+            self._duplicate_guests = 0
+
+    def copy(self) -> 'TagRegistry':
+        return TagRegistry(self.snapshot())
+
+    def snapshot(self) -> Dict[str, int]:
+        """Get a plain dict copy of the bindings, consistent even while other threads bind tags."""
+        with self.lock:
+            return dict(self)
+
+    def _unindex(self, tag_uid: str, original_id: int) -> None:
+        tags = self._by_guest.get(original_id)
+        if tags is not None and tag_uid in tags:
+            tags.discard(tag_uid)
+            if len(tags) == 1:
+                self._duplicate_guests -= 1
+            elif not tags:
+                del self._by_guest[original_id]
+
+    def tags_for(self, original_id: int) -> FrozenSet[str]:
+        """Get the tag UIDs bound to a guest (empty if none)."""
+        with self.lock:
+            return frozenset(self._by_guest.get(int(original_id), ()))
+
+    def has_guest(self, original_id: int) -> bool:
+        """Check whether any tag is bound to a guest."""
+        return int(original_id) in self._by_guest
+
+    def unbind_guest(self, original_id: int) -> FrozenSet[str]:
+        """
+        Remove every tag bound to a guest.
+
+        Args:
+            original_id: Guest's original ID
+
+        Returns:
+            FrozenSet[str]: Tag UIDs that were removed
+        """
+        with self.lock:
+            tags = frozenset(self._by_guest.pop(int(original_id), ()))
+            if len(tags) > 1:
+                self._duplicate_guests -= 1
+            for tag_uid in tags:
+                dict.pop(self, tag_uid, None)
+            return tags
+
+    @property
+    def guest_count(self) -> int:
+        """Number of guests with at least one tag."""
+        return len(self._by_guest)
+
+    @property
+    def duplicate_guests(self) -> int:
+        """Number of guests with more than one tag."""
+        return self._duplicate_guests
@@ -8,5 +8,9 @@ from .unified_nfc_service import UnifiedNFCService as NFCService
 from .google_sheets_service import GoogleSheetsService
 from .tag_manager import TagManager
 from .check_in_queue import CheckInQueue
+from .connectivity_monitor import ConnectivityMonitor
+from .station_daemon import StationDaemon
+from .station_hub import StationHub, HubClient
+from .bulk_registration import BulkRegistration
 
-__all__ = ['NFCService', 'GoogleSheetsService', 'TagManager', 'CheckInQueue']
\ No newline at end of file
+__all__ = ['NFCService', 'GoogleSheetsService', 'TagManager', 'CheckInQueue', 'ConnectivityMonitor', 'StationDaemon', 'StationHub', 'HubClient', 'BulkRegistration']
\ No newline at end of file
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asyncio client for the Google Sheets API.
+Many reads and writes run concurrently on one event loop instead of one
+thread per request. Retries share one backoff: when a request hits a rate
+limit or a server error, every request of the client pauses.
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import ssl
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from ..models import GuestRecord
+from .row_decoder import RowErrors
+from .sheet_schema import SheetSchema, ID_COLUMN
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+NETWORK_ERRORS = (ssl.SSLError, socket.error, ConnectionError, OSError, asyncio.TimeoutError)
+if AIOHTTP_AVAILABLE:
+    NETWORK_ERRORS += (aiohttp.ClientError,)
+
+
+class SharedBackoff:
+    """Exponential backoff shared by every request of one client.
+
+    A failure pauses all requests until resume_at. Failures of requests
+    that were already in flight when the pause started do not lengthen it,
+    so a burst of concurrent errors counts as one.
+    """
+
+    def __init__(self, base: float = 1.0, maximum: float = 32.0):
+        """
+        Initialize backoff.
+
+        Args:
+            base: First pause in seconds (doubles with each consecutive failure)
+            maximum: Longest pause in seconds
+        """
+        self.base = base
+        self.maximum = maximum
+        self.failures = 0
+        self.resume_at = 0.0
+        self._last_failure = 0.0
+
+    async def wait(self) -> None:
+        """Wait out the current pause, if any."""
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def failed(self, started_at: float) -> float:
+        """
+        Record a failed request.
+
+        Args:
+            started_at: time.monotonic() when the request was sent
+
+        Returns:
+            float: Seconds until requests resume
+        """
+        now = time.monotonic()
+        if started_at >= self._last_failure:
+            delay = min(self.maximum, self.base * 2 ** self.failures)
+            self.failures += 1
+            self._last_failure = now
+            self.resume_at = max(self.resume_at, now + delay)
+        return max(0.0, self.resume_at - now)
+
+    def succeeded(self) -> None:
+        """Record a successful request (the next failure starts from the base pause)."""
+        self.failures = 0
+
+
+class AiohttpTransport:
+    """Sheets REST calls over aiohttp, authorized with google-auth credentials."""
+
+    def __init__(self, creds, timeout: float = 30.0):
+        """
+        Initialize transport.
+
+        Args:
+            creds: google-auth credentials (refreshed in a worker thread when expired)
+            timeout: Total timeout per request in seconds
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for the async Sheets client (pip install aiohttp)")
+        self.creds = creds
+        self.timeout = timeout
+        self._session = None
+
+    async def call(self, method: str, **kwargs) -> Dict[str, Any]:
+        """
+        Run one API method.
+
+        Args:
+            method: Method name as in the discovery client ('values.get', 'values.batchUpdate', ...)
+            **kwargs: The discovery client's keyword arguments (spreadsheetId, range, body, ...)
+
+        Returns:
+            Dict[str, Any]: Decoded JSON response
+
+        Raises:
+            HttpError: For HTTP error responses
+        """
+        http_method, url, params, body = self._route(method, kwargs)
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        headers = await self._auth_headers()
+        async with self._session.request(http_method, url, params=params, json=body, headers=headers) as response:
+            content = await response.read()
+            if response.status >= 400:
+                raise HttpError(httplib2.Response({'status': response.status}), content)
+            return json.loads(content) if content else {}
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        if not self.creds.valid:
+            from google.auth.transport.requests import Request
+            await asyncio.get_running_loop().run_in_executor(None, self.creds.refresh, Request())
+        return {'Authorization': f"Bearer {self.creds.token}"}
+
+    @staticmethod
+    def _route(method: str, kwargs: Dict[str, Any]):
+        """Map a discovery-style call to (HTTP method, URL, query parameters, JSON body)."""
+        base = f"{SHEETS_API_URL}/{quote(kwargs['spreadsheetId'], safe='')}/values"
+        major_dimension = kwargs.get('majorDimension', 'ROWS')
+        if method == 'values.get':
+            return 'GET', f"{base}/{quote(kwargs['range'], safe='')}", {'majorDimension': major_dimension}, None
+        if method == 'values.batchGet':
+            params = [('ranges', a1) for a1 in kwargs['ranges']] + [('majorDimension', major_dimension)]
+            return 'GET', f"{base}:batchGet", params, None
+        if method == 'values.update':
+            params = {'valueInputOption': kwargs.get('valueInputOption', 'RAW')}
+            return 'PUT', f"{base}/{quote(kwargs['range'], safe='')}", params, kwargs['body']
+        if method == 'values.batchUpdate':
+            return 'POST', f"{base}:batchUpdate", None, kwargs['body']
+        if method == 'values.batchClear':
+            return 'POST', f"{base}:batchClear", None, kwargs['body']
+        raise ValueError(f"Unsupported Sheets method: {method}")
+
+
+class AsyncSheetsClient:
+    """Awaitable guest reads and attendance writes for a GoogleSheetsService.
+
+    Shares the service's spreadsheet, column schema and guest cache, so
+    sync and async callers see the same data. Create it with
+    GoogleSheetsService.async_client() and use it from one event loop.
+    """
+
+    def __init__(self, sheets_service, transport, max_concurrency: int = 8, retries: Optional[int] = None):
+        """
+        Initialize client.
+
+        Args:
+            sheets_service: GoogleSheetsService whose spreadsheet, schema and cache are used
+            transport: Object with an async call(method, **kwargs) (AiohttpTransport or the emulator's)
+            max_concurrency: Requests in flight at once
+            retries: Attempts per request (default: the service's connection retries)
+        """
+        self.sheets = sheets_service
+        self.transport = transport
+        self.logger: logging.Logger = sheets_service.logger
+        self.max_concurrency = max(1, max_concurrency)
+        self.retries = retries or sheets_service._connection_retries
+        self.backoff = SharedBackoff()
+        self._semaphore: Optional[asyncio.Semaphore] = None  # Created on the running loop
+        self._rows_task: Optional[asyncio.Future] = None
+
+    async def call(self, method: str, **kwargs) -> Dict[str, Any]:
+        """
+        Run one API method with the concurrency limit and shared backoff.
+
+        Network errors and HTTP 429/5xx are retried; other errors are raised.
+
+        Args:
+            method: Method name ('values.get', 'values.batchGet', 'values.update', ...)
+            **kwargs: Method arguments (spreadsheetId defaults to the service's)
+
+        Returns:
+            Dict[str, Any]: API response
+        """
+        kwargs.setdefault('spreadsheetId', self.sheets.spreadsheet_id)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        for attempt in range(self.retries):
+            await self.backoff.wait()
+            async with self._semaphore:
+                started_at = time.monotonic()
+                try:
+                    result = await self.transport.call(method, **kwargs)
+                except HttpError as e:
+                    if e.resp.status not in RETRY_STATUSES or attempt == self.retries - 1:
+                        raise
+                    reason = f"HTTP error {e.resp.status}"
+                except NETWORK_ERRORS as e:
+                    if attempt == self.retries - 1:
+                        raise
+                    reason = f"Network error: {e}"
+                else:
+                    self.backoff.succeeded()
+                    return result
+            delay = self.backoff.failed(started_at)
+            self.logger.warning(f"{reason} (attempt {attempt + 1}/{self.retries}) - "
+                                f"pausing Sheets requests for {delay:.1f}s")
+
+    async def get_schema(self, for_write: bool = False) -> SheetSchema:
+        """Awaitable GoogleSheetsService.get_schema() (the schema is shared with the service)."""
+        sheets = self.sheets
+        schema = sheets._schema
+        if sheets._schema_is_fresh(schema, for_write):
+            return schema
+        try:
+            result = await self.call('values.get', range=f"{sheets.sheet_name}!1:1")
+        except Exception as e:
+            if for_write:
+                raise
+            sheets._log_schema_error(e, False)
+            with sheets._schema_lock:
+                return sheets._schema_unavailable()
+        headers = result.get('values', [[]])[0] if result.get('values') else []
+        with sheets._schema_lock:
+            return sheets._update_schema(headers)
+
+    async def get_all_guests(self) -> List[GuestRecord]:
+        """
+        Awaitable GoogleSheetsService.get_all_guests().
+
+        The first page is read alone; if the sheet has more rows, the rest are
+        read max_concurrency pages at a time. Returns cached guests on failure.
+
+        Returns:
+            List of GuestRecord objects
+        """
+        sheets = self.sheets
+        try:
+            schema = await self.get_schema()
+            if not schema.station_columns:
+                self.logger.warning("No station columns detected")
+                return sheets._cached_guests
+
+            decoder = schema.decoder
+            chunk = sheets.read_chunk_rows
+            errors = RowErrors()
+            guests = []
+            first_row, wave = 2, 1
+            while True:
+                starts = [first_row + i * chunk for i in range(wave)]
+                pages = await asyncio.gather(*(
+                    self.call('values.get', range=f"{sheets.sheet_name}!A{start}:{decoder.last_column}{start + chunk - 1}")
+                    for start in starts
+                ))
+                finished = False
+                for start, page in zip(starts, pages):
+                    rows = page.get('values', [])
+                    guests.extend(decoder.decode(rows, start, errors))
+                    if len(rows) < chunk:
+                        finished = True
+                        break
+                if finished:
+                    break
+                first_row, wave = starts[-1] + chunk, self.max_concurrency
+            errors.log(self.logger)
+
+            await asyncio.get_running_loop().run_in_executor(None, sheets._store_guests, guests, schema)
+            return guests
+
+        except Exception as e:
+            self.logger.error(f"Error fetching data from Google Sheets: {e}")
+            if sheets._cached_guests:
+                self.logger.info(f"Using cached guest data ({len(sheets._cached_guests)} guests)")
+            return sheets._cached_guests
+
+    async def mark_attendance(self, original_id: int, station: str, timestamp: str = "X") -> bool:
+        """
+        Awaitable GoogleSheetsService.mark_attendance().
+
+        Concurrent calls share one read of the ID column to find their rows.
+
+        Args:
+            original_id: Guest's original ID
+            station: Station name (dynamically detected from headers)
+            timestamp: Value to put in the cell (default "X")
+
+        Returns:
+            bool: True if successful
+        """
+        sheets = self.sheets
+        try:
+            schema = await self.get_schema(for_write=True)
+            column = schema.column_for(station)
+            if not column:
+                self.logger.error(f"Unknown station: {station}. Available stations: {list(schema.station_columns.keys())}")
+                return False
+            row_number = (await self._guest_rows()).get(int(original_id))
+            if not row_number:
+                self.logger.warning(f"Guest with ID {original_id} not found")
+                return False
+
+            await self.call('values.update', range=f"{sheets.sheet_name}!{column}{row_number}",
+                            valueInputOption='RAW', body={'values': [[timestamp]]})
+            self.logger.info(f"Marked attendance for guest {original_id} at {station} (Column {column})")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error marking attendance: {e}")
+            sheets._on_write_error()
+            return False
+
+    async def batch_update_attendance(self, updates: List[Dict[str, Any]]) -> bool:
+        """
+        Awaitable GoogleSheetsService.batch_update_attendance().
+
+        Args:
+            updates: List of dicts with 'original_id', 'station', and 'timestamp'
+
+        Returns:
+            bool: True if successful
+        """
+        sheets = self.sheets
+        try:
+            schema = await self.get_schema(for_write=True)
+            requests = sheets._attendance_requests(schema, await self._guest_rows(), updates)
+            if not requests:
+                return False
+            await self.call('values.batchUpdate', body={'valueInputOption': 'RAW', 'data': requests})
+            self.logger.info(f"Batch updated {len(requests)} attendance records")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error in batch update: {e}")
+            sheets._on_write_error()
+            return False
+
+    async def close(self) -> None:
+        """Close the transport's connections."""
+        await self.transport.close()
+
+    async def _guest_rows(self) -> Dict[int, int]:
+        """Map guest IDs to rows; callers arriving while a read is in flight share it."""
+        task = self._rows_task
+        if task is None or task.done():
+            task = self._rows_task = asyncio.ensure_future(self._read_guest_rows())
+        return await task
+
+    async def _read_guest_rows(self) -> Dict[int, int]:
+        result = await self.call('values.get', range=f"{self.sheets.sheet_name}!{ID_COLUMN}:{ID_COLUMN}")
+        return self.sheets._parse_guest_rows(result.get('values', []))
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk wristband registration: step through the guest list, bind each tapped
+tag locally at once and write column E and the tag registry in batches.
+"""
+
+import logging
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Sequence
+
+from ..models import GuestRecord
+
+
+class BulkRegistration:
+    """Pre-registration session over an ordered guest list.
+
+    A tap binds the tag to the current guest in memory and advances to the
+    next guest, without any network or disk I/O. A background thread
+    flushes the pending column E writes (one ID column read plus one
+    batchUpdate) and journals the batch's bindings in one write, either every
+    flush_interval seconds or as soon as flush_size bindings are pending.
+    """
+
+    def __init__(self, tag_manager, guests: Sequence[GuestRecord], logger: logging.Logger,
+                 flush_size: int = 50, flush_interval: float = 5.0):
+        """
+        Initialize session.
+
+        Args:
+            tag_manager: TagManager the tags are bound in
+            guests: Guests to register, in the order they are handed out
+            logger: Logger instance
+            flush_size: Pending bindings that trigger an early flush
+            flush_interval: Seconds between background flushes
+        """
+        self.tag_manager = tag_manager
+        self.guests: List[GuestRecord] = list(guests)
+        self.logger = logger
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.position = 0
+        self.registered = 0
+        self.failed_flushes = 0
+
+        self._pending: Dict[int, str] = {}  # Guest ID -> tag UID (latest binding wins)
+        self._session_tags: Dict[str, int] = {}  # Tag UID -> guest ID bound in this session
+        self._unsaved: List[str] = []  # Tags bound since the registry was last saved
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._wake = Event()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def current(self) -> Optional[GuestRecord]:
+        """Guest the next tapped tag will be bound to (None when the list is done)."""
+        return self.guests[self.position] if self.position < len(self.guests) else None
+
+    @property
+    def pending(self) -> int:
+        """Bindings not yet written to Google Sheets."""
+        return len(self._pending)
+
+    def seek(self, original_id: int) -> bool:
+        """
+        Continue from a specific guest.
+
+        Args:
+            original_id: Guest's original ID
+
+        Returns:
+            bool: True if the guest is in the list
+        """
+        for index, guest in enumerate(self.guests):
+            if guest.original_id == original_id:
+                self.position = index
+                return True
+        return False
+
+    def skip(self) -> Optional[GuestRecord]:
+        """Leave the current guest unregistered and move to the next one."""
+        if self.position < len(self.guests):
+            self.position += 1
+        return self.current
+
+    def register(self, tag) -> Optional[Dict[str, str]]:
+        """
+        Bind a tapped tag to the current guest and advance to the next guest.
+
+        The binding is local until the next flush. A tag already bound to
+        another guest in this session is refused (double tap or mixed-up
+        wristband); bindings from before the session are overwritten.
+
+        Args:
+            tag: Detected NFC tag
+
+        Returns:
+            Dict with tag info and guest name if bound, None otherwise
+        """
+        guest = self.current
+        if guest is None or not tag or not tag.uid:
+            return None
+
+        with self._lock:
+            bound_to = self._session_tags.get(tag.uid)
+            if bound_to is not None and bound_to != guest.original_id:
+                self.logger.warning(f"Tag {tag.uid} was already bound to guest {bound_to} in this session")
+                return None
+
+            tag.register_to_guest(guest.original_id, guest.full_name)
+            self.tag_manager.bind_tag(tag.uid, guest.original_id, save=False)
+            self._session_tags[tag.uid] = guest.original_id
+            self._pending[guest.original_id] = tag.uid
+            self._unsaved.append(tag.uid)
+            self.registered += 1
+            self.position += 1
+            pending = len(self._pending)
+
+        if pending >= self.flush_size:
+            self._wake.set()
+
+        return {
+            'tag_uid': tag.uid,
+            'original_id': guest.original_id,
+            'guest_name': guest.full_name,
+            'registered_at': datetime.now().isoformat(),
+            'action': 'bulk'
+        }
+
+    def flush(self) -> bool:
+        """
+        Journal new bindings and write pending wristband UUIDs to column E in one batch.
+
+        Returns:
+            bool: True if nothing is left pending
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                unsaved, self._unsaved = self._unsaved, []
+            if unsaved:
+                self.tag_manager.save_bindings(unsaved)
+            if not batch:
+                return True
+
+            if self.tag_manager.sheets_service.batch_write_wristband_uuids(batch):
+                self.logger.info(f"Bulk registration: wrote {len(batch)} wristband UUIDs to Google Sheets")
+                return True
+
+            # Keep the batch for the next flush; newer bindings of the same guests win
+            self.failed_flushes += 1
+            with self._lock:
+                batch.update(self._pending)
+                self._pending = batch
+            self.logger.warning(f"Bulk registration: {len(batch)} wristband UUIDs not written yet, will retry")
+            return False
+
+    def start(self) -> None:
+        """Start background flushing."""
+        if not self._thread or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> bool:
+        """
+        Stop background flushing and flush what is left.
+
+        Returns:
+            bool: True if every binding reached Google Sheets
+        """
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=10)
+        return self.flush()
+
+    def _flush_loop(self) -> None:
+        """Background flush loop."""
+        while not self._stop_event.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                if not self.flush():
+                    self._stop_event.wait(self.flush_interval)  # Back off while Sheets is unreachable
+            except Exception as e:
+                self.logger.error(f"Error in bulk registration flush: {e}")
+                self._stop_event.wait(self.flush_interval)
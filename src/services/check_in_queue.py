@@ -7,6 +7,7 @@ Ensures check-ins are never lost even if Google Sheets sync fails.
 
 import json
 import logging
+import uuid
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Callable
@@ -33,9 +34,12 @@ class CheckInQueue:
         self.sync_thread = None
         self.sheets_service = None
         self.sync_completion_callback: Optional[Callable[[], None]] = None
+        self.hub_client = None  # Optional HubClient; see set_hub_client()
 
         # Local check-in cache for immediate UI updates
         self.local_check_ins: Dict[int, Dict[str, str]] = {}
+        # Other stations' check-ins from the hub - display only, never written to Google Sheets from here
+        self.remote_check_ins: Dict[int, Dict[str, str]] = {}
 
         # Load existing queue
         self.load_queue()
@@ -82,9 +86,8 @@ class CheckInQueue:
         """
         try:
             with self.lock:
-                # Check if already checked in at this station
-                if original_id in self.local_check_ins and \
-                   self.local_check_ins[original_id].get(station.lower()):
+                # Check if already checked in at this station (here or, via the hub, elsewhere)
+                if self._has_check_in(original_id, station.lower()):
                     self.logger.warning(f"Guest {guest_name} already checked in at {station}")
                     return False  # Don't add duplicate
 
@@ -95,7 +98,8 @@ class CheckInQueue:
                     'timestamp': timestamp,
                     'guest_name': guest_name,
                     'queued_at': datetime.now().isoformat(),
-                    'attempts': 0
+                    'attempts': 0,
+                    'event_id': uuid.uuid4().hex
                 }
                 self.queue.append(check_in)
 
@@ -109,11 +113,148 @@ class CheckInQueue:
                 self.save_queue()
 
                 self.logger.info(f"Queued check-in: {guest_name} at {station}")
-                return True
+
+            # Tell the other stations right away
+            if self.hub_client:
+                self.hub_client.publish(self._hub_event(check_in))
+            return True
         except Exception as e:
             self.logger.error(f"Error adding check-in: {e}")
             return False
 
+    def apply_remote_check_in(self, original_id: int, station: str, timestamp: str) -> bool:
+        """
+        Record a check-in made at another station (received from the hub).
+
+        The check-in is only shown - the station that made it (or the hub)
+        writes it to Google Sheets, so resolve_sync_conflicts never re-queues
+        it here. It is evicted once a refresh shows it in the sheet.
+
+        Args:
+            original_id: Guest's original ID
+            station: Station name
+            timestamp: Check-in time
+
+        Returns:
+            bool: True if the local cache changed
+        """
+        with self.lock:
+            station_key = station.lower()
+            if self._has_check_in(original_id, station_key):
+                return False
+            self.remote_check_ins.setdefault(original_id, {})[station_key] = timestamp
+        return True
+
+    def apply_remote_clear(self, original_id: Optional[int] = None, station: Optional[str] = None,
+                           cleared_at: Optional[str] = None) -> bool:
+        """
+        Forget check-ins another station cleared from Google Sheets (received from the hub).
+
+        Pending writes for them are dropped too, so the clear is not undone by
+        this station. Check-ins queued after the clear are kept (a replayed
+        clear must not remove them).
+
+        Args:
+            original_id: Guest whose check-ins were cleared, None for every guest
+            station: Station that was cleared, None for every station
+            cleared_at: ISO time of the clear, None to drop every matching check-in
+
+        Returns:
+            bool: True if anything was removed
+        """
+        station_key = station.lower() if station else None
+
+        def covered(guest_id, key) -> bool:
+            return (original_id is None or guest_id == original_id) and (station_key is None or key == station_key)
+
+        removed = 0
+        with self.lock:
+            kept = [item for item in self.queue
+                    if not covered(item['original_id'], item['station'].lower())
+                    or (cleared_at and item.get('queued_at', '') > cleared_at)]
+            removed += len(self.queue) - len(kept)
+            # Cached check-ins of kept items are newer than the clear
+            newer = {(item['original_id'], item['station'].lower()) for item in kept}
+            self.queue = kept
+            for cache in (self.local_check_ins, self.remote_check_ins):
+                for guest_id in list(cache):
+                    for key in [key for key in cache[guest_id]
+                                if covered(guest_id, key) and (guest_id, key) not in newer]:
+                        del cache[guest_id][key]
+                        removed += 1
+                    if not cache[guest_id]:
+                        del cache[guest_id]
+            if removed:
+                self.save_queue()
+        return removed > 0
+
+    def evict_remote_check_ins(self, all_guests) -> None:
+        """Drop other stations' check-ins that refreshed Google Sheets data now shows."""
+        with self.lock:
+            if not self.remote_check_ins:
+                return
+            guests = {guest.original_id: guest for guest in all_guests}
+            for original_id in list(self.remote_check_ins):
+                guest = guests.get(original_id)
+                if not guest:
+                    continue
+                stations = self.remote_check_ins[original_id]
+                for station_key in [key for key in stations if str(guest.get_check_in_time(key) or '').strip()]:
+                    del stations[station_key]
+                if not stations:
+                    del self.remote_check_ins[original_id]
+
+    def apply_hub_ack(self, event: Dict, duplicate: bool) -> None:
+        """
+        Handle the hub's acknowledgement of a published check-in.
+
+        When the hub writes Google Sheets for the stations, the item leaves the
+        sync queue here; the local cache keeps it until the next refresh. A
+        duplicate stays queued and is written by this station unless Google
+        Sheets already holds a check-in there (the hub may know of one the
+        sheet no longer has).
+
+        Args:
+            event: The acknowledged event
+            duplicate: True if another station had already checked the guest in there
+        """
+        if duplicate:
+            self.logger.info(f"Hub: {event.get('guest_name')} was already checked in at {event.get('station')}")
+        if not (self.hub_client and self.hub_client.hub_writes_sheets):
+            return
+        with self.lock:
+            if duplicate:
+                for item in self.queue:
+                    if item.get('event_id') == event.get('event_id'):
+                        item['hub_duplicate'] = True
+                self.save_queue()
+                return
+            before = len(self.queue)
+            self.queue = [item for item in self.queue if item.get('event_id') != event.get('event_id')]
+            if len(self.queue) != before:
+                self.save_queue()
+
+    def set_hub_client(self, hub_client) -> None:
+        """
+        Publish check-ins through a station hub.
+
+        While connected to a hub that writes Google Sheets, pending check-ins
+        are handed to the hub instead of being written by this station.
+        """
+        self.hub_client = hub_client
+
+    @staticmethod
+    def _hub_event(check_in: Dict) -> Dict:
+        """Build the hub event for a queued check-in."""
+        return {
+            'type': 'check_in',
+            'event_id': check_in['event_id'],
+            'original_id': check_in['original_id'],
+            'station': check_in['station'],
+            'timestamp': check_in['timestamp'],
+            'guest_name': check_in['guest_name'],
+        }
+
     def has_check_in(self, original_id: int, station: str) -> bool:
         """
         Check if guest already has a check-in at the specified station.
@@ -126,17 +267,25 @@ class CheckInQueue:
             bool: True if guest already checked in at this station
         """
         with self.lock:
-            return (original_id in self.local_check_ins and
-                   self.local_check_ins[original_id].get(station.lower()) is not None)
+            return self._has_check_in(original_id, station.lower())
+
+    def _has_check_in(self, original_id: int, station_key: str) -> bool:
+        """Check both caches (caller holds the lock)."""
+        return bool(self.local_check_ins.get(original_id, {}).get(station_key) or
+                    self.remote_check_ins.get(original_id, {}).get(station_key))
 
     def get_local_check_ins(self, original_id: int) -> Dict[str, str]:
-        """Get local check-in data for a guest."""
-        return self.local_check_ins.get(original_id, {})
+        """Get local check-in data for a guest (including other stations' not yet in the sheet)."""
+        with self.lock:
+            return {**self.remote_check_ins.get(original_id, {}), **self.local_check_ins.get(original_id, {})}
 
     def get_all_local_check_ins(self) -> Dict[int, Dict[str, str]]:
-        """Get all local check-in data."""
+        """Get all local check-in data (including other stations' not yet in the sheet)."""
         with self.lock:
-            return self.local_check_ins.copy()
+            merged = {original_id: dict(stations) for original_id, stations in self.remote_check_ins.items()}
+            for original_id, stations in self.local_check_ins.items():
+                merged.setdefault(original_id, {}).update(stations)
+            return merged
 
     def set_sheets_service(self, sheets_service) -> None:
         """Set Google Sheets service for syncing."""
@@ -174,18 +323,40 @@ class CheckInQueue:
 
     def _process_queue(self) -> None:
         """Process pending check-ins in queue."""
-        if not self.sheets_service or not self.queue:
+        if not self.queue:
+            return
+
+        via_hub = bool(self.hub_client and self.hub_client.connected and self.hub_client.hub_writes_sheets)
+        if via_hub:
+            # The hub batches Google Sheets writes; make sure it has every pending item
+            with self.lock:
+                for check_in in self.queue:
+                    check_in.setdefault('event_id', uuid.uuid4().hex)
+                pending = [self._hub_event(check_in) for check_in in self.queue if not check_in.get('hub_duplicate')]
+                direct = any(check_in.get('hub_duplicate') for check_in in self.queue)
+            for event in pending:
+                self.hub_client.publish(event)
+            if not direct:
+                return
+
+        if not self.sheets_service:
             return
 
         with self.lock:
             # Process a copy to avoid holding lock during API calls
+            for check_in in self.queue:
+                check_in.setdefault('event_id', uuid.uuid4().hex)
             pending = self.queue.copy()
 
-        successful = []
+        successful = set()  # Event IDs, the queue may change while syncing
         retry_delay = 30  # Reduced retry delay from 60 to 30 seconds
         any_synced = False
 
-        for i, check_in in enumerate(pending):
+        for check_in in pending:
+            # The hub writes these (duplicates it refused are written here)
+            if via_hub and not check_in.get('hub_duplicate'):
+                continue
+
             # Skip if recently failed (but reduce wait time)
             if check_in['attempts'] > 0:
                 last_attempt = datetime.fromisoformat(check_in.get('last_attempt', check_in['queued_at']))
@@ -198,7 +369,7 @@ class CheckInQueue:
                 existing_time = guest.get_check_in_time(check_in['station'].lower()) if guest else None
                 if guest and existing_time and str(existing_time).strip():
                     # Google Sheets already has meaningful data - remove from queue and local cache
-                    successful.append(i)
+                    successful.add(check_in['event_id'])
                     self.logger.info(f"Skipping sync for {check_in['guest_name']} at {check_in['station']} - already in Google Sheets")
 
                     # Remove from local cache since it's already in Google Sheets
@@ -220,7 +391,7 @@ class CheckInQueue:
                 )
 
                 if success:
-                    successful.append(i)
+                    successful.add(check_in['event_id'])
                     self.logger.info(f"Synced check-in: {check_in['guest_name']} at {check_in['station']}")
                     any_synced = True
                 else:
@@ -233,7 +404,7 @@ class CheckInQueue:
                         self.logger.warning(f"Sync conflict: {check_in['guest_name']} at {check_in['station']} - "
                                           f"Local: {check_in['timestamp']}, Sheets: {sheets_time} - "
                                           f"Keeping Google Sheets data")
-                        successful.append(i)
+                        successful.add(check_in['event_id'])
                         # DON'T remove from local cache here - do it after processing all items
                     else:
                         # Real failure - increment attempts
@@ -242,7 +413,7 @@ class CheckInQueue:
                         # Force retry after max 3 attempts
                         if check_in['attempts'] >= 3:
                             self.logger.error(f"Max sync attempts reached for {check_in['guest_name']} at {check_in['station']}")
-                            successful.append(i)  # Remove from queue after max attempts
+                            successful.add(check_in['event_id'])  # Remove from queue after max attempts
 
             except Exception as e:
                 self.logger.error(f"Failed to sync check-in: {e}")
@@ -252,21 +423,20 @@ class CheckInQueue:
         # Remove successful items from queue
         if successful:
             with self.lock:
-                # Remove in reverse order to maintain indices
-                for i in sorted(successful, reverse=True):
-                    if i < len(self.queue):
-                        check_in = self.queue[i]
-
-                        # Clean up local cache for successfully synced items
-                        if check_in['original_id'] in self.local_check_ins:
-                            station_key = check_in['station'].lower()
-                            if station_key in self.local_check_ins[check_in['original_id']]:
-                                del self.local_check_ins[check_in['original_id']][station_key]
-                                # Remove guest entry if no more stations
-                                if not self.local_check_ins[check_in['original_id']]:
-                                    del self.local_check_ins[check_in['original_id']]
-
-                        self.queue.pop(i)
+                for check_in in self.queue:
+                    if check_in.get('event_id') not in successful:
+                        continue
+
+                    # Clean up local cache for successfully synced items
+                    if check_in['original_id'] in self.local_check_ins:
+                        station_key = check_in['station'].lower()
+                        if station_key in self.local_check_ins[check_in['original_id']]:
+                            del self.local_check_ins[check_in['original_id']][station_key]
+                            # Remove guest entry if no more stations
+                            if not self.local_check_ins[check_in['original_id']]:
+                                del self.local_check_ins[check_in['original_id']]
+
+                self.queue = [check_in for check_in in self.queue if check_in.get('event_id') not in successful]
                 self.save_queue()
 
         # Call sync completion callback if any items were synced
@@ -329,7 +499,8 @@ class CheckInQueue:
                                 'guest_name': guest.full_name,
                                 'queued_at': datetime.now().isoformat(),
                                 'attempts': 0,
-                                'conflict_resolved': True
+                                'conflict_resolved': True,
+                                'event_id': uuid.uuid4().hex
                             }
                             self.queue.append(conflict_item)
                             conflicts_found += 1
@@ -348,6 +519,7 @@ class CheckInQueue:
         with self.lock:
             self.queue.clear()
             self.local_check_ins.clear()
+            self.remote_check_ins.clear()
             self.save_queue()
         self.logger.warning("All local check-in data cleared")
 
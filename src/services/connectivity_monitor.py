@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Background connectivity monitor.
+Probes internet / Google Sheets reachability off the UI thread and publishes
+state changes through a queue the GUI drains with after().
+"""
+
+import logging
+import queue
+from threading import Thread, Event
+from typing import Callable, NamedTuple, Optional
+
+import requests
+
+
+class ConnectivityState(NamedTuple):
+    """Connectivity snapshot published to the UI."""
+    internet: bool
+    sheets_status: str  # One of the ConnectivityMonitor.SHEETS_* values
+
+
+class ConnectivityMonitor:
+    """Periodically probes connectivity in a background thread."""
+
+    PROBE_URL = "https://sheets.googleapis.com/"
+    PROBE_TIMEOUT = 4
+    CHECK_INTERVAL = 10
+
+    SHEETS_CONNECTED = "connected"
+    SHEETS_EMPTY = "empty"
+    SHEETS_RATE_LIMITED = "rate_limited"
+    SHEETS_OFFLINE = "offline"
+    SHEETS_NO_INTERNET = "no_internet"
+
+    def __init__(self, logger: logging.Logger, sheets_probe: Optional[Callable[[], list]] = None,
+                 probe_url: str = PROBE_URL, interval: float = CHECK_INTERVAL):
+        """
+        Initialize connectivity monitor.
+
+        Args:
+            logger: Logger instance
+            sheets_probe: Callable returning station names (e.g. sheets_service.get_available_stations)
+            probe_url: URL probed with a HEAD request; any HTTP response counts as reachable
+            interval: Seconds between probes
+        """
+        self.logger = logger
+        self.sheets_probe = sheets_probe
+        self.probe_url = probe_url
+        self.interval = interval
+        self.updates: "queue.Queue[ConnectivityState]" = queue.Queue()
+        self.state = ConnectivityState(True, self.SHEETS_CONNECTED)  # Optimistic until first probe
+
+        self._session = requests.Session()  # Keep-alive connection reused across probes
+        self._stop_event = Event()
+        self._wake_event = Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the background probe thread."""
+        if not self._thread or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = Thread(target=self._monitor_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background probe thread."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.PROBE_TIMEOUT + 1)
+        self._session.close()
+
+    def check_now(self) -> None:
+        """Ask for a probe as soon as possible (never blocks)."""
+        self._wake_event.set()
+
+    def probe_internet(self) -> bool:
+        """Check reachability with a HEAD request over the reused session."""
+        try:
+            response = self._session.head(self.probe_url, timeout=self.PROBE_TIMEOUT, allow_redirects=False)
+            response.close()
+            return True
+        except requests.RequestException:
+            return False
+
+    def probe_sheets(self) -> str:
+        """Check Google Sheets status (only meaningful when the internet is reachable)."""
+        if not self.sheets_probe:
+            return self.SHEETS_OFFLINE
+        try:
+            return self.SHEETS_CONNECTED if self.sheets_probe() else self.SHEETS_EMPTY
+        except Exception as e:
+            if "429" in str(e) or "quota" in str(e).lower():
+                return self.SHEETS_RATE_LIMITED
+            return self.SHEETS_OFFLINE
+
+    def _monitor_loop(self) -> None:
+        """Probe loop; publishes a new state only when it changes."""
+        first = True
+        while not self._stop_event.is_set():
+            try:
+                internet = self.probe_internet()
+                sheets_status = self.probe_sheets() if internet else self.SHEETS_NO_INTERNET
+                state = ConnectivityState(internet, sheets_status)
+                if first or state != self.state:
+                    if not first and state.internet != self.state.internet:
+                        self.logger.info(f"Internet connection {'restored' if state.internet else 'lost'}")
+                    self.state = state
+                    self.updates.put(state)
+                    first = False
+            except Exception as e:
+                self.logger.debug(f"Connectivity probe error: {e}")
+
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
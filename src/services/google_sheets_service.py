@@ -5,7 +5,7 @@ Google Sheets service for managing attendance data.
 """
 
 import logging
-from typing import List, Dict, Optional, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 import json
 
@@ -15,37 +15,152 @@ from googleapiclient.errors import HttpError
 import time
 import ssl
 import socket
+import threading
 
 from ..models import GuestRecord
+from .async_sheets_client import AsyncSheetsClient, AiohttpTransport
+from .row_decoder import RowErrors, column_letter
+from .sheet_schema import SheetSchema, FALLBACK_STATIONS, ID_COLUMN, WRISTBAND_COLUMN, fingerprint_columns
+from .sheets_connection import SheetsConnection
 
 
 class GoogleSheetsService:
     """Service for interacting with Google Sheets."""
     
-    def __init__(self, config: dict, logger: logging.Logger):
+    READ_CHUNK_ROWS = 10000  # Smaller guest lists are read in one request
+    SCHEMA_TTL = 60  # Seconds before the header row is re-read
+    
+    def __init__(self, config: dict, logger: logging.Logger, service_factory: Optional[Callable[[], Any]] = None,
+                 connection: Optional[SheetsConnection] = None):
         """
         Initialize Google Sheets service.
         
         Args:
             config: Google Sheets configuration
             logger: Logger instance
+            service_factory: Returns a Sheets API client instead of build() (e.g. tools/sheets_emulator.py)
+            connection: Credentials and clients shared with other tabs (see tab())
         """
         self.config = config
         self.logger = logger
-        self.creds = None
-        self.service = None
+        self.connection = connection or SheetsConnection(service_factory)
+        self.service_factory = self.connection.service_factory
         self.spreadsheet_id = config['spreadsheet_id']
         self.sheet_name = config.get('sheet_name', 'Sheet1')
-        self._cached_stations = None  # Cache for dynamic station detection
+        self._tabs: Dict[str, 'GoogleSheetsService'] = {self.sheet_name: self}  # Shared by every tab
+        self._schema: Optional[SheetSchema] = None  # Column layout from the header row
+        self._schema_version = 0
+        self._schema_stale = False  # Set by write errors and clear_station_cache()
+        self._schema_lock = threading.Lock()  # Guards schema updates only, never held during API calls
+        self._schema_fetch_lock = threading.Lock()  # One header read at a time from the sync API
+        self.schema_ttl = float(config.get('schema_ttl', self.SCHEMA_TTL))
         self._connection_retries = 3  # Number of retries for network errors
         
         # Guest data caching
         self._cached_guests = []
-        self.guest_cache_file = Path("config/guest_cache.json")
+        self._cached_schema_version = None  # Schema of the last full read (column refreshes need it)
+        self._fingerprint = None  # Fingerprint of the last refresh made by get_guests_if_changed()
+        self.guests_from_cache = False  # Last guest read failed and returned the cached list
+        self.guest_cache_file = Path(config.get('guest_cache_file', "config/guest_cache.json"))
+        self.read_chunk_rows = int(config.get('read_chunk_rows', self.READ_CHUNK_ROWS))  # Rows per guest list read
+        self.async_max_concurrency = int(config.get('async_max_concurrency', 8))  # Requests in flight per async client
         
         # Load cached guest data
         self.load_guest_cache()
         
+    @property
+    def creds(self):
+        """Service account credentials (shared by every tab)."""
+        return self.connection.creds
+
+    @creds.setter
+    def creds(self, creds) -> None:
+        self.connection.creds = creds
+
+    @property
+    def service(self):
+        """API client built at authentication (shared by every tab)."""
+        return self.connection.service
+
+    @service.setter
+    def service(self, service) -> None:
+        self.connection.service = service
+
+    def tab(self, sheet_name: str) -> 'GoogleSheetsService':
+        """
+        Get the service for another tab (event) of the same spreadsheet.
+
+        Tabs share the credentials and API clients but keep their own schema,
+        guest cache (memory and file) and change fingerprint, so switching
+        between tabs that were already read needs no request. Each tab is
+        created once and reused.
+
+        Args:
+            sheet_name: Tab name
+
+        Returns:
+            GoogleSheetsService: Service bound to the tab
+        """
+        tab = self._tabs.get(sheet_name)
+        if tab is None:
+            config = dict(self.config, sheet_name=sheet_name,
+                          guest_cache_file=str(self.tab_file(self.guest_cache_file, sheet_name)))
+            tab = GoogleSheetsService(config, self.logger, connection=self.connection)
+            tab._tabs = self._tabs
+            self._tabs[sheet_name] = tab
+        return tab
+
+    def open_tabs(self) -> List['GoogleSheetsService']:
+        """Get every tab service created so far (including this one)."""
+        return list(self._tabs.values())
+
+    def list_tabs(self) -> List[str]:
+        """
+        Get the names of the spreadsheet's tabs.
+
+        Returns:
+            List[str]: Tab names in spreadsheet order (empty if they cannot be read)
+        """
+        try:
+            result = self._make_api_call(
+                lambda: self._get_thread_safe_service().spreadsheets().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    fields='sheets.properties.title'
+                ).execute()
+            )
+            return [sheet['properties']['title'] for sheet in result.get('sheets', [])]
+        except Exception as e:
+            self.logger.warning(f"Could not list spreadsheet tabs: {e}")
+            return []
+
+    def warm_tabs(self, sheet_names: Sequence[str]) -> None:
+        """
+        Read the guest list of each tab that has not been read yet, so switching to it is instant.
+
+        Args:
+            sheet_names: Tab names
+        """
+        for sheet_name in sheet_names:
+            tab = self.tab(sheet_name)
+            if tab._cached_schema_version is None:
+                tab.get_all_guests()
+
+    @staticmethod
+    def tab_file(path: Path, sheet_name: str) -> Path:
+        """
+        Per-tab variant of a local file path (config/guest_cache.json -> config/guest_cache_day_2.json).
+
+        Args:
+            path: File path of the configured tab
+            sheet_name: Tab name
+
+        Returns:
+            Path: File path for the tab
+        """
+        path = Path(path)
+        slug = ''.join(c if c.isalnum() else '_' for c in sheet_name).strip('_').lower() or 'tab'
+        return path.with_name(f"{path.stem}_{slug}{path.suffix}")
+
     def load_guest_cache(self) -> None:
         """Load cached guest data from file."""
         if self.guest_cache_file.exists():
@@ -61,7 +176,8 @@ class GoogleSheetsService:
                             firstname=guest_data['firstname'],
                             lastname=guest_data['lastname'],
                             stations=guest_data.get('station_names', []),
-                            mobile_number=guest_data.get('mobile_number', '')
+                            mobile_number=guest_data.get('mobile_number', ''),
+                            wristband_uuid=guest_data.get('wristband_uuid')
                         )
                         # Restore check-ins
                         if 'check_ins' in guest_data:
@@ -78,21 +194,23 @@ class GoogleSheetsService:
         """Save guest data to cache file."""
         try:
             self.guest_cache_file.parent.mkdir(exist_ok=True)
-            # Convert GuestRecord objects to dict for JSON serialization
-            cache_data = []
-            for guest in guests:
-                guest_dict = {
-                    'original_id': guest.original_id,
-                    'firstname': guest.firstname,
-                    'lastname': guest.lastname,
-                    'mobile_number': getattr(guest, 'mobile_number', ''),
-                    'check_ins': getattr(guest, 'check_ins', {}),
-                    'station_names': getattr(guest, 'station_names', list(guest.check_ins.keys()) if hasattr(guest, 'check_ins') else [])
-                }
-                cache_data.append(guest_dict)
-            
+            # Encode one guest at a time: compact output keeps the C JSON encoder
+            # (indent forces the pure-Python one) and no full copy is held in memory
+            encoder = json.JSONEncoder(separators=(',', ':'), default=str)
             with open(self.guest_cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+                f.write('[')
+                for i, guest in enumerate(guests):
+                    guest_dict = {
+                        'original_id': guest.original_id,
+                        'firstname': guest.firstname,
+                        'lastname': guest.lastname,
+                        'mobile_number': getattr(guest, 'mobile_number', ''),
+                        'wristband_uuid': getattr(guest, 'wristband_uuid', None),
+                        'check_ins': guest.check_ins.copy(),
+                        'station_names': guest.get_all_stations()
+                    }
+                    f.write((',' if i else '') + encoder.encode(guest_dict))
+                f.write(']')
             self.logger.debug(f"Saved {len(guests)} guests to cache")
         except Exception as e:
             self.logger.warning(f"Failed to save guest cache: {e}")
@@ -104,6 +222,11 @@ class GoogleSheetsService:
         Returns:
             bool: True if authenticated successfully
         """
+        if self.service_factory:
+            self.service = self.service_factory()
+            self.logger.info("Using injected Google Sheets API client")
+            return True
+
         try:
             service_account_file = self.config.get('service_account_file')
             if not service_account_file:
@@ -131,18 +254,27 @@ class GoogleSheetsService:
             self.logger.error(f"Failed to authenticate with Google Sheets: {e}")
             return False
 
+    def async_client(self, transport=None) -> AsyncSheetsClient:
+        """
+        Create an asyncio client sharing this service's spreadsheet, schema and guest cache.
+
+        Args:
+            transport: Async transport (default: aiohttp with this service's credentials; requires aiohttp)
+
+        Returns:
+            AsyncSheetsClient: Client for awaitable reads and writes
+        """
+        if transport is None:
+            transport = AiohttpTransport(self.creds)
+        return AsyncSheetsClient(self, transport, max_concurrency=self.async_max_concurrency)
+
     def _get_thread_safe_service(self):
         """
         Get a thread-safe service instance. 
         This addresses WRONG_VERSION_NUMBER errors in concurrent scenarios.
         """
-        # For each API call in a thread, create a fresh service instance
-        # This prevents HTTP connection sharing issues
-        try:
-            return build('sheets', 'v4', credentials=self.creds, cache_discovery=False)
-        except Exception:
-            # Fallback to shared service instance
-            return self.service
+        # Each thread uses its own client (shared by every tab), so HTTP connections are never shared between threads
+        return self.connection.client()
 
     def _make_api_call(self, api_call_func, *args, **kwargs):
         """Make a resilient API call with retry logic for connection issues."""
@@ -150,6 +282,7 @@ class GoogleSheetsService:
             try:
                 return api_call_func(*args, **kwargs)
             except (ssl.SSLError, socket.error, ConnectionError, OSError) as e:
+                self.connection.discard_client()  # Reconnect on the next attempt
                 if attempt < self._connection_retries - 1:
                     wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
                     self.logger.warning(f"Network error (attempt {attempt + 1}/{self._connection_retries}) - retrying in {wait_time}s: {e}")
@@ -172,6 +305,116 @@ class GoogleSheetsService:
                 # Non-network errors should not be retried
                 raise e
     
+    def get_schema(self, fast_fail_startup: bool = False, for_write: bool = False) -> SheetSchema:
+        """
+        Get the column schema, re-reading the header row (row 1 only) when it is stale.
+
+        The schema is revalidated after schema_ttl seconds, after a write
+        error and after clear_station_cache(). If the header row cannot be
+        read, the last known schema is kept; before any header was read a
+        fallback layout is used for reads, but never for writes.
+        
+        Args:
+            fast_fail_startup: If True, use minimal retries for faster startup
+            for_write: Require a schema read from the sheet (raises if unavailable)
+        
+        Returns:
+            SheetSchema: Current schema
+        """
+        schema = self._schema
+        if self._schema_is_fresh(schema, for_write):
+            return schema
+
+        # The async client takes _schema_lock on its event loop, so the (retried) header
+        # read must not hold it; concurrent sync callers wait on the fetch lock instead
+        with self._schema_fetch_lock:
+            schema = self._schema
+            if self._schema_is_fresh(schema, for_write):
+                return schema
+
+            try:
+                headers = self._fetch_header_row(fast_fail_startup)
+            except Exception as e:
+                if for_write:
+                    raise
+                self._log_schema_error(e, fast_fail_startup)
+                with self._schema_lock:
+                    return self._schema_unavailable()
+            with self._schema_lock:
+                return self._update_schema(headers)
+
+    def _update_schema(self, headers: List[Any]) -> SheetSchema:
+        """Apply a freshly read header row (call with _schema_lock held)."""
+        schema = self._schema
+        self._schema_stale = False
+        if schema is not None and not schema.fallback and schema.matches(headers):
+            schema.validated_at = time.monotonic()
+            return schema
+
+        self._schema_version += 1
+        new_schema = SheetSchema(headers, self._schema_version)
+        if schema is not None and not schema.fallback:
+            self.logger.info(f"Sheet columns changed (schema v{new_schema.version}): "
+                             f"{new_schema.station_columns}")
+        self._schema = new_schema
+        return new_schema
+
+    def _schema_unavailable(self) -> SheetSchema:
+        """Schema to read with when the header row could not be read (call with _schema_lock held)."""
+        schema = self._schema
+        if schema is None:
+            # Fallback to hardcoded stations (columns start from F, wristband is in column E)
+            self._schema_version += 1
+            schema = self._schema = SheetSchema.fallback_schema(self._schema_version)
+        else:
+            schema.validated_at = time.monotonic()  # Keep the last known layout until the next revalidation
+        return schema
+
+    def _schema_is_fresh(self, schema: Optional[SheetSchema], for_write: bool) -> bool:
+        if schema is None or self._schema_stale or schema.age() >= self.schema_ttl:
+            return False
+        return not (for_write and schema.fallback)
+
+    def _fetch_header_row(self, fast_fail_startup: bool = False) -> List[Any]:
+        """Read row 1 of the sheet."""
+        range_name = f"{self.sheet_name}!1:1"
+        
+        # Use fast-fail for startup to prevent hanging
+        if fast_fail_startup:
+            # Single attempt with short timeout for startup
+            result = self._get_thread_safe_service().spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=range_name
+            ).execute()
+            self.logger.debug("Fetched stations from Google Sheets (startup)")
+        else:
+            # Normal retry logic for runtime calls
+            result = self._make_api_call(
+                lambda: self._get_thread_safe_service().spreadsheets().values().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=range_name
+                ).execute()
+            )
+            self.logger.debug("Fetched stations from Google Sheets (runtime)")
+        
+        return result.get('values', [[]])[0] if result.get('values') else []
+
+    def _log_schema_error(self, error: Exception, fast_fail_startup: bool) -> None:
+        # Clear logging for station fetching failures
+        if fast_fail_startup:
+            self.logger.info(f"Could not fetch stations - using fallback: {error}")
+        else:
+            # Only log first error, then use debug for subsequent ones
+            if not hasattr(self, '_dynamic_stations_error_logged'):
+                self.logger.warning(f"Could not fetch stations - retrying with fallback: {error}")
+                self._dynamic_stations_error_logged = True
+            else:
+                self.logger.debug(f"Dynamic stations API call failed: {error}")
+
+    def _on_write_error(self) -> None:
+        """A failed write may mean the columns moved: re-read the header row before the next operation."""
+        self._schema_stale = True
+
     def get_dynamic_stations(self, fast_fail_startup=False) -> Dict[str, str]:
         """
         Dynamically detect station columns from Google Sheets headers.
@@ -182,99 +425,44 @@ class GoogleSheetsService:
         Returns:
             Dict mapping station names (lowercase) to column letters
         """
-        try:
-            if self._cached_stations is not None:
-                return self._cached_stations
-                
-            # Get first row (headers) from spreadsheet with retry logic
-            range_name = f"{self.sheet_name}!1:1"
-            
-            # Use fast-fail for startup to prevent hanging
-            if fast_fail_startup:
-                try:
-                    # Single attempt with short timeout for startup
-                    result = self._get_thread_safe_service().spreadsheets().values().get(
-                        spreadsheetId=self.spreadsheet_id,
-                        range=range_name
-                    ).execute()
-                    self.logger.debug("Fetched stations from Google Sheets (startup)")
-                except Exception as e:
-                    # Immediate fallback during startup
-                    self.logger.debug(f"Station fetch failed during startup, using fallback: {e}")
-                    raise e
-            else:
-                # Normal retry logic for runtime calls
-                result = self._make_api_call(
-                    lambda: self._get_thread_safe_service().spreadsheets().values().get(
-                        spreadsheetId=self.spreadsheet_id,
-                        range=range_name
-                    ).execute()
-                )
-                self.logger.debug("Fetched stations from Google Sheets (runtime)")
-            
-            headers = result.get('values', [[]])[0] if result.get('values') else []
-            
-            # Build station mapping dynamically
-            station_columns = {}
-            
-            # Known fixed columns (originalid, firstname, lastname, mobilenumber, wristband)
-            expected_fixed_cols = ['originalid', 'firstname', 'lastname', 'mobilenumber', 'wristband']
-            
-            # Start from column F (index 5) to look for station headers (wristband is in column E)
-            for i, header in enumerate(headers[5:], start=5):
-                try:
-                    if header and isinstance(header, str) and header.strip():  # Only process string headers
-                        # Skip any non-alphabetic content (images, formulas, etc.)
-                        header_clean = header.strip()
-                        if header_clean.replace(' ', '').replace('_', '').replace('-', '').isalpha():
-                            station_name = header_clean.lower()
-                            column_letter = self._index_to_column_letter(i)
-                            station_columns[station_name] = column_letter
-                except Exception as e:
-                    # Skip problematic headers (images, complex objects, etc.)
-                    self.logger.debug(f"Skipping header at index {i}: {e}")
-                    continue
-            
-            # Cache the result
-            self._cached_stations = station_columns
-            return station_columns
-            
-        except Exception as e:
-            # Clear logging for station fetching failures
-            if fast_fail_startup:
-                self.logger.info(f"Could not fetch stations - using fallback: {e}")
-            else:
-                # Only log first error, then use debug for subsequent ones
-                if not hasattr(self, '_dynamic_stations_error_logged'):
-                    self.logger.warning(f"Could not fetch stations - retrying with fallback: {e}")
-                    self._dynamic_stations_error_logged = True
-                else:
-                    self.logger.debug(f"Dynamic stations API call failed: {e}")
-                    self.logger.debug("Using cached fallback stations")
-            
-            # Fallback to hardcoded stations (cached to avoid repeated failures)
-            # Note: Station columns start from F (wristband is in column E)
-            fallback_stations = {
-                'reception': 'F',
-                'lio': 'G', 
-                'juntos': 'H',
-                'experimental': 'I',
-                'unvrs': 'J'
-            }
-            self._cached_stations = fallback_stations
-            return fallback_stations
+        return self.get_schema(fast_fail_startup).station_columns
     
     def _index_to_column_letter(self, index: int) -> str:
         """Convert 0-based column index to Excel column letter (A, B, C, ..., Z, AA, AB, ...)"""
-        result = ""
-        while index >= 0:
-            result = chr(index % 26 + ord('A')) + result
-            index = index // 26 - 1
-        return result
+        return column_letter(index)
     
     def clear_station_cache(self):
-        """Clear cached station mapping to force re-detection on next call."""
-        self._cached_stations = None
+        """Force the header row to be re-read on the next call (the schema version only changes if it differs)."""
+        self._schema_stale = True
+
+    def _iter_row_chunks(self, last_column: str) -> Iterator[Tuple[int, List[List[Any]]]]:
+        """
+        Read the data rows (below the header) in chunks of read_chunk_rows rows.
+
+        Only one chunk of the API response is held at a time. The API omits
+        trailing empty rows, so a short chunk means the end of the data.
+
+        Args:
+            last_column: Last column to read
+
+        Yields:
+            Tuple[int, List[List[Any]]]: 1-based sheet row of the first row, rows
+        """
+        first_row = 2
+        while True:
+            range_name = f"{self.sheet_name}!A{first_row}:{last_column}{first_row + self.read_chunk_rows - 1}"
+            result = self._make_api_call(
+                lambda: self._get_thread_safe_service().spreadsheets().values().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=range_name
+                ).execute()
+            )
+            rows = result.get('values', [])
+            if rows:
+                yield first_row, rows
+            if len(rows) < self.read_chunk_rows:
+                return
+            first_row += self.read_chunk_rows
             
     def get_all_guests(self) -> List[GuestRecord]:
         """
@@ -286,9 +474,11 @@ class GoogleSheetsService:
         try:
             # Get dynamic station mapping first
             try:
-                station_columns = self.get_dynamic_stations()
+                schema = self.get_schema()
+                station_columns = schema.station_columns
             except Exception as station_error:
                 self.logger.warning(f"Failed to get dynamic stations: {station_error}")
+                self.guests_from_cache = True
                 # Return cached data if available when station detection fails
                 if self._cached_guests:
                     self.logger.info(f"Station detection failed, using cached guest data ({len(self._cached_guests)} guests)")
@@ -298,84 +488,17 @@ class GoogleSheetsService:
             # Calculate the last column letter based on detected stations
             if not station_columns:
                 self.logger.warning("No station columns detected")
+                self.guests_from_cache = True
                 if self._cached_guests:
                     self.logger.info(f"No stations detected, using cached guest data ({len(self._cached_guests)} guests)")
                     return self._cached_guests
                 return []
                 
-            max_col_index = max([ord(col) - ord('A') for col in station_columns.values()] + [7])  # At least H
-            last_col_letter = self._index_to_column_letter(max_col_index)
-            
-            # Define the range to read (dynamic based on detected stations)
-            range_name = f"{self.sheet_name}!A:{last_col_letter}"
-            
-            result = self._make_api_call(
-                lambda: self._get_thread_safe_service().spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=range_name
-                ).execute()
-            )
-            
-            values = result.get('values', [])
-            
-            if not values:
-                self.logger.warning("No data found in spreadsheet")
-                # Return cached data if available when spreadsheet is empty
-                if self._cached_guests:
-                    self.logger.info(f"Spreadsheet empty, using cached guest data ({len(self._cached_guests)} guests)")
-                    return self._cached_guests
-                return []
-                
-            # First row should be headers
-            headers = values[0] if values else []
-            guests = []
-            
-            # Create reverse mapping: column letter -> station name
-            col_to_station = {col: station for station, col in station_columns.items()}
-            
-            # Get list of station names for GuestRecord initialization
-            station_names = [station.title() for station in station_columns.keys()]
-            
-            # Process each row (skip header)
-            for row in values[1:]:
-                try:
-                    # Ensure we have at least the required fields
-                    if len(row) >= 3:
-                        # Clean the ID field by removing BOM and other non-numeric characters
-                        id_str = str(row[0]).strip().lstrip('\ufeff')
-                        original_id = int(id_str)
-                        firstname = row[1]
-                        lastname = row[2]
-                        
-                        # Get mobile number from column D (index 3) if available
-                        mobile_number = row[3] if len(row) > 3 else None
-                        
-                        # Get wristband UUID from column E (index 4) if available
-                        wristband_uuid = row[4] if len(row) > 4 and row[4].strip() else None
-                        
-                        # Initialize guest with dynamic stations, mobile number, and wristband UUID
-                        guest = GuestRecord(original_id, firstname, lastname, station_names, mobile_number, wristband_uuid)
-                        
-                        # Dynamically load check-ins based on detected stations
-                        for col_letter, station_name in col_to_station.items():
-                            col_index = ord(col_letter) - ord('A')  # Convert A=0, B=1, etc.
-                            if len(row) > col_index and row[col_index]:
-                                guest.check_ins[station_name] = row[col_index]
-                            
-                        guests.append(guest)
-                        
-                except (ValueError, IndexError) as e:
-                    self.logger.error(f"Error processing row {row}: {e}")
-                    continue
-                    
-            self.logger.info(f"Fetched {len(guests)} guests from spreadsheet")
-            # Save successful fetch to cache
-            self.save_guest_cache(guests)
-            self._cached_guests = guests  # Update in-memory cache
-            return guests
+            return self._read_all_guests(schema)
             
         except HttpError as e:
             self.logger.error(f"Error fetching data from Google Sheets: {e}")
+            self.guests_from_cache = True
             # Return cached data if available
             if self._cached_guests:
                 self.logger.info(f"Using cached guest data ({len(self._cached_guests)} guests)")
@@ -383,12 +506,190 @@ class GoogleSheetsService:
             return []
         except Exception as e:
             self.logger.error(f"Unexpected error fetching guests: {e}")
+            self.guests_from_cache = True
             # Return cached data if available
             if self._cached_guests:
                 self.logger.info(f"Using cached guest data ({len(self._cached_guests)} guests)")
                 return self._cached_guests
             return []
             
+    def _read_all_guests(self, schema: SheetSchema) -> List[GuestRecord]:
+        """Read and decode every guest row, updating the cache (raises on API errors)."""
+        # Decoder compiled once per header layout (column indexes, names, last column)
+        decoder = schema.decoder
+        errors = RowErrors()
+        guests = []
+        for first_row, rows in self._iter_row_chunks(decoder.last_column):
+            guests.extend(decoder.decode(rows, first_row, errors))
+        errors.log(self.logger)
+        self._store_guests(guests, schema)
+        return guests
+
+    def _store_guests(self, guests: List[GuestRecord], schema: SheetSchema) -> None:
+        """Make a successful full read the cached guest list (memory and file)."""
+        self.logger.info(f"Fetched {len(guests)} guests from spreadsheet")
+        # Save successful fetch to cache
+        self.save_guest_cache(guests)
+        self._cached_guests = guests  # Update in-memory cache
+        self._cached_schema_version = schema.version
+        self.guests_from_cache = False
+
+    def get_guests_for_view(self, stations: Optional[Sequence[str]] = None, wristbands: bool = False) -> List[GuestRecord]:
+        """
+        Refresh only the columns a view shows, reusing names and phones from the last full read.
+
+        One batchGet reads the ID column (to detect added, removed or moved
+        rows) plus the requested columns. Falls back to get_all_guests() when
+        there is no full read for the current schema yet or the rows changed.
+        Columns that are not requested keep their values from the last read.
+
+        Args:
+            stations: Station columns to refresh (None: every column, i.e. a full read)
+            wristbands: Also refresh the wristband column (E)
+            
+        Returns:
+            List of GuestRecord objects
+        """
+        if stations is None and not wristbands:
+            return self.get_all_guests()
+
+        try:
+            schema = self.get_schema()
+            if not self._cached_guests or self._cached_schema_version != schema.version:
+                return self.get_all_guests()
+
+            columns = self._view_columns(schema, stations, wristbands)
+            guests = self._apply_columns(schema, self._read_columns(columns), stations, wristbands)
+            if guests is None:
+                self.logger.info("Guest rows changed since the last full read - reading all columns")
+                return self.get_all_guests()
+            return guests
+
+        except Exception as e:
+            self.logger.error(f"Error refreshing guest columns: {e}")
+            self.guests_from_cache = True
+            if self._cached_guests:
+                self.logger.info(f"Using cached guest data ({len(self._cached_guests)} guests)")
+            return self._cached_guests
+
+    def get_guests_if_changed(self, stations: Optional[Sequence[str]] = None,
+                              wristbands: bool = False) -> Optional[List[GuestRecord]]:
+        """
+        Refresh a view only if the sheet changed since its last refresh.
+
+        One batchGet of the ID column and the view's columns (column E and
+        every station column for the full view) is fingerprinted: a row count
+        and checksum per column. If the fingerprint matches the last
+        successful refresh of the same view, nothing more is read. For
+        single-station and wristband views the probe is the refresh, so a
+        change costs no extra request. Name and phone edits are only seen by
+        full reads (get_all_guests).
+
+        Args:
+            stations: Station columns shown (None: every column)
+            wristbands: View shows the wristband column (E)
+
+        Returns:
+            Optional[List[GuestRecord]]: Fresh guests, or None if nothing changed
+        """
+        full_view = stations is None and not wristbands
+        try:
+            schema = self.get_schema()
+            if full_view:
+                columns = [ID_COLUMN, WRISTBAND_COLUMN] + list(schema.station_columns.values())
+            else:
+                columns = self._view_columns(schema, stations, wristbands)
+            values = self._read_columns(columns)
+        except Exception as e:
+            self.logger.debug(f"Change probe failed, refreshing: {e}")
+            return self.get_guests_for_view(stations, wristbands)
+
+        fingerprint = (schema.version, tuple(columns), fingerprint_columns(values[column] for column in columns))
+        if fingerprint == self._fingerprint and self._cached_guests:
+            self.logger.debug("Guest data unchanged since the last refresh - skipping")
+            return None
+
+        try:
+            guests = None
+            if not full_view and self._cached_guests and self._cached_schema_version == schema.version:
+                guests = self._apply_columns(schema, values, stations, wristbands)
+            if guests is None:
+                guests = self._read_all_guests(schema)
+        except Exception as e:
+            self.logger.error(f"Error refreshing guests: {e}")
+            self.guests_from_cache = True
+            return self._cached_guests
+        self._fingerprint = fingerprint
+        return guests
+
+    def _view_columns(self, schema: SheetSchema, stations: Optional[Sequence[str]], wristbands: bool) -> List[str]:
+        """ID column plus the columns a view shows (unknown stations are ignored)."""
+        columns = [ID_COLUMN] + ([WRISTBAND_COLUMN] if wristbands else [])
+        for station in stations or ():
+            column = schema.column_for(station)
+            if column and column not in columns:
+                columns.append(column)
+        return columns
+
+    def _read_columns(self, columns: List[str]) -> Dict[str, List[Any]]:
+        """Read whole data columns (from row 2) in one batchGet; trailing empty cells are omitted."""
+        result = self._make_api_call(
+            lambda: self._get_thread_safe_service().spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[f"{self.sheet_name}!{column}2:{column}" for column in columns],
+                majorDimension='COLUMNS'
+            ).execute()
+        )
+        values = {column: [] for column in columns}
+        for column, value_range in zip(columns, result.get('valueRanges', [])):
+            values[column] = value_range['values'][0] if value_range.get('values') else []
+        return values
+
+    def _apply_columns(self, schema: SheetSchema, values: Dict[str, List[Any]], stations: Optional[Sequence[str]],
+                       wristbands: bool) -> Optional[List[GuestRecord]]:
+        """
+        Copy the cached guests with refreshed column values.
+
+        Returns:
+            Optional[List[GuestRecord]]: Guests, or None if the ID column no longer matches the cache
+        """
+        base = self._cached_guests
+        if not self._rows_match(base, values.get(ID_COLUMN, [])):
+            return None
+
+        station_slots = [(station.lower(), schema.column_for(station)) for station in stations or ()]
+        guests = []
+        for guest in base:
+            index = guest.row_number - 2
+            guest = guest.copy()
+            if wristbands:
+                cells = values[WRISTBAND_COLUMN]
+                wristband = cells[index] if index < len(cells) else ''
+                guest.wristband_uuid = wristband if wristband.strip() else None
+            for station, column in station_slots:
+                if column:
+                    cells = values[column]
+                    guest.set_check_in(station, cells[index] if index < len(cells) and cells[index] else None)
+            guests.append(guest)
+
+        self.logger.debug(f"Refreshed {len(values) - 1} column(s) for {len(guests)} guests")
+        self.save_guest_cache(guests)
+        self._cached_guests = guests
+        self.guests_from_cache = False
+        return guests
+
+    @staticmethod
+    def _rows_match(guests: List[GuestRecord], ids: List[Any]) -> bool:
+        """Check that an ID column (from row 2) still holds exactly these guests at their rows."""
+        row_ids = [str(value).strip().lstrip('\ufeff') for value in ids]
+        if sum(1 for row_id in row_ids if row_id.isdigit()) != len(guests):
+            return False
+        for guest in guests:
+            index = guest.row_number - 2 if guest.row_number else -1
+            if not 0 <= index < len(row_ids) or not row_ids[index].isdigit() or int(row_ids[index]) != guest.original_id:
+                return False
+        return True
+
     def find_guest_by_id(self, original_id: int) -> Optional[GuestRecord]:
         """
         Find a specific guest by their original ID.
@@ -401,14 +702,10 @@ class GoogleSheetsService:
         """
         try:
             # Get dynamic station mapping first
-            station_columns = self.get_dynamic_stations()
-            
-            # Calculate the last column letter based on detected stations
-            max_col_index = max([ord(col) - ord('A') for col in station_columns.values()] + [7])  # At least H
-            last_col_letter = self._index_to_column_letter(max_col_index)
+            decoder = self.get_schema().decoder
             
             # Get full row data including check-ins
-            range_name = f"{self.sheet_name}!A:{last_col_letter}"
+            range_name = f"{self.sheet_name}!A:{decoder.last_column}"
             
             result = self._make_api_call(
                 lambda: self._get_thread_safe_service().spreadsheets().values().get(
@@ -419,32 +716,14 @@ class GoogleSheetsService:
             
             values = result.get('values', [])
             
-            # Create reverse mapping: column letter -> station name
-            col_to_station = {col: station for station, col in station_columns.items()}
-            
-            # Get list of station names for GuestRecord initialization
-            station_names = [station.title() for station in station_columns.keys()]
-            
             # Find the row with matching ID
             for i, row in enumerate(values[1:], start=2):  # Start from row 2 (skip header)
                 if len(row) > 0:
                     # Clean the ID field by removing BOM and other non-numeric characters
                     row_id_str = str(row[0]).strip().lstrip('\ufeff')
                     if row_id_str == str(original_id):
-                        if len(row) >= 3:
-                            # Get mobile number from column D (index 3) if available
-                            mobile_number = row[3] if len(row) > 3 else None
-                        
-                            # Initialize guest with dynamic stations and mobile number
-                            guest = GuestRecord(int(row_id_str), row[1], row[2], station_names, mobile_number)
-                            guest.row_number = i  # Store row number for updates
-                            
-                            # Dynamically load check-in data based on detected stations
-                            for col_letter, station_name in col_to_station.items():
-                                col_index = ord(col_letter) - ord('A')  # Convert A=0, B=1, etc.
-                                if len(row) > col_index and row[col_index]:
-                                    guest.check_ins[station_name] = row[col_index]
-                                
+                        guest = decoder.decode_row(row, i)
+                        if guest:
                             return guest
                         
             self.logger.warning(f"Guest with ID {original_id} not found")
@@ -472,12 +751,12 @@ class GoogleSheetsService:
             if not guest:
                 return False
                 
-            # Get dynamic station mapping
-            station_columns = self.get_dynamic_stations()
+            # Column comes from a schema read from the sheet (never the fallback layout)
+            schema = self.get_schema(for_write=True)
             
-            column = station_columns.get(station.lower())
+            column = schema.column_for(station)
             if not column:
-                self.logger.error(f"Unknown station: {station}. Available stations: {list(station_columns.keys())}")
+                self.logger.error(f"Unknown station: {station}. Available stations: {list(schema.station_columns.keys())}")
                 return False
                 
             # Update the specific cell
@@ -501,6 +780,7 @@ class GoogleSheetsService:
             
         except Exception as e:
             self.logger.error(f"Error marking attendance: {e}")
+            self._on_write_error()
             return False
 
     def write_wristband_uuid(self, original_id: int, uuid_value: str) -> bool:
@@ -522,7 +802,7 @@ class GoogleSheetsService:
                 return False
                 
             # Write to column E (wristband column)
-            range_name = f"{self.sheet_name}!E{guest.row_number}"
+            range_name = f"{self.sheet_name}!{WRISTBAND_COLUMN}{guest.row_number}"
             
             body = {
                 'values': [[uuid_value]]
@@ -537,13 +817,55 @@ class GoogleSheetsService:
                 ).execute()
             )
             
-            self.logger.info(f"Wrote wristband UUID {uuid_value} for guest {original_id} (Column E)")
+            self.logger.info(f"Wrote wristband UUID {uuid_value} for guest {original_id} (Column {WRISTBAND_COLUMN})")
             return True
             
         except Exception as e:
             self.logger.error(f"Error writing wristband UUID: {e}")
+            self._on_write_error()
             return False
     
+    def batch_write_wristband_uuids(self, uuids: Dict[int, str]) -> bool:
+        """
+        Write wristband UUIDs to column E for many guests in one request.
+
+        Args:
+            uuids: Original ID -> UUID
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            # One read of the ID column serves the whole batch
+            guest_rows = self._find_guest_rows()
+            data = []
+            for original_id, uuid_value in uuids.items():
+                row_number = guest_rows.get(int(original_id))
+                if not row_number:
+                    self.logger.warning(f"Guest with ID {original_id} not found")
+                    continue
+                data.append({
+                    'range': f"{self.sheet_name}!{WRISTBAND_COLUMN}{row_number}",
+                    'values': [[uuid_value]]
+                })
+            if not data:
+                return False
+
+            self._make_api_call(
+                lambda: self._get_thread_safe_service().spreadsheets().values().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'valueInputOption': 'RAW', 'data': data}
+                ).execute()
+            )
+
+            self.logger.info(f"Wrote {len(data)} wristband UUIDs (Column {WRISTBAND_COLUMN})")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error writing wristband UUIDs: {e}")
+            self._on_write_error()
+            return False
+
     def get_available_stations(self, fast_fail_startup=False) -> List[str]:
         """
         Get list of available station names for the GUI.
@@ -555,30 +877,17 @@ class GoogleSheetsService:
             List of station names in consistent title case formatting (never fails)
         """
         try:
-            # Use cached data if available to avoid repeated API calls
-            if self._cached_stations is not None:
-                return [station.title() for station in self._cached_stations.keys()]
-            
-            # Only make API call if not cached
-            station_columns = self.get_dynamic_stations(fast_fail_startup)
-            return [station.title() for station in station_columns.keys()]
+            # Cached schema avoids repeated API calls; only the header row is read when it is stale
+            return self.get_schema(fast_fail_startup).decoder.station_names
         except Exception as e:
             # Silent fallback - don't log repeated errors
             self.logger.debug(f"Using fallback stations due to: {e}")
             # Always return hardcoded stations as fallback
-            return ['Reception', 'Lio', 'Juntos', 'Experimental', 'Unvrs']
+            return list(FALLBACK_STATIONS)
             
     def get_station_column(self, station: str) -> str:
-        """Get the column letter for a given station."""
-        # Note: Station columns shifted right due to mobile number in column D
-        station_columns = {
-            'reception': 'E',
-            'lio': 'F',
-            'juntos': 'G',
-            'experimental': 'H',
-            'unvrs': 'I'
-        }
-        return station_columns.get(station.lower(), '')
+        """Get the column letter for a given station ('' if the sheet has no such station)."""
+        return self.get_schema().column_for(station) or ''
         
     def batch_update_attendance(self, updates: List[Dict[str, Any]]) -> bool:
         """
@@ -591,23 +900,11 @@ class GoogleSheetsService:
             bool: True if successful
         """
         try:
-            # Build batch update request
-            requests = []
-            
-            for update in updates:
-                guest = self.find_guest_by_id(update['original_id'])
-                if not guest:
-                    continue
-                    
-                column = self.get_station_column(update['station'])
-                if not column:
-                    continue
-                    
-                requests.append({
-                    'range': f"{self.sheet_name}!{column}{guest.row_number}",
-                    'values': [[update.get('timestamp', 'X')]]
-                })
-                
+            # One read of the ID column and the header mapping serves the whole batch
+            schema = self.get_schema(for_write=True)
+            guest_rows = self._find_guest_rows()
+
+            requests = self._attendance_requests(schema, guest_rows, updates)
             if not requests:
                 return False
                 
@@ -628,17 +925,69 @@ class GoogleSheetsService:
             
         except Exception as e:
             self.logger.error(f"Error in batch update: {e}")
+            self._on_write_error()
             return False
+
+    def _attendance_requests(self, schema: SheetSchema, guest_rows: Dict[int, int],
+                             updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build batchUpdate data entries for attendance updates (unknown guests and stations are skipped)."""
+        requests = []
+        
+        for update in updates:
+            row_number = guest_rows.get(int(update['original_id']))
+            if not row_number:
+                self.logger.warning(f"Guest with ID {update['original_id']} not found")
+                continue
+                
+            column = schema.column_for(update['station'])
+            if not column:
+                self.logger.error(f"Unknown station: {update['station']}")
+                continue
+                
+            requests.append({
+                'range': f"{self.sheet_name}!{column}{row_number}",
+                'values': [[update.get('timestamp', 'X')]]
+            })
+        return requests
+
+    def _find_guest_rows(self) -> Dict[int, int]:
+        """
+        Read the ID column once and map guest IDs to sheet row numbers.
+
+        Returns:
+            Dict[int, int]: Original ID -> row number
+        """
+        result = self._make_api_call(
+            lambda: self._get_thread_safe_service().spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{self.sheet_name}!A:A"
+            ).execute()
+        )
+        return self._parse_guest_rows(result.get('values', []))
+
+    @staticmethod
+    def _parse_guest_rows(values: List[List[Any]]) -> Dict[int, int]:
+        """Map guest IDs to row numbers from an A:A read (header included)."""
+        rows = {}
+        for i, row in enumerate(values[1:], start=2):  # Skip header
+            if row:
+                row_id_str = str(row[0]).strip().lstrip('\ufeff')
+                if row_id_str.isdigit():
+                    rows[int(row_id_str)] = i
+        return rows
             
     def clear_all_check_in_data(self) -> bool:
-        """Clear all check-in data from Google Sheets (columns E-I, preserving mobile numbers in D only)."""
+        """Clear all wristband and check-in data from Google Sheets (column E and every station column, preserving mobile numbers in D)."""
         try:
-            # Get all rows to determine range (extending to I due to column shift)
-            range_name = f"{self.sheet_name}!A:I"
+            # Re-read the header so the clear covers exactly the current station columns
+            self.clear_station_cache()
+            schema = self.get_schema(for_write=True)
+
+            # Get the ID column to determine the last row
             result = self._make_api_call(
                 lambda: self._get_thread_safe_service().spreadsheets().values().get(
                     spreadsheetId=self.spreadsheet_id,
-                    range=range_name
+                    range=f"{self.sheet_name}!{ID_COLUMN}:{ID_COLUMN}"
                 ).execute()
             )
             
@@ -647,26 +996,20 @@ class GoogleSheetsService:
                 self.logger.info("No check-in data to clear")
                 return True
                 
-            # Clear wristband and check-in columns (E-I) for all data rows, preserving mobile numbers in D only
-            clear_range = f"{self.sheet_name}!E2:I{len(values)}"
-            
-            # Create empty values for clearing (5 columns: E, F, G, H, I)
-            clear_values = [[""] * 5 for _ in range(len(values) - 1)]  # 5 columns (wristband + 4 check-in), all rows except header
-            
+            # Clear wristband and station columns for all data rows; other columns are left alone
             body = {
-                'values': clear_values
+                'ranges': schema.clear_ranges(self.sheet_name, len(values))
             }
             
             self._make_api_call(
-                lambda: self._get_thread_safe_service().spreadsheets().values().update(
+                lambda: self._get_thread_safe_service().spreadsheets().values().batchClear(
                     spreadsheetId=self.spreadsheet_id,
-                    range=clear_range,
-                    valueInputOption='RAW',
                     body=body
                 ).execute()
             )
             
-            self.logger.warning(f"Cleared all wristband and check-in data from Google Sheets ({len(clear_values)} rows)")
+            self.logger.warning(f"Cleared all wristband and check-in data from Google Sheets ({len(values) - 1} rows, "
+                                f"{len(schema.station_columns)} stations)")
             return True
             
         except Exception as e:
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tag registry replication between stations.
+Every bind/unbind is recorded as an entry in a change log, stamped with the
+writing station's version vector. Stations exchange entries through the LAN
+hub or a shared folder, and every station resolves concurrent rebinds of the
+same tag the same way.
+"""
+
+import json
+import logging
+import os
+import socket
+from datetime import datetime
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Change entry: {'replica', 'counter', 'clock', 'tag_uid', 'original_id' (None = unbound), 'time'}
+RegistryChange = Dict[str, Any]
+
+
+def change_order(change: RegistryChange) -> Tuple[int, str, int]:
+    """
+    Total order used to pick the winning change for a tag.
+
+    The clock sum grows along every causal chain, so a change made after
+    seeing another always wins over it; concurrent changes fall back to the
+    replica ID, which every station compares the same way.
+    """
+    return sum(change['clock'].values()), change['replica'], change['counter']
+
+
+def happened_before(a: Dict[str, int], b: Dict[str, int]) -> bool:
+    """True if version vector a is strictly dominated by b."""
+    return all(count <= b.get(replica, 0) for replica, count in a.items()) and a != b
+
+
+class RegistryReplica:
+    """One station's copy of the replicated tag registry.
+
+    Keeps the winning change per tag and the version vector of changes seen
+    per station, persisted as a JSON lines log. A change that loses to the
+    tag's current one can never win later, so only winning changes are kept
+    and the log is rewritten with one line per tag once superseded lines
+    pile up. merge() is idempotent and order-independent, so changes may
+    arrive late, twice or from several transports.
+    """
+
+    COMPACT_SLACK = 100  # Superseded log lines tolerated before rewriting the log
+
+    def __init__(self, logger: logging.Logger, replica_id: Optional[str] = None,
+                 log_file: str = "config/registry_changes.jsonl"):
+        """
+        Initialize replica and load its change log.
+
+        Args:
+            logger: Logger instance
+            replica_id: Unique station name (defaults to the host name)
+            log_file: JSON lines file holding the changes kept
+        """
+        self.logger = logger
+        self.replica_id = replica_id or socket.gethostname()
+        self.log_file = Path(log_file)
+        self.version: Dict[str, int] = {}  # replica -> highest counter seen
+        self._heads: Dict[str, RegistryChange] = {}  # tag UID -> winning change
+        self._log_lines = 0
+        self._lock = Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._heads)
+
+    def record(self, tag_uid: str, original_id: Optional[int]) -> RegistryChange:
+        """
+        Record a local bind (or unbind when original_id is None).
+
+        Returns:
+            RegistryChange: The new change, to be sent to the other stations
+        """
+        with self._lock:
+            counter = self.version.get(self.replica_id, 0) + 1
+            self.version[self.replica_id] = counter
+            change = {
+                'replica': self.replica_id,
+                'counter': counter,
+                'clock': dict(self.version),
+                'tag_uid': tag_uid,
+                'original_id': original_id,
+                'time': datetime.now().isoformat(timespec='milliseconds'),
+            }
+            self._apply(change)
+            self._append([change])
+        return change
+
+    def merge(self, changes: Iterable[RegistryChange]) -> Dict[str, Optional[int]]:
+        """
+        Merge changes from another station.
+
+        Args:
+            changes: Changes in any order (already-seen ones are ignored)
+
+        Returns:
+            Dict[str, Optional[int]]: Tags whose binding changed -> new guest ID (None = unbound)
+        """
+        updated = {}
+        new_changes = []
+        with self._lock:
+            for change in changes:
+                head = self._heads.get(change['tag_uid'])
+                if not self._apply(change):
+                    continue  # Already seen, or superseded by a change kept here
+                new_changes.append(change)
+                if head is None or head['original_id'] != change['original_id']:
+                    updated[change['tag_uid']] = change['original_id']
+                    if head and not happened_before(head['clock'], change['clock']):
+                        self.logger.warning(
+                            f"Concurrent rebinding of tag {change['tag_uid']}: {head['replica']} -> "
+                            f"{head['original_id']}, {change['replica']} -> {change['original_id']}; "
+                            f"keeping {change['original_id']}")
+            if new_changes:
+                self._append(new_changes)
+        return updated
+
+    def changes_since(self, version: Dict[str, int]) -> List[RegistryChange]:
+        """
+        Get the kept changes a peer with the given version vector has not seen.
+
+        Args:
+            version: The peer's version vector
+
+        Returns:
+            List[RegistryChange]: Missing changes, oldest first
+        """
+        with self._lock:
+            return sorted((c for c in self._heads.values() if c['counter'] > version.get(c['replica'], 0)),
+                          key=change_order)
+
+    def bindings(self) -> Dict[str, int]:
+        """Get the replicated registry (tag UID -> guest ID)."""
+        with self._lock:
+            return {tag: change['original_id'] for tag, change in self._heads.items()
+                    if change['original_id'] is not None}
+
+    def _apply(self, change: RegistryChange) -> bool:
+        """Add a change to the in-memory state; True if it became the tag's winning change."""
+        self.version[change['replica']] = max(self.version.get(change['replica'], 0), change['counter'])
+        head = self._heads.get(change['tag_uid'])
+        if head is None or change_order(change) > change_order(head):
+            self._heads[change['tag_uid']] = change
+            return True
+        return False
+
+    def _load(self) -> None:
+        if not self.log_file.exists():
+            return
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._log_lines += 1
+                        if 'version' in entry:
+                            # Written by _compact: counters of changes that were dropped
+                            for replica, counter in entry['version'].items():
+                                self.version[replica] = max(self.version.get(replica, 0), counter)
+                        else:
+                            self._apply(entry)
+            self.logger.info(f"Loaded {len(self._heads)} registry changes")
+            if self._log_lines > len(self._heads) + self.COMPACT_SLACK:
+                self._compact()
+        except Exception as e:
+            self.logger.error(f"Error loading registry change log: {e}")
+
+    def _append(self, changes: List[RegistryChange]) -> None:
+        """Append changes to the log, rewriting it when mostly superseded (caller holds the lock)."""
+        if self._log_lines + len(changes) > 2 * len(self._heads) + self.COMPACT_SLACK:
+            self._compact()
+            return
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                for change in changes:
+                    f.write(json.dumps(change, separators=(',', ':')) + '\n')
+            self._log_lines += len(changes)
+        except Exception as e:
+            self.logger.error(f"Error writing registry change log: {e}")
+
+    def _compact(self) -> None:
+        """Rewrite the log with the winning change per tag and the version vector."""
+        temp_file = Path(str(self.log_file) + ".tmp")
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'version': self.version}, separators=(',', ':')) + '\n')
+                for change in self._heads.values():
+                    f.write(json.dumps(change, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.log_file)
+            self._log_lines = len(self._heads) + 1
+            self.logger.debug(f"Compacted registry change log to {len(self._heads)} changes")
+        except Exception as e:
+            self.logger.error(f"Error compacting registry change log: {e}")
+
+
+class SharedFolderReplication:
+    """Exchanges registry changes through a shared folder (network share, synced drive).
+
+    Each station appends only to its own <replica_id>.jsonl, so no two
+    machines ever write the same file; the other files are polled and read
+    from the last offset, which keeps propagation well under a second.
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, replica: RegistryReplica, folder: str, logger: logging.Logger,
+                 on_update: Callable[[Dict[str, Optional[int]]], None], poll_interval: float = POLL_INTERVAL):
+        """
+        Initialize shared folder replication.
+
+        Args:
+            replica: Local replica
+            folder: Shared folder path
+            logger: Logger instance
+            on_update: Called with the tags changed by merged remote changes
+            poll_interval: Seconds between polls of the other stations' files
+        """
+        self.replica = replica
+        self.folder = Path(folder)
+        self.logger = logger
+        self.on_update = on_update
+        self.poll_interval = poll_interval
+        self._own_file = self.folder / f"{replica.replica_id}.jsonl"
+        self._offsets: Dict[str, int] = {}
+        self._partial: Dict[str, bytes] = {}
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Publish local changes the folder is missing and start polling."""
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            published = self._read_file(self._own_file, remember=False)
+            have = {change['counter'] for change in published}
+            missing = [c for c in self.replica.changes_since({})
+                       if c['replica'] == self.replica.replica_id and c['counter'] not in have]
+            for change in missing:
+                self.publish(change)
+        except Exception as e:
+            self.logger.error(f"Registry replication folder unavailable: {e}")
+        self._stop_event.clear()
+        self._thread = Thread(target=self._poll_loop, name="registry-replication", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+
+    def publish(self, change: RegistryChange) -> None:
+        """Append a local change to this station's file."""
+        try:
+            with open(self._own_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(change, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            self.logger.error(f"Error publishing registry change: {e}")
+
+    def poll(self) -> Dict[str, Optional[int]]:
+        """Read new changes from the other stations' files and merge them."""
+        changes = []
+        for path in self.folder.glob('*.jsonl'):
+            if path != self._own_file:
+                changes.extend(self._read_file(path))
+        updated = self.replica.merge(changes) if changes else {}
+        if updated:
+            self.on_update(updated)
+        return updated
+
+    def _read_file(self, path: Path, remember: bool = True) -> List[RegistryChange]:
+        """Read complete lines appended to a file since the last poll."""
+        name = path.name
+        offset = self._offsets.get(name, 0) if remember else 0
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return []
+        if size < offset:
+            offset = 0  # File replaced - read it again (merge ignores what was seen)
+            self._partial.pop(name, None)
+        if size == offset:
+            return []
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        lines = ((self._partial.pop(name, b'') if remember else b'') + data).split(b'\n')
+        if remember:
+            self._offsets[name] = offset + len(data)
+            self._partial[name] = lines[-1]
+        changes = []
+        for raw in lines[:-1]:
+            try:
+                if raw.strip():
+                    changes.append(json.loads(raw))
+            except ValueError:
+                self.logger.warning(f"Skipping malformed registry change in {name}")
+        return changes
+
+    def _poll_loop(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.debug(f"Registry replication poll failed: {e}")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Crash-safe persistence of the tag registry: an atomically replaced JSON
+snapshot plus an append-only journal of binds and unbinds since then.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..models import TagRegistry
+
+
+class RegistryStore:
+    """Snapshot + journal storage for tag UID -> guest ID bindings.
+
+    A bind or unbind appends one short line to the journal, so its cost does
+    not depend on the registry size. Every compact_every entries the whole
+    registry is written to a temporary file, fsynced and renamed over the
+    snapshot; the previous snapshot becomes the .backup file and the journal
+    written against it becomes .journal.prev, kept until the next
+    compaction. Each journal starts with the digest of the snapshot it
+    applies to, so load() replays the snapshot's own journal, or - when only
+    the backup is readable - the backup's journal followed by the current
+    one. A crash at any point therefore loses no binding, and neither does a
+    corrupt snapshot. A torn last journal line (power loss mid-append) is
+    ignored.
+    """
+
+    def __init__(self, logger: logging.Logger, registry_file: Path, compact_every: int = 1000,
+                 fsync: bool = True):
+        """
+        Initialize store.
+
+        Args:
+            logger: Logger instance
+            registry_file: Snapshot file (the journal and backup live next to it)
+            compact_every: Journal entries after which a new snapshot is written
+            fsync: Flush each journal entry to disk before returning
+        """
+        self.logger = logger
+        self.registry_file = Path(registry_file)
+        self.backup_file = Path(str(self.registry_file) + ".backup")
+        self.journal_file = Path(str(self.registry_file) + ".journal")
+        self.previous_journal_file = Path(str(self.registry_file) + ".journal.prev")
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.journal_entries = 0
+        self._lock = Lock()
+
+    def load(self) -> Dict[str, int]:
+        """
+        Load the registry: snapshot (or its backup if unreadable), then the journal(s) written against it.
+
+        Returns:
+            Dict[str, int]: Tag UID -> guest ID
+        """
+        bindings, digest = self._read_snapshot(self.registry_file)
+        journals = [self.journal_file]
+        if bindings is None:
+            bindings, digest = self._read_snapshot(self.backup_file)
+            journals = [self.previous_journal_file, self.journal_file]
+            if bindings is not None:
+                self.logger.info(f"Tag registry restored from backup - {len(bindings)} tags recovered")
+            else:
+                bindings = {}
+                if self.registry_file.exists() or self.backup_file.exists():
+                    self.logger.warning("No readable registry snapshot, starting with empty registry")
+                else:
+                    self.logger.info("No registry file found, starting with empty registry")
+
+        replayed = self._replay_journals(bindings, digest, journals)
+        if replayed:
+            self.logger.info(f"Replayed {replayed} tag registry change(s) from journal")
+        return bindings
+
+    def record(self, tag_uid: str, original_id: Optional[int], registry: Mapping[str, int]) -> None:
+        """
+        Persist one bind (or unbind when original_id is None).
+
+        Args:
+            tag_uid: Tag UID
+            original_id: Guest's original ID, None for an unbind
+            registry: Current registry (written as the new snapshot when the journal is compacted)
+        """
+        self.record_many([(tag_uid, original_id)], registry)
+
+    def record_many(self, changes: Iterable[Tuple[str, Optional[int]]], registry: Mapping[str, int]) -> None:
+        """
+        Persist several binds/unbinds with one journal write.
+
+        Args:
+            changes: (tag UID, guest ID or None) pairs in the order they happened
+            registry: Current registry (written as the new snapshot when the journal is compacted)
+        """
+        lines = ''.join(json.dumps({'tag': tag_uid, 'id': original_id}, separators=(',', ':')) + '\n'
+                        for tag_uid, original_id in changes)
+        if not lines:
+            return
+        with self._lock:
+            try:
+                self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                self.journal_entries += lines.count('\n')
+            except Exception as e:
+                self.logger.error(f"Error writing tag registry journal: {e}")
+                self.journal_entries = self.compact_every  # Fall back to a full snapshot
+        if self.journal_entries >= self.compact_every:
+            self.snapshot(registry)
+
+    def snapshot(self, registry: Mapping[str, int]) -> bool:
+        """
+        Write the whole registry atomically and start a new journal against it.
+
+        Args:
+            registry: Current registry
+
+        Returns:
+            bool: True if the snapshot was written
+        """
+        # Copy under the registry's lock: other threads may bind tags while this one compacts
+        bindings = registry.snapshot() if isinstance(registry, TagRegistry) else dict(registry)
+        data = json.dumps(bindings, indent=2).encode('utf-8')
+        with self._lock:
+            temp_file = Path(str(self.registry_file) + ".tmp")
+            try:
+                self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_file, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # The previous snapshot and its journal become the backup pair; until the new
+                # snapshot is in place the backup pair (or the old snapshot) still loads
+                if self.registry_file.exists():
+                    os.replace(self.registry_file, self.backup_file)
+                if self.journal_file.exists():
+                    os.replace(self.journal_file, self.previous_journal_file)
+                with open(self.journal_file, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps({'base': self._digest(data)}) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.registry_file)
+                self._sync_directory()
+                self.journal_entries = 0
+                self.logger.debug(f"Saved registry snapshot with {len(bindings)} tags")
+                return True
+            except Exception as e:
+                self.logger.error(f"Error saving tag registry: {e}")
+                return False
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.sha1(data).hexdigest()[:16]
+
+    def _read_snapshot(self, path: Path) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+        """Read a snapshot file and its digest; (None, None) if it is missing or unreadable."""
+        if not path.exists():
+            return None, None
+        try:
+            data = path.read_bytes()
+            bindings = {tag_uid: int(original_id) for tag_uid, original_id in json.loads(data).items()}
+            return bindings, self._digest(data)
+        except Exception as e:
+            self.logger.error(f"Error loading tag registry {path.name}: {e}")
+            return None, None
+
+    def _replay_journals(self, bindings: Dict[str, int], digest: Optional[str], journals: List[Path]) -> int:
+        """
+        Apply journal entries to bindings, skipping journals written against another snapshot.
+
+        A journal without a base line applies to any snapshot; once one journal
+        has been applied, the following (newer) one is applied too.
+
+        Returns:
+            int: Number of entries applied
+        """
+        applied = 0
+        chained = False
+        for path in journals:
+            base, entries = self._read_journal(path)
+            if path == self.journal_file:
+                self.journal_entries = len(entries)
+            if base is not None and base != digest and not chained:
+                if entries:
+                    self.logger.debug(f"Skipping {path.name} (written against another snapshot)")
+                continue
+            chained = True
+            for entry in entries:
+                if entry['id'] is None:
+                    bindings.pop(entry['tag'], None)
+                else:
+                    bindings[entry['tag']] = int(entry['id'])
+            applied += len(entries)
+        return applied
+
+    def _read_journal(self, path: Path) -> Tuple[Optional[str], List[Dict]]:
+        """Read a journal's base digest and entries (a torn last line is cut off)."""
+        if not path.exists():
+            return None, []
+        base = None
+        entries = []
+        try:
+            data = path.read_bytes()
+            complete = data.rfind(b'\n') + 1
+            if complete < len(data):
+                # Torn last write: cut it off so the next append starts on a fresh line
+                self.logger.warning("Ignoring incomplete tag registry journal entry")
+                with open(path, 'r+b') as f:
+                    f.truncate(complete)
+            for line in data[:complete].decode('utf-8').splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    self.logger.warning("Ignoring unreadable tag registry journal entry")
+                    continue
+                if 'base' in entry:
+                    base = entry['base']
+                else:
+                    entries.append(entry)
+        except Exception as e:
+            self.logger.error(f"Error reading tag registry journal {path.name}: {e}")
+        return base, entries
+
+    def _sync_directory(self) -> None:
+        """Make the renames durable (POSIX only; Windows has no directory handles)."""
+        if os.name != 'posix':
+            return
+        fd = os.open(str(self.registry_file.parent), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Guest row decoding for Google Sheets responses.
+A decoder is compiled once per header layout (station -> column), so
+decoding a row is a handful of list lookups, and rows are turned into
+GuestRecord objects lazily as they are consumed.
+"""
+
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..models import GuestRecord
+
+# Fixed columns: A = ID, B = first name, C = last name, D = mobile number, E = wristband UUID
+ID_COLUMN, FIRSTNAME_COLUMN, LASTNAME_COLUMN, MOBILE_COLUMN, WRISTBAND_COLUMN = range(5)
+MIN_LAST_COLUMN = 7  # Always read through column H
+
+
+def column_index(letters: str) -> int:
+    """
+    Convert a column letter to a 0-based index (A -> 0, Z -> 25, AA -> 26).
+
+    Args:
+        letters: Column letters (case-insensitive)
+
+    Returns:
+        int: 0-based column index
+    """
+    index = 0
+    for letter in letters.strip().upper():
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def column_letter(index: int) -> str:
+    """
+    Convert a 0-based column index to its letter (0 -> A, 25 -> Z, 26 -> AA).
+
+    Args:
+        index: 0-based column index
+
+    Returns:
+        str: Column letters
+    """
+    result = ""
+    while index >= 0:
+        result = chr(index % 26 + ord('A')) + result
+        index = index // 26 - 1
+    return result
+
+
+class RowErrors:
+    """Collects row parse errors so a refresh logs one summary instead of one line per row."""
+
+    MAX_EXAMPLES = 5
+
+    def __init__(self):
+        self.count = 0
+        self.examples: List[Tuple[int, str]] = []  # (sheet row number, message)
+
+    def add(self, row_number: int, message: str) -> None:
+        self.count += 1
+        if len(self.examples) < self.MAX_EXAMPLES:
+            self.examples.append((row_number, message))
+
+    def log(self, logger: logging.Logger, context: str = "guest rows") -> None:
+        """Log a single warning summarizing the errors (nothing if there were none)."""
+        if not self.count:
+            return
+        examples = "; ".join(f"row {row}: {message}" for row, message in self.examples)
+        more = f" (+{self.count - len(self.examples)} more)" if self.count > len(self.examples) else ""
+        logger.warning(f"Skipped {self.count} unreadable {context}: {examples}{more}")
+
+
+class RowDecoder:
+    """Turns sheet rows into GuestRecord objects for one header layout.
+
+    Use RowDecoder.for_stations() to get the compiled decoder for a station
+    mapping; decoders are cached per layout and hold no per-call state, so
+    one decoder can be shared by concurrent refreshes.
+    """
+
+    _compiled: Dict[Tuple[Tuple[str, str], ...], 'RowDecoder'] = {}
+
+    def __init__(self, station_columns: Dict[str, str]):
+        """
+        Compile a decoder.
+
+        Args:
+            station_columns: Station name (lowercase) -> column letter
+        """
+        self.station_slots: List[Tuple[int, str]] = [
+            (column_index(col), station) for station, col in station_columns.items()
+        ]
+        self.station_names = [station.title() for station in station_columns]
+        self.last_column = column_letter(max([index for index, _ in self.station_slots] + [MIN_LAST_COLUMN]))
+
+    @classmethod
+    def for_stations(cls, station_columns: Dict[str, str]) -> 'RowDecoder':
+        """
+        Get the compiled decoder for a station layout.
+
+        Args:
+            station_columns: Station name (lowercase) -> column letter
+
+        Returns:
+            RowDecoder: Cached decoder for this layout
+        """
+        layout = tuple(station_columns.items())
+        decoder = cls._compiled.get(layout)
+        if decoder is None:
+            decoder = cls._compiled[layout] = RowDecoder(station_columns)
+        return decoder
+
+    def decode_row(self, row: List, row_number: Optional[int] = None) -> Optional[GuestRecord]:
+        """
+        Decode one row.
+
+        Args:
+            row: Cell values as returned by the Sheets API (trailing empty cells omitted)
+            row_number: 1-based sheet row, stored on the record for updates
+
+        Returns:
+            Optional[GuestRecord]: The guest, or None for rows without ID and names
+
+        Raises:
+            ValueError: If the ID is not a number
+        """
+        width = len(row)
+        if width < 3:
+            return None
+        # Clean the ID field by removing BOM and other non-numeric characters
+        original_id = int(str(row[ID_COLUMN]).strip().lstrip('\ufeff'))
+        mobile_number = row[MOBILE_COLUMN] if width > MOBILE_COLUMN else None
+        wristband_uuid = row[WRISTBAND_COLUMN] if width > WRISTBAND_COLUMN and row[WRISTBAND_COLUMN].strip() else None
+
+        guest = GuestRecord(original_id, row[FIRSTNAME_COLUMN], row[LASTNAME_COLUMN], self.station_names,
+                            mobile_number, wristband_uuid)
+        guest.row_number = row_number
+        for index, station in self.station_slots:
+            if width > index and row[index]:
+                guest.set_check_in(station, row[index])
+        return guest
+
+    def decode(self, rows: Iterable[List], first_row: int = 2, errors: Optional[RowErrors] = None) -> Iterator[GuestRecord]:
+        """
+        Lazily decode rows.
+
+        Args:
+            rows: Rows in sheet order
+            first_row: 1-based sheet row of the first row
+            errors: Collects rows that could not be decoded (they are skipped)
+
+        Yields:
+            GuestRecord: One record per guest row
+        """
+        for row_number, row in enumerate(rows, start=first_row):
+            try:
+                guest = self.decode_row(row, row_number)
+            except (ValueError, IndexError, AttributeError) as e:
+                if errors is not None:
+                    errors.add(row_number, str(e))
+                continue
+            if guest is not None:
+                yield guest
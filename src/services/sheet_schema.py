@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Column schema of the guest sheet, derived from its header row.
+Every read, write and clear resolves columns through one schema object,
+so they can never disagree about where a station lives.
+"""
+
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .row_decoder import RowDecoder, column_index, column_letter
+
+# Fixed columns: A = ID, B = first name, C = last name, D = mobile number, E = wristband UUID
+ID_COLUMN = 'A'
+WRISTBAND_COLUMN = 'E'
+FIRST_STATION_INDEX = 5  # Station headers start at column F
+
+# Used only until the header row can be read; never used for writes
+FALLBACK_STATIONS = ('Reception', 'Lio', 'Juntos', 'Experimental', 'Unvrs')
+
+
+def is_station_header(header) -> bool:
+    """Check whether a header cell names a station (text only, no images or formulas)."""
+    if not header or not isinstance(header, str) or not header.strip():
+        return False
+    return header.strip().replace(' ', '').replace('_', '').replace('-', '').isalpha()
+
+
+def fingerprint_columns(columns: Iterable[Sequence]) -> Tuple[Tuple[int, int], ...]:
+    """
+    Cheap change fingerprint of sheet columns: (cell count, CRC32) per column.
+
+    Args:
+        columns: Column values (as read with majorDimension=COLUMNS)
+
+    Returns:
+        Tuple[Tuple[int, int], ...]: One (length, checksum) pair per column
+    """
+    return tuple((len(cells), zlib.crc32('\x1f'.join(str(cell) for cell in cells).encode('utf-8')))
+                 for cells in columns)
+
+
+class SheetSchema:
+    """Immutable column layout for one version of the header row.
+
+    A new schema (with a higher version) is only created when the header
+    row actually changes; revalidating an unchanged header just refreshes
+    the timestamp, so callers can keep using column mappings they derived.
+    """
+
+    def __init__(self, headers: Sequence, version: int, fallback: bool = False):
+        """
+        Build a schema from a header row.
+
+        Args:
+            headers: Header row values (row 1)
+            version: Version stamp (increases whenever the header row changes)
+            fallback: True if built from the default layout because the header row was unreadable
+        """
+        self.headers: Tuple = tuple(headers)
+        self.version = version
+        self.fallback = fallback
+        self.validated_at = time.monotonic()
+
+        station_columns = {}
+        for i, header in enumerate(self.headers[FIRST_STATION_INDEX:], start=FIRST_STATION_INDEX):
+            if is_station_header(header):
+                station_columns[header.strip().lower()] = column_letter(i)
+        self.station_columns: Dict[str, str] = station_columns  # station (lowercase) -> column letter
+        self.decoder = RowDecoder.for_stations(station_columns)
+
+    @classmethod
+    def fallback_schema(cls, version: int) -> 'SheetSchema':
+        """Schema for the default layout, used for reads while the header row is unavailable."""
+        headers = ['OriginalID', 'FirstName', 'LastName', 'MobileNumber', 'Wristband'] + list(FALLBACK_STATIONS)
+        return cls(headers, version, fallback=True)
+
+    @property
+    def last_column(self) -> str:
+        """Last column holding guest data."""
+        return self.decoder.last_column
+
+    def age(self) -> float:
+        """Seconds since the header row was last read."""
+        return time.monotonic() - self.validated_at
+
+    def matches(self, headers: Sequence) -> bool:
+        """Check whether a header row is the one this schema was built from."""
+        return tuple(headers) == self.headers
+
+    def column_for(self, station: str) -> Optional[str]:
+        """Get the column letter of a station, or None if the sheet has no such station."""
+        return self.station_columns.get(station.lower())
+
+    def clear_ranges(self, sheet_name: str, last_row: int) -> List[str]:
+        """
+        Ranges covering the wristband and station columns of every data row.
+
+        Adjacent columns are merged into one range; columns between stations
+        that are not stations themselves (notes, formulas) are left alone.
+
+        Args:
+            sheet_name: Sheet (tab) name
+            last_row: Last data row (1-based)
+
+        Returns:
+            List[str]: A1 ranges
+        """
+        indexes = sorted({column_index(WRISTBAND_COLUMN)} |
+                         {column_index(col) for col in self.station_columns.values()})
+        ranges = []
+        start = previous = indexes[0]
+        for index in indexes[1:] + [None]:
+            if index is not None and index == previous + 1:
+                previous = index
+                continue
+            ranges.append(f"{sheet_name}!{column_letter(start)}2:{column_letter(previous)}{last_row}")
+            if index is not None:
+                start = previous = index
+        return ranges
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Google Sheets credentials and API clients shared by every tab of a spreadsheet.
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+from googleapiclient.discovery import build
+
+
+class SheetsConnection:
+    """One credential and a pool of API clients, one client per thread.
+
+    httplib2 connections must not be used by two threads at once (that is
+    what causes WRONG_VERSION_NUMBER errors), so each thread gets its own
+    client, built on first use and reused by every tab afterwards.
+    """
+
+    def __init__(self, service_factory: Optional[Callable[[], Any]] = None):
+        """
+        Initialize connection.
+
+        Args:
+            service_factory: Builds an API client instead of build('sheets', 'v4', ...) (tests, emulator)
+        """
+        self.service_factory = service_factory
+        self.creds = None
+        self._service = None
+        self._local = threading.local()
+
+    @property
+    def service(self):
+        """Client built at authentication (also the authenticating thread's pooled client)."""
+        return self._service
+
+    @service.setter
+    def service(self, service) -> None:
+        self._service = service
+        self._local.client = service
+
+    def client(self):
+        """Get the calling thread's API client, building it on first use."""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self._build()
+        return client
+
+    def discard_client(self) -> None:
+        """Drop the calling thread's client (after a network error) so the next call reconnects."""
+        self._local.client = None
+
+    def _build(self):
+        if self.service_factory:
+            return self.service_factory()
+        try:
+            return build('sheets', 'v4', credentials=self.creds, cache_discovery=False)
+        except Exception:
+            # Fallback to shared service instance
+            return self.service
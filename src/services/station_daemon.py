@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless check-in station.
+Runs the scan -> registry -> local queue -> Sheets sync pipeline without the
+GUI, e.g. on a Raspberry Pi mounted at a door, with feedback hooks for a
+buzzer/LED and a small HTTP status endpoint.
+"""
+
+import json
+import logging
+import shlex
+import subprocess
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Optional
+
+from ..models import GuestRecord
+
+
+class StationFeedback:
+    """Feedback hooks called after every scan outcome.
+
+    The default implementation only beeps the reader on success; subclass it
+    (or use CommandFeedback) to drive a buzzer, LED or speaker.
+    """
+
+    def __init__(self, nfc_service=None):
+        """
+        Initialize feedback.
+
+        Args:
+            nfc_service: NFC service used for the reader beep (optional)
+        """
+        self.nfc_service = nfc_service
+
+    def success(self, result: Dict[str, Any]) -> None:
+        """Guest checked in."""
+        if self.nfc_service:
+            self.nfc_service.beep()
+
+    def duplicate(self, result: Dict[str, Any]) -> None:
+        """Guest was already checked in at this station."""
+
+    def unregistered(self, tag_uid: str) -> None:
+        """Tag is not bound to a guest."""
+
+    def error(self, message: str) -> None:
+        """Reader or lookup error."""
+
+
+class CommandFeedback(StationFeedback):
+    """Runs a configured command per outcome (e.g. aplay, gpioset).
+
+    Commands are started without waiting, so a slow sound player never delays
+    the next scan. Commands may use {name}, {station} and {uid} placeholders.
+    The command is split into arguments before substitution and run without
+    a shell, so a guest name from the sheet can never inject commands.
+    """
+
+    OUTCOMES = ('success', 'duplicate', 'unregistered', 'error')
+
+    def __init__(self, commands: Dict[str, str], logger: logging.Logger, nfc_service=None):
+        """
+        Initialize command feedback.
+
+        Args:
+            commands: Outcome name -> command line
+            logger: Logger instance
+            nfc_service: NFC service used for the reader beep when no success command is set
+        """
+        super().__init__(nfc_service)
+        self.commands = {outcome: commands[outcome] for outcome in self.OUTCOMES if commands.get(outcome)}
+        self.logger = logger
+
+    def success(self, result: Dict[str, Any]) -> None:
+        if 'success' in self.commands:
+            self._run('success', name=result.get('guest_name', ''), station=result.get('station', ''),
+                      uid=result.get('tag_uid', ''))
+        else:
+            super().success(result)
+
+    def duplicate(self, result: Dict[str, Any]) -> None:
+        self._run('duplicate', name=result.get('guest_name', ''), station=result.get('station', ''),
+                  uid=result.get('tag_uid', ''))
+
+    def unregistered(self, tag_uid: str) -> None:
+        self._run('unregistered', name='', station='', uid=tag_uid)
+
+    def error(self, message: str) -> None:
+        self._run('error', name='', station='', uid='')
+
+    def _run(self, outcome: str, **fields) -> None:
+        """Start the command for an outcome, if one is configured."""
+        command = self.commands.get(outcome)
+        if not command:
+            return
+        try:
+            argv = [arg.format(**fields) for arg in shlex.split(command)]
+            subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            self.logger.warning(f"Feedback command for '{outcome}' failed: {e}")
+
+
+class StationDaemon:
+    """Scan loop for an unattended check-in station.
+
+    Guests are looked up in an in-memory index (seeded from the guest cache and
+    refreshed in the background), so a scan never waits on Google Sheets.
+    Check-ins go to the tag manager's local queue, whose sync thread writes
+    them to Sheets when the connection allows.
+    """
+
+    READ_TIMEOUT = 5
+    GUEST_REFRESH_INTERVAL = 300
+    RECONNECT_DELAY = 5
+
+    def __init__(self, nfc_service, sheets_service, tag_manager, logger: logging.Logger, station: str,
+                 feedback: Optional[StationFeedback] = None, status_host: str = "127.0.0.1",
+                 status_port: Optional[int] = None, guest_refresh_interval: float = GUEST_REFRESH_INTERVAL):
+        """
+        Initialize station daemon.
+
+        Args:
+            nfc_service: NFC service instance
+            sheets_service: Google Sheets service instance
+            tag_manager: Tag manager instance (registry and check-in queue)
+            logger: Logger instance
+            station: Station name recorded for check-ins
+            feedback: Feedback hooks (defaults to a reader beep on success)
+            status_host: Address the status endpoint binds to
+            status_port: Port for the status endpoint, None to disable it
+            guest_refresh_interval: Seconds between background guest list refreshes
+        """
+        self.nfc_service = nfc_service
+        self.sheets_service = sheets_service
+        self.tag_manager = tag_manager
+        self.logger = logger
+        self.station = station
+        self.feedback = feedback or StationFeedback(nfc_service)
+        self.status_host = status_host
+        self.status_port = status_port
+        self.guest_refresh_interval = guest_refresh_interval
+
+        self._guests: Dict[int, GuestRecord] = {}
+        self._guests_loaded_at: Optional[float] = None
+        self._stats_lock = Lock()
+        self._stats = {'scans': 0, 'check_ins': 0, 'duplicates': 0, 'unregistered': 0, 'errors': 0}
+        self._last_scan: Optional[Dict[str, Any]] = None
+        self._started_at = time.time()
+        self._stop_event = Event()
+        self._refresh_thread = None
+        self._status_server = None
+
+    def run(self) -> None:
+        """Run the scan loop until stop() is called."""
+        self.logger.info(f"Headless station '{self.station}' started")
+        self._refresh_thread = Thread(target=self._refresh_loop, name="guest-refresh", daemon=True)
+        self._refresh_thread.start()
+        if self.status_port is not None:
+            self._start_status_server()
+
+        while not self._stop_event.is_set():
+            if not self.nfc_service.is_connected and not self._reconnect():
+                continue
+            try:
+                tag = self.nfc_service.read_tag(timeout=self.READ_TIMEOUT)
+            except Exception as e:
+                self._record_error(f"Tag read failed: {e}")
+                self._stop_event.wait(1)
+                continue
+            if tag:
+                self.process_tag(tag)
+
+        self._stop_status_server()
+        self.logger.info(f"Headless station '{self.station}' stopped")
+
+    def stop(self) -> None:
+        """Stop the scan loop (safe to call from a signal handler)."""
+        self._stop_event.set()
+        try:
+            self.nfc_service.cancel_read()
+        except Exception:
+            pass
+
+    def process_tag(self, tag) -> Optional[Dict[str, Any]]:
+        """
+        Check in the guest bound to a scanned tag.
+
+        Args:
+            tag: Scanned NFC tag
+
+        Returns:
+            Optional[Dict]: Scan result with 'status' ('checked_in', 'duplicate', 'unregistered', 'error')
+        """
+        with self._stats_lock:
+            self._stats['scans'] += 1
+
+        original_id = self.tag_manager.tag_registry.get(tag.uid)
+        if original_id is None:
+            self.logger.warning(f"Unregistered tag: {tag.uid}")
+            self._count('unregistered')
+            self.feedback.unregistered(tag.uid)
+            return self._finish_scan({'status': 'unregistered', 'tag_uid': tag.uid})
+
+        guest = self._find_guest(original_id)
+        if not guest:
+            self._record_error(f"Guest with ID {original_id} not found")
+            return self._finish_scan({'status': 'error', 'tag_uid': tag.uid, 'original_id': original_id})
+
+        result = {
+            'tag_uid': tag.uid,
+            'original_id': original_id,
+            'guest_name': guest.full_name,
+            'station': self.station,
+        }
+
+        station_key = self.station.lower()
+        if guest.is_checked_in_at(station_key) or self.tag_manager.check_in_queue.has_check_in(original_id, station_key):
+            self.logger.info(f"Guest {guest.full_name} already checked in at {self.station}")
+            self._count('duplicates')
+            self.feedback.duplicate(result)
+            return self._finish_scan(dict(result, status='duplicate'))
+
+        timestamp = time.strftime("%H:%M")
+        if not self.tag_manager.check_in_queue.add_check_in(original_id, self.station, timestamp, guest.full_name):
+            self._record_error(f"Failed to queue check-in for ID {original_id}")
+            return self._finish_scan(dict(result, status='error'))
+
+        # Mark the indexed record too: the queue forgets the check-in once it is synced,
+        # and the index is only rebuilt every guest_refresh_interval seconds
+        guest.set_check_in(station_key, timestamp)
+        self.logger.info(f"Checked in {guest.full_name} at {self.station}")
+        self._count('check_ins')
+        result.update(status='checked_in', timestamp=timestamp)
+        self.feedback.success(result)
+        return self._finish_scan(result)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get a status snapshot for the status endpoint.
+
+        Returns:
+            Dict: Station, counters, queue status, guest index size and uptime
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+            last_scan = dict(self._last_scan) if self._last_scan else None
+        return {
+            'station': self.station,
+            'reader_connected': bool(self.nfc_service.is_connected),
+            'uptime_seconds': int(time.time() - self._started_at),
+            'guests': len(self._guests),
+            'guests_age_seconds': int(time.time() - self._guests_loaded_at) if self._guests_loaded_at else None,
+            'registered_tags': len(self.tag_manager.tag_registry),
+            'queue': self.tag_manager.check_in_queue.get_queue_status(),
+            'stats': stats,
+            'last_scan': last_scan,
+        }
+
+    def _find_guest(self, original_id: int) -> Optional[GuestRecord]:
+        """Look up a guest in the index, falling back to a single-row fetch for unknown IDs."""
+        guest = self._guests.get(original_id)
+        if guest is None:
+            guest = self.sheets_service.find_guest_by_id(original_id)
+            if guest:
+                self._guests[original_id] = guest
+        return guest
+
+    def refresh_guests(self) -> None:
+        """Rebuild the guest index from Google Sheets (or the guest cache when offline)."""
+        guests = self.sheets_service.get_all_guests()
+        if guests:
+            self._guests = {guest.original_id: guest for guest in guests}
+            self._guests_loaded_at = time.time()
+            self.logger.info(f"Guest index loaded: {len(guests)} guests")
+
+    def _refresh_loop(self) -> None:
+        """Background guest index refresh."""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh_guests()
+            except Exception as e:
+                self.logger.warning(f"Guest refresh failed: {e}")
+            self._stop_event.wait(self.guest_refresh_interval)
+
+    def _reconnect(self) -> bool:
+        """Try to reconnect the reader; waits before returning on failure."""
+        try:
+            if self.nfc_service.connect():
+                self.logger.info("NFC reader connected")
+                return True
+        except Exception as e:
+            self.logger.debug(f"NFC reconnect failed: {e}")
+        self._stop_event.wait(self.RECONNECT_DELAY)
+        return False
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            self._stats[counter] += 1
+
+    def _record_error(self, message: str) -> None:
+        self.logger.error(message)
+        self._count('errors')
+        self.feedback.error(message)
+
+    def _finish_scan(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember the last scan for the status endpoint."""
+        with self._stats_lock:
+            self._last_scan = dict(result, time=time.strftime("%H:%M:%S"))
+        return result
+
+    def _start_status_server(self) -> None:
+        """Serve GET /status (JSON) and GET /health on a background thread."""
+        daemon = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path in ('/', '/status'):
+                    body = json.dumps(daemon.status()).encode('utf-8')
+                    content_type = 'application/json'
+                elif self.path == '/health':
+                    body = b'ok'
+                    content_type = 'text/plain'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                daemon.logger.debug(f"Status request: {format % args}")
+
+        try:
+            self._status_server = ThreadingHTTPServer((self.status_host, self.status_port), StatusHandler)
+        except OSError as e:
+            self.logger.error(f"Status endpoint unavailable on {self.status_host}:{self.status_port}: {e}")
+            return
+        self._status_server.daemon_threads = True
+        Thread(target=self._status_server.serve_forever, name="status-server", daemon=True).start()
+        self.logger.info(f"Status endpoint on http://{self.status_host}:{self.status_port}/status")
+
+    def _stop_status_server(self) -> None:
+        if self._status_server:
+            self._status_server.shutdown()
+            self._status_server.server_close()
+            self._status_server = None
@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LAN station hub.
+Stations publish check-in and tag events to a hub on the local network; the
+hub fans them out to every other station in real time and batches the
+Google Sheets writes on everyone's behalf. Works without internet access -
+writes are held until Google Sheets is reachable again.
+
+Protocol: one JSON object per line over TCP.
+    station -> hub: hello {station_id, since, token}, event {event}
+    event types: check_in, clear_check_ins, registry_change
+    hub -> station: welcome {seq, writes_sheets}, event {seq, event}, replayed {seq},
+                    ack {event_id, seq, duplicate}
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from threading import Event, Lock, RLock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .registry_replication import change_order
+
+EVENT_CHECK_IN = "check_in"
+EVENT_CLEAR_CHECK_INS = "clear_check_ins"
+EVENT_REGISTRY_CHANGE = "registry_change"
+
+DEFAULT_PORT = 8766
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class StationHub:
+    """Event relay and Google Sheets write batcher for a group of stations.
+
+    Every accepted event gets a hub sequence number and is appended to a JSON
+    lines log, so a station that reconnects (or the hub itself after a
+    restart) can replay what it missed. Check-ins are deduplicated per guest
+    and station: the first one wins and later ones are acknowledged as
+    duplicates without being broadcast. A clear_check_ins event (optional
+    original_id and station, both absent for the whole sheet) ends that, so
+    the guest can be checked in there again; cleared check-ins the hub has
+    not written yet are dropped.
+
+    Events that no longer matter (cleared check-ins, clears before a clear of
+    the whole sheet, registry changes that lost to a later one) are dropped
+    from the log once enough pile up. Sequence numbers are kept, so a replay
+    may skip numbers and ends with a replayed message.
+    """
+
+    FLUSH_INTERVAL = 2
+    MAX_RETRY_DELAY = 60
+    COMPACT_SLACK = 100  # Events appended between checks for obsolete ones
+
+    def __init__(self, logger: logging.Logger, host: str = "0.0.0.0", port: int = DEFAULT_PORT,
+                 sheets_service=None, event_log_file: str = "config/hub_events.jsonl",
+                 auth_token: Optional[str] = None, flush_interval: float = FLUSH_INTERVAL):
+        """
+        Initialize station hub.
+
+        Args:
+            logger: Logger instance
+            host: Address to listen on
+            port: TCP port to listen on (0 picks a free port)
+            sheets_service: Google Sheets service used for batched writes, None to relay only
+            event_log_file: JSON lines file holding the event history
+            auth_token: Shared secret stations must present, None to accept any station
+            flush_interval: Seconds between batched Google Sheets writes
+        """
+        self.logger = logger
+        self.host = host
+        self.port = port
+        self.sheets_service = sheets_service
+        self.event_log_file = Path(event_log_file)
+        self.state_file = self.event_log_file.with_suffix('.state.json')
+        self.auth_token = auth_token
+        self.flush_interval = flush_interval
+
+        self._lock = Lock()
+        self._events: List[Dict[str, Any]] = []  # Ordered by seq
+        self._seq = 0  # Highest sequence number given out
+        self._event_ids: Dict[str, int] = {}  # event_id -> seq
+        self._check_ins: Dict[Tuple[int, str], int] = {}  # (guest ID, station key) -> seq
+        self._registry_heads: Dict[str, Dict[str, Any]] = {}  # tag UID -> winning registry_change event
+        self._full_clear_seq = 0  # Last clear of the whole sheet
+        self._compact_at = self.COMPACT_SLACK  # Log length that triggers the next compaction check
+        self._synced_through = 0  # Highest check-in seq written to Google Sheets
+        self._clients: Dict[Any, str] = {}  # handler -> station ID
+        self._server = None
+        self._stop_event = Event()
+        self._writer_thread = None
+
+        self._load()
+
+    @property
+    def writes_sheets(self) -> bool:
+        """True if this hub writes check-ins to Google Sheets for the stations."""
+        return self.sheets_service is not None
+
+    def start(self) -> None:
+        """Start listening and (with a Sheets service) the batch writer."""
+        hub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def setup(self):
+                super().setup()
+                self.send_lock = RLock()
+
+            def handle(self):
+                hub._serve_client(self)
+
+            def send(self, message: Dict[str, Any]) -> None:
+                with self.send_lock:
+                    self.wfile.write(_encode(message))
+                    self.wfile.flush()
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        Thread(target=self._server.serve_forever, name="hub-server", daemon=True).start()
+
+        if self.writes_sheets:
+            self._stop_event.clear()
+            self._writer_thread = Thread(target=self._writer_loop, name="hub-writer", daemon=True)
+            self._writer_thread.start()
+        self.logger.info(f"Station hub listening on {self.host}:{self.port} "
+                         f"({'writing' if self.writes_sheets else 'not writing'} Google Sheets)")
+
+    def stop(self) -> None:
+        """Stop the server and writer (pending writes stay in the event log)."""
+        self._stop_event.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=5)
+
+    def wait(self) -> None:
+        """Block until stop() is called."""
+        self._stop_event.wait()
+
+    def status(self) -> Dict[str, Any]:
+        """Get hub counters (connected stations, event count, pending Sheets writes)."""
+        with self._lock:
+            return {
+                'stations': sorted(self._clients.values()),
+                'events': len(self._events),
+                'pending_writes': len(self._pending_check_ins()),
+                'writes_sheets': self.writes_sheets,
+            }
+
+    def publish(self, event: Dict[str, Any], origin=None) -> Tuple[int, bool]:
+        """
+        Accept an event and broadcast it to the other stations.
+
+        Args:
+            event: Event dict with 'type' and 'event_id'
+            origin: Handler of the publishing station (not sent its own event)
+
+        Returns:
+            Tuple[int, bool]: (sequence number, True if it was a duplicate)
+        """
+        with self._lock:
+            event_id = event.get('event_id') or uuid.uuid4().hex
+            if event_id in self._event_ids:
+                return self._event_ids[event_id], True
+
+            if event.get('type') == EVENT_CHECK_IN:
+                key = self._check_in_key(event)
+                if key in self._check_ins:
+                    self._event_ids[event_id] = self._check_ins[key]
+                    return self._check_ins[key], True
+
+            self._seq += 1
+            seq = self._seq
+            stored = dict(event, event_id=event_id, seq=seq)
+            self._add_event(stored)
+            self._append_to_log(stored)
+            if len(self._events) >= self._compact_at:
+                self._compact()
+            recipients = [client for client in self._clients if client is not origin]
+
+        for client in recipients:
+            self._send(client, {'type': 'event', 'seq': seq, 'event': stored})
+        return seq, False
+
+    def _add_event(self, event: Dict[str, Any]) -> None:
+        """Add an accepted event to the in-memory state (caller holds the lock)."""
+        self._events.append(event)
+        self._event_ids[event['event_id']] = event['seq']
+        kind = event.get('type')
+        if kind == EVENT_CHECK_IN:
+            self._check_ins.setdefault(self._check_in_key(event), event['seq'])
+        elif kind == EVENT_CLEAR_CHECK_INS:
+            self._drop_check_ins(event)
+            if event.get('original_id') is None and not event.get('station'):
+                self._full_clear_seq = event['seq']
+        elif kind == EVENT_REGISTRY_CHANGE and event.get('change'):
+            head = self._registry_heads.get(event['change']['tag_uid'])
+            if head is None or change_order(event['change']) > change_order(head['change']):
+                self._registry_heads[event['change']['tag_uid']] = event
+
+    def _is_live(self, event: Dict[str, Any]) -> bool:
+        """True if a replay still needs the event (caller holds the lock)."""
+        kind = event.get('type')
+        if kind == EVENT_CHECK_IN:
+            return self._check_ins.get(self._check_in_key(event)) == event['seq']
+        if kind == EVENT_CLEAR_CHECK_INS:
+            return event['seq'] >= self._full_clear_seq
+        if kind == EVENT_REGISTRY_CHANGE and event.get('change'):
+            return self._registry_heads.get(event['change']['tag_uid']) is event
+        return True
+
+    def _compact(self) -> None:
+        """Drop obsolete events and rewrite the log if there were any (caller holds the lock)."""
+        live = [event for event in self._events if self._is_live(event)]
+        if len(live) < len(self._events):
+            temp_file = Path(str(self.event_log_file) + ".tmp")
+            try:
+                self.event_log_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    for event in live:
+                        f.write(json.dumps(event, separators=(',', ':')) + '\n')
+                os.replace(temp_file, self.event_log_file)
+                self.logger.debug(f"Hub: compacted event log from {len(self._events)} to {len(live)} events")
+                self._events = live
+                self._save_state()
+            except Exception as e:
+                self.logger.error(f"Hub: error compacting event log: {e}")
+        self._compact_at = len(self._events) + self.COMPACT_SLACK
+
+    @staticmethod
+    def _check_in_key(event: Dict[str, Any]) -> Tuple[int, str]:
+        return int(event['original_id']), event['station'].lower()
+
+    def _drop_check_ins(self, event: Dict[str, Any]) -> None:
+        """Forget the first-wins check-ins a clear event covers (caller holds the lock)."""
+        original_id = event.get('original_id')
+        station = (event.get('station') or '').lower()
+        for key in [key for key in self._check_ins
+                    if (original_id is None or key[0] == int(original_id)) and (not station or key[1] == station)]:
+            del self._check_ins[key]
+
+    def _serve_client(self, handler) -> None:
+        """Read one station's messages until it disconnects."""
+        station_id = None
+        try:
+            for raw in handler.rfile:
+                try:
+                    message = json.loads(raw.decode('utf-8'))
+                except ValueError:
+                    self.logger.warning("Hub: ignoring malformed message")
+                    continue
+
+                if message.get('type') == 'hello':
+                    if self.auth_token and message.get('token') != self.auth_token:
+                        self.logger.warning(f"Hub: rejected station {message.get('station_id')} (bad token)")
+                        handler.send({'type': 'error', 'error': 'unauthorized'})
+                        return
+                    station_id = message.get('station_id') or handler.client_address[0]
+                    self._register_client(handler, station_id, int(message.get('since', 0)))
+                elif message.get('type') == 'event' and station_id:
+                    event = message.get('event', {})
+                    seq, duplicate = self.publish(event, origin=handler)
+                    handler.send({'type': 'ack', 'event_id': event.get('event_id'), 'seq': seq,
+                                  'duplicate': duplicate})
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Hub: connection to {station_id} closed: {e}")
+        finally:
+            with self._lock:
+                self._clients.pop(handler, None)
+            if station_id:
+                self.logger.info(f"Hub: station {station_id} disconnected")
+
+    def _register_client(self, handler, station_id: str, since: int) -> None:
+        """Welcome a station and replay the events it has not seen."""
+        with self._lock:
+            start = len(self._events)
+            while start and self._events[start - 1]['seq'] > since:
+                start -= 1
+            backlog = self._events[start:]
+            seq = self._seq
+            self._clients[handler] = station_id
+            # Live events wait for the replay, without holding up other stations
+            handler.send_lock.acquire()
+        try:
+            handler.send({'type': 'welcome', 'seq': seq, 'writes_sheets': self.writes_sheets})
+            for event in backlog:
+                handler.send({'type': 'event', 'seq': event['seq'], 'event': event})
+            handler.send({'type': 'replayed', 'seq': seq})
+        finally:
+            handler.send_lock.release()
+        self.logger.info(f"Hub: station {station_id} connected (replayed {len(backlog)} events)")
+
+    def _send(self, handler, message: Dict[str, Any]) -> None:
+        try:
+            handler.send(message)
+        except OSError as e:
+            self.logger.debug(f"Hub: dropping station {self._clients.get(handler)}: {e}")
+            with self._lock:
+                self._clients.pop(handler, None)
+
+    def _pending_check_ins(self) -> List[Dict[str, Any]]:
+        """Check-in events not yet written to Google Sheets and not cleared since (caller holds the lock)."""
+        return [event for event in self._events
+                if event['seq'] > self._synced_through and event.get('type') == EVENT_CHECK_IN and self._check_ins.get(self._check_in_key(event)) == event['seq']]
+
+    def _writer_loop(self) -> None:
+        """Write pending check-ins to Google Sheets in one batch per interval."""
+        delay = self.flush_interval
+        while not self._stop_event.wait(delay):
+            with self._lock:
+                pending = self._pending_check_ins()
+                through = self._seq
+            if not pending:
+                with self._lock:
+                    self._synced_through = through
+                delay = self.flush_interval
+                continue
+
+            updates = [{'original_id': e['original_id'], 'station': e['station'], 'timestamp': e['timestamp']}
+                       for e in pending]
+            try:
+                success = self.sheets_service.batch_update_attendance(updates)
+            except Exception as e:
+                self.logger.error(f"Hub: batch write failed: {e}")
+                success = False
+
+            if success:
+                with self._lock:
+                    self._synced_through = through
+                    self._save_state()
+                self.logger.info(f"Hub: wrote {len(updates)} check-ins to Google Sheets")
+                delay = self.flush_interval
+            else:
+                # Offline or rate limited - keep the batch and back off
+                delay = min(delay * 2, self.MAX_RETRY_DELAY)
+
+    def _load(self) -> None:
+        """Restore the event history and write position from disk."""
+        if self.event_log_file.exists():
+            try:
+                with open(self.event_log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        event = json.loads(line)
+                        self._add_event(event)
+                        self._seq = max(self._seq, event['seq'])
+                self.logger.info(f"Hub: loaded {len(self._events)} events")
+            except Exception as e:
+                self.logger.error(f"Hub: error loading event log: {e}")
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    state = json.load(f)
+                self._seq = max(self._seq, state.get('seq', 0))
+                self._synced_through = min(state.get('synced_through', 0), self._seq)
+            except Exception as e:
+                self.logger.warning(f"Hub: error loading state: {e}")
+        with self._lock:
+            self._compact()
+
+    def _append_to_log(self, event: Dict[str, Any]) -> None:
+        try:
+            self.event_log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.event_log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event, separators=(',', ':')) + '\n')
+        except Exception as e:
+            self.logger.error(f"Hub: error writing event log: {e}")
+
+    def _save_state(self) -> None:
+        try:
+            with open(self.state_file, 'w') as f:
+                json.dump({'synced_through': self._synced_through, 'seq': self._seq}, f)
+        except Exception as e:
+            self.logger.error(f"Hub: error saving state: {e}")
+
+
+class HubClient:
+    """Station-side connection to a StationHub.
+
+    Published events stay in an outbox until the hub acknowledges them and are
+    re-sent after a reconnect, so nothing is lost while the hub is down.
+    Incoming events are handed to on_event on the client's reader thread.
+    With a state file the replay position survives a restart, so the hub
+    only replays what the station has not handled yet.
+    """
+
+    RECONNECT_DELAY = 2
+    MAX_RECONNECT_DELAY = 30
+    CONNECT_TIMEOUT = 3
+
+    def __init__(self, logger: logging.Logger, host: str, port: int = DEFAULT_PORT,
+                 station_id: Optional[str] = None, auth_token: Optional[str] = None,
+                 state_file: Optional[str] = None):
+        """
+        Initialize hub client.
+
+        Args:
+            logger: Logger instance
+            host: Hub address
+            port: Hub TCP port
+            station_id: Name shown in hub logs (defaults to the host name)
+            auth_token: Shared secret configured on the hub
+            state_file: JSON file keeping the replay position across restarts (see set_state_file)
+        """
+        self.logger = logger
+        self.host = host
+        self.port = port
+        self.station_id = station_id or socket.gethostname()
+        self.auth_token = auth_token
+        self.on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.on_ack: Optional[Callable[[Dict[str, Any], bool], None]] = None
+        self.on_connect: Optional[Callable[[], None]] = None
+        self.hub_writes_sheets = False
+
+        self._outbox: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self._send_lock = Lock()
+        self._sock = None
+        self._last_seq = 0  # Every hub event up to here has been received
+        self._seen_ahead = set()  # Received seqs above _last_seq (events arrive from several hub threads)
+        self._connected = Event()
+        self._stop_event = Event()
+        self._thread = None
+        self.state_file = None
+        if state_file:
+            self.set_state_file(state_file)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def set_state_file(self, state_file) -> None:
+        """
+        Keep the replay position in a file and restore it (call before start()).
+
+        Args:
+            state_file: JSON file holding the last hub sequence number handled
+        """
+        self.state_file = Path(state_file)
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    self._last_seq = int(json.load(f).get('last_seq', 0))
+            except Exception as e:
+                self.logger.warning(f"Error loading hub client state: {e}")
+
+    def start(self) -> None:
+        """Start the connect/read thread."""
+        if not self._thread or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = Thread(target=self._run, name="hub-client", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Disconnect and stop the client thread."""
+        self._stop_event.set()
+        self._close()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.CONNECT_TIMEOUT + 1)
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the hub connection is up."""
+        return self._connected.wait(timeout)
+
+    def publish(self, event: Dict[str, Any]) -> str:
+        """
+        Send an event to the hub (queued in the outbox if the hub is unreachable).
+
+        Args:
+            event: Event dict with a 'type' field
+
+        Returns:
+            str: Event ID used for the hub acknowledgement
+        """
+        event = dict(event, origin=self.station_id)
+        event.setdefault('event_id', uuid.uuid4().hex)
+        with self._lock:
+            self._outbox[event['event_id']] = event
+        if self.connected:
+            self._send({'type': 'event', 'event': event})
+        return event['event_id']
+
+    def pending(self) -> int:
+        """Number of events not yet acknowledged by the hub."""
+        with self._lock:
+            return len(self._outbox)
+
+    def _run(self) -> None:
+        delay = self.RECONNECT_DELAY
+        while not self._stop_event.is_set():
+            try:
+                self._sock = socket.create_connection((self.host, self.port), timeout=self.CONNECT_TIMEOUT)
+                self._sock.settimeout(None)
+                self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._send({'type': 'hello', 'station_id': self.station_id, 'since': self._last_seq,
+                            'token': self.auth_token})
+                delay = self.RECONNECT_DELAY
+                self._read_loop(self._sock.makefile('rb'))
+            except OSError as e:
+                self.logger.debug(f"Hub connection failed: {e}")
+            finally:
+                if self._connected.is_set():
+                    self.logger.info("Disconnected from station hub")
+                self._connected.clear()
+                self._close()
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    def _read_loop(self, reader) -> None:
+        for raw in reader:
+            message = json.loads(raw.decode('utf-8'))
+            kind = message.get('type')
+            if kind == 'welcome':
+                self.hub_writes_sheets = bool(message.get('writes_sheets'))
+                if message.get('seq', 0) < self._last_seq:
+                    # The hub lost its history - start over with its numbering
+                    self.logger.warning("Station hub history was reset")
+                    self._last_seq = message.get('seq', 0)
+                    self._seen_ahead.clear()
+                    self._save_state()
+                self._connected.set()
+                self.logger.info(f"Connected to station hub {self.host}:{self.port}")
+                # Re-send everything the hub has not acknowledged yet
+                with self._lock:
+                    unacked = list(self._outbox.values())
+                for event in unacked:
+                    self._send({'type': 'event', 'event': event})
+                if self.on_connect:
+                    self._dispatch(self.on_connect)
+            elif kind == 'event':
+                event = message['event']
+                if event.get('origin') != self.station_id and self.on_event:
+                    self._dispatch(self.on_event, event)
+                self._mark_seen(message['seq'])  # Only once handled, the position may be saved
+            elif kind == 'replayed':
+                # Events dropped from the hub's log leave gaps up to here
+                self._seen_ahead = {seq for seq in self._seen_ahead if seq > message['seq']}
+                if message['seq'] > self._last_seq:
+                    self._last_seq = message['seq']
+                    self._save_state()
+                self._mark_seen(self._last_seq)
+            elif kind == 'ack':
+                with self._lock:
+                    event = self._outbox.pop(message.get('event_id'), None)
+                if not message.get('duplicate'):
+                    self._mark_seen(message.get('seq', 0))
+                if event and self.on_ack:
+                    self._dispatch(self.on_ack, event, bool(message.get('duplicate')))
+            elif kind == 'error':
+                self.logger.error(f"Station hub refused connection: {message.get('error')}")
+                self._stop_event.set()
+                return
+
+    def _mark_seen(self, seq: int) -> None:
+        """Advance the replay position past contiguously received events."""
+        if seq > self._last_seq:
+            self._seen_ahead.add(seq)
+        last_seq = self._last_seq
+        while self._last_seq + 1 in self._seen_ahead:
+            self._last_seq += 1
+            self._seen_ahead.discard(self._last_seq)
+        if self._last_seq != last_seq:
+            self._save_state()
+
+    def _save_state(self) -> None:
+        if not self.state_file:
+            return
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_file, 'w') as f:
+                json.dump({'last_seq': self._last_seq}, f)
+        except Exception as e:
+            self.logger.error(f"Error saving hub client state: {e}")
+
+    def _dispatch(self, callback: Callable, *args) -> None:
+        try:
+            callback(*args)
+        except Exception as e:
+            self.logger.error(f"Error handling hub message: {e}")
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        sock = self._sock
+        if not sock:
+            return
+        try:
+            with self._send_lock:
+                sock.sendall(_encode(message))
+        except OSError as e:
+            self.logger.debug(f"Hub send failed: {e}")
+
+    def _close(self) -> None:
+        sock, self._sock = self._sock, None
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
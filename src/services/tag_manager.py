@@ -5,21 +5,26 @@ Tag manager service for coordinating NFC and Google Sheets operations.
 """
 
 import logging
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Optional, List
 from datetime import datetime
-import json
+import time
 from pathlib import Path
 
-from ..models import NFCTag, GuestRecord
+from ..models import NFCTag, GuestRecord, TagRegistry
 from .nfc_service import NFCService
 from .google_sheets_service import GoogleSheetsService
 from .check_in_queue import CheckInQueue
+from .registry_replication import RegistryReplica, SharedFolderReplication
+from .registry_store import RegistryStore
 
 
 class TagManager:
     """Manages the relationship between NFC tags and guest records."""
 
-    def __init__(self, nfc_service: NFCService, sheets_service: GoogleSheetsService, logger: logging.Logger):
+    RECENT_BINDING_GRACE = 300  # Seconds a new binding is kept even if the sheet does not show it yet
+
+    def __init__(self, nfc_service: NFCService, sheets_service: GoogleSheetsService, logger: logging.Logger,
+                 replica_id: Optional[str] = None):
         """
         Initialize tag manager.
 
@@ -27,83 +32,239 @@ class TagManager:
             nfc_service: NFC service instance
             sheets_service: Google Sheets service instance
             logger: Logger instance
+            replica_id: Station name used in the replicated registry log (defaults to the host name)
         """
         self.nfc_service = nfc_service
         self.sheets_service = sheets_service
         self.logger = logger
 
-        # In-memory mapping of tag UIDs to original IDs
-        self.tag_registry: Dict[str, int] = {}
+        # In-memory mapping of tag UIDs to original IDs (indexed both ways)
+        self.tag_registry = TagRegistry()
         self.registry_file = Path("config/tag_registry.json")
+        self.registry_store = RegistryStore(logger, self.registry_file)
 
         # Initialize check-in queue for failsafe operation
         self.check_in_queue = CheckInQueue(logger)
         self.check_in_queue.set_sheets_service(sheets_service)
         self.check_in_queue.start_sync()
+        self._tab_queues: Dict[str, CheckInQueue] = {sheets_service.sheet_name: self.check_in_queue}
+        self._sync_completion_callback = None
+
+        # Optional LAN hub shared with other stations (see connect_hub)
+        self.hub_client = None
+        self._hub_queue = None  # Queue of the tab the hub was connected on (hub traffic stays there)
+        self.remote_update_callback = None
+        self._hub_registry_version: Dict[str, int] = {}  # Registry changes the hub is known to have
+
+        # Replicated change log of tag bindings (see bind_tag / enable_shared_folder_replication)
+        self.registry_replica = RegistryReplica(logger, replica_id)
+        self.folder_replication = None
+        self._recent_bindings: Dict[str, float] = {}  # tag UID -> time bound (kept through stale sheet syncs)
 
         # Load existing registry
         self.load_registry()
 
+        # First run with replication - record the existing bindings so other stations receive them
+        if not len(self.registry_replica):
+            for tag_uid, original_id in self.tag_registry.items():
+                self.registry_replica.record(tag_uid, original_id)
+
     def set_sync_completion_callback(self, callback) -> None:
         """Set callback to be called when sync completes."""
-        self.check_in_queue.set_sync_completion_callback(callback)
+        self._sync_completion_callback = callback
+        for queue in self._tab_queues.values():
+            queue.set_sync_completion_callback(callback)
+
+    def switch_sheet_tab(self, sheet_name: str) -> GoogleSheetsService:
+        """
+        Make another tab (event) of the spreadsheet the active one.
+
+        Every tab has its own check-in queue and queue file, and its sync
+        thread keeps running after a switch, so check-ins are always written
+        to the tab they were made on. The tag registry is shared: a wristband
+        belongs to a person, who keeps their guest ID across the event's tabs.
+        A LAN hub stays attached to the queue of the tab it was connected on.
+
+        Args:
+            sheet_name: Tab name
+
+        Returns:
+            GoogleSheetsService: The tab's service (also set as sheets_service)
+        """
+        sheets_service = self.sheets_service.tab(sheet_name)
+        queue = self._tab_queues.get(sheet_name)
+        if queue is None:
+            queue_file = GoogleSheetsService.tab_file(self._tab_queues_base_file(), sheet_name)
+            queue = CheckInQueue(self.logger, queue_file=str(queue_file))
+            queue.set_sheets_service(sheets_service)
+            if self._sync_completion_callback:
+                queue.set_sync_completion_callback(self._sync_completion_callback)
+            queue.start_sync()
+            self._tab_queues[sheet_name] = queue
+
+        self.sheets_service = sheets_service
+        self.check_in_queue = queue
+        self.logger.info(f"Active sheet tab: {sheet_name}")
+        return sheets_service
+
+    def _tab_queues_base_file(self):
+        """Queue file of the tab the tag manager was created with (other tabs' files are named after it)."""
+        return next(iter(self._tab_queues.values())).queue_file
+
+    def set_remote_update_callback(self, callback) -> None:
+        """Set callback to be called when another station's check-in or tag binding arrives."""
+        self.remote_update_callback = callback
+
+    def connect_hub(self, hub_client) -> None:
+        """
+        Share check-ins and tag bindings with other stations through a LAN hub.
+
+        Hub check-ins and acks go to the active tab's queue at the time of the
+        call, also after switch_sheet_tab(). Unless the client has its own state
+        file, its replay position is kept next to that queue's file.
+
+        Args:
+            hub_client: Started or unstarted HubClient
+        """
+        self.hub_client = hub_client
+        self._hub_queue = self.check_in_queue
+        if hub_client.state_file is None:
+            hub_client.set_state_file(self._hub_queue.queue_file.with_name(
+                self._hub_queue.queue_file.stem + "_hub_client.json"))
+        hub_client.on_event = self._on_hub_event
+        hub_client.on_ack = self._on_hub_ack
+        hub_client.on_connect = self._publish_registry_to_hub
+        self._hub_queue.set_hub_client(hub_client)
+        hub_client.start()
+
+    def enable_shared_folder_replication(self, folder: str) -> None:
+        """
+        Replicate tag bindings through a shared folder (network share or synced drive).
+
+        Args:
+            folder: Folder every station can read and write
+        """
+        self.folder_replication = SharedFolderReplication(
+            self.registry_replica, folder, self.logger, self._apply_registry_updates)
+        self.folder_replication.start()
+        self.logger.info(f"Tag registry replication via {folder}")
+
+    def bind_tag(self, tag_uid: str, original_id: int, save: bool = True) -> None:
+        """
+        Bind a tag to a guest, save the registry and replicate the binding.
+
+        Args:
+            tag_uid: Tag UID
+            original_id: Guest's original ID
+            save: Save the binding now (bulk registration saves once per batch instead)
+        """
+        self.tag_registry[tag_uid] = original_id
+        self._recent_bindings[tag_uid] = time.time()
+        if save:
+            self.registry_store.record(tag_uid, original_id, self.tag_registry)
+        self._publish_registry_change(self.registry_replica.record(tag_uid, original_id))
+
+    def unbind_tag(self, tag_uid: str) -> None:
+        """
+        Remove a tag binding, save the registry and replicate the removal.
+
+        Args:
+            tag_uid: Tag UID
+        """
+        self.tag_registry.pop(tag_uid, None)
+        self.registry_store.record(tag_uid, None, self.tag_registry)
+        self._publish_registry_change(self.registry_replica.record(tag_uid, None))
+
+    def _publish_registry_change(self, change: Dict) -> None:
+        """Send a local registry change to the hub and/or shared folder."""
+        if self.hub_client:
+            self.hub_client.publish(self._registry_event(change))
+        if self.folder_replication:
+            self.folder_replication.publish(change)
+
+    def _publish_registry_to_hub(self) -> None:
+        """Offer the hub the local registry changes it is not known to have after (re)connecting."""
+        for change in self.registry_replica.changes_since(self._hub_registry_version):
+            if change['replica'] == self.registry_replica.replica_id:
+                self.hub_client.publish(self._registry_event(change))
+
+    def _note_hub_registry_change(self, change: Dict) -> None:
+        """Remember that the hub has a registry change (acknowledged or relayed by it)."""
+        replica = change['replica']
+        self._hub_registry_version[replica] = max(self._hub_registry_version.get(replica, 0), change['counter'])
+
+    @staticmethod
+    def _registry_event(change: Dict) -> Dict:
+        # Deterministic event ID so the hub recognises a change it already has
+        return {'type': 'registry_change', 'event_id': f"reg:{change['replica']}:{change['counter']}",
+                'change': change}
+
+    def _apply_registry_updates(self, updated: Dict[str, Optional[int]]) -> None:
+        """Apply merged remote registry changes (tag UID -> guest ID, None = unbound)."""
+        if not updated:
+            return
+        now = time.time()
+        for tag_uid, original_id in updated.items():
+            if original_id is None:
+                self.tag_registry.pop(tag_uid, None)
+            else:
+                self.tag_registry[tag_uid] = int(original_id)
+                self._recent_bindings[tag_uid] = now
+            self.logger.info(f"Replicated tag {tag_uid} -> {original_id if original_id is not None else 'unbound'}")
+        self.save_bindings(updated)
+        if self.remote_update_callback:
+            self.remote_update_callback()
+
+    def _on_hub_event(self, event: Dict) -> None:
+        """Apply another station's event (runs on the hub client thread)."""
+        kind = event.get('type')
+        if kind == 'check_in':
+            changed = self._hub_queue.apply_remote_check_in(
+                int(event['original_id']), event['station'], event['timestamp'])
+            if changed:
+                self.logger.info(f"Hub: {event.get('guest_name')} checked in at {event['station']} "
+                                 f"({event.get('origin')})")
+                if self.remote_update_callback:
+                    self.remote_update_callback()
+        elif kind == 'clear_check_ins':
+            original_id = event.get('original_id')
+            changed = self._hub_queue.apply_remote_clear(
+                int(original_id) if original_id is not None else None, event.get('station'), event.get('time'))
+            if changed:
+                self.logger.info(f"Hub: check-ins cleared by {event.get('origin')}")
+                if self.remote_update_callback:
+                    self.remote_update_callback()
+        elif kind == 'registry_change':
+            self._note_hub_registry_change(event['change'])
+            self._apply_registry_updates(self.registry_replica.merge([event['change']]))
+
+    def _on_hub_ack(self, event: Dict, duplicate: bool) -> None:
+        if event.get('type') == 'check_in':
+            self._hub_queue.apply_hub_ack(event, duplicate)
+        elif event.get('type') == 'registry_change':
+            self._note_hub_registry_change(event['change'])
 
     def load_registry(self) -> None:
-        """Load tag registry from file with backup recovery."""
-        if self.registry_file.exists():
-            try:
-                with open(self.registry_file, 'r') as f:
-                    self.tag_registry = json.load(f)
-                self.logger.debug(f"Loaded {len(self.tag_registry)} tag mappings: {self.tag_registry}")
-                if len(self.tag_registry) > 0:
-                    self.logger.info(f"Loaded {len(self.tag_registry)} registered tags from registry")
-            except Exception as e:
-                self.logger.error(f"Error loading tag registry: {e}")
-                # Try to recover from backup
-                self._recover_from_backup()
-        else:
-            self.logger.info("No registry file found, starting with empty registry")
-
-    def _recover_from_backup(self) -> None:
-        """Attempt to recover tag registry from backup file."""
-        backup_file = Path(str(self.registry_file) + ".backup")
-        if backup_file.exists():
-            try:
-                with open(backup_file, 'r') as f:
-                    self.tag_registry = json.load(f)
-                self.logger.info(f"Tag registry restored from backup - {len(self.tag_registry)} tags recovered")
-                
-                # Save the recovered data as new main file
-                self.save_registry()
-                self.logger.info("Backup data saved as new registry file")
-            except Exception as backup_error:
-                self.logger.error(f"Backup recovery failed: {backup_error}")
-                self.logger.info("Starting with empty registry")
-                self.tag_registry = {}
-        else:
-            self.logger.warning("No backup file available, starting with empty registry")
-            self.tag_registry = {}
+        """Load tag registry from its snapshot and journal (with backup recovery)."""
+        self.tag_registry = TagRegistry(self.registry_store.load())
+        if len(self.tag_registry) > 0:
+            self.logger.info(f"Loaded {len(self.tag_registry)} registered tags from registry")
+        if self.registry_store.journal_entries:
+            self.save_registry()  # Start the session from a compact snapshot
+
+    def save_bindings(self, tag_uids: Iterable[str]) -> None:
+        """
+        Save the current binding of some tags (unbound tags are saved as removals).
+
+        Args:
+            tag_uids: Tags whose binding changed since they were last saved
+        """
+        self.registry_store.record_many(
+            [(tag_uid, self.tag_registry.get(tag_uid)) for tag_uid in tag_uids], self.tag_registry)
 
     def save_registry(self) -> None:
-        """Save tag registry to file with backup."""
-        try:
-            self.registry_file.parent.mkdir(exist_ok=True)
-            
-            # Create backup if main file exists and is not empty
-            backup_file = Path(str(self.registry_file) + ".backup")
-            if self.registry_file.exists() and self.registry_file.stat().st_size > 0:
-                try:
-                    backup_file.write_text(self.registry_file.read_text())
-                    self.logger.debug(f"Created backup: {backup_file}")
-                except Exception as backup_error:
-                    self.logger.warning(f"Failed to create backup: {backup_error}")
-            
-            # Save main file
-            with open(self.registry_file, 'w') as f:
-                json.dump(self.tag_registry, f, indent=2)
-            self.logger.debug(f"Saved registry with {len(self.tag_registry)} tags: {self.tag_registry}")
-        except Exception as e:
-            self.logger.error(f"Error saving tag registry: {e}")
+        """Save the whole tag registry as an atomic snapshot (also compacts the journal)."""
+        self.registry_store.snapshot(self.tag_registry)
 
     def rewrite_tag_to_guest(self, original_id: int) -> Optional[Dict[str, str]]:
         """
@@ -137,10 +298,8 @@ class TagManager:
 
         # Register the tag
         tag.register_to_guest(original_id, guest.full_name)
-        self.tag_registry[tag.uid] = original_id
-
-        # Save registry
-        self.save_registry()
+        # Save registry (and share the binding with other stations)
+        self.bind_tag(tag.uid, original_id)
 
         self.logger.info(f"Successfully rewritten tag {tag.uid} to {guest.full_name}")
 
@@ -199,13 +358,10 @@ class TagManager:
 
         # Register the tag
         tag.register_to_guest(original_id, guest.full_name)
-        self.tag_registry[tag.uid] = original_id
+        self.bind_tag(tag.uid, original_id)
 
         self.logger.info(f"Added tag {tag.uid} -> {original_id} to registry (register_tag_to_guest)")
 
-        # Save registry
-        self.save_registry()
-
         self.logger.info(f"Successfully registered tag {tag.uid} to {guest.full_name}")
 
         # Auto-check-in at Reception after successful registration
@@ -450,10 +606,8 @@ class TagManager:
 
         # Force register the tag (overwrite any existing registration)
         tag.register_to_guest(original_id, guest.full_name)
-        self.tag_registry[tag.uid] = original_id
-
-        # Save registry
-        self.save_registry()
+        # Save registry (and share the binding with other stations)
+        self.bind_tag(tag.uid, original_id)
 
         self.logger.info(f"Successfully rewritten tag {tag.uid} to {guest.full_name}")
 
@@ -491,12 +645,14 @@ class TagManager:
         else:
             self.logger.info(f"Registering new tag {tag.uid} to {guest.full_name}")
 
+        other_tags = self.tag_registry.tags_for(original_id) - {tag.uid}
+        if other_tags:
+            self.logger.info(f"{guest.full_name} also has tag(s) {', '.join(sorted(other_tags))}")
+
         # Force register the tag (overwrite any existing registration)
         tag.register_to_guest(original_id, guest.full_name)
-        self.tag_registry[tag.uid] = original_id
-
-        # Save registry
-        self.save_registry()
+        # Save registry (and share the binding with other stations)
+        self.bind_tag(tag.uid, original_id)
 
         self.logger.info(f"Successfully registered/rewritten tag {tag.uid} to {guest.full_name}")
 
@@ -527,8 +683,7 @@ class TagManager:
             guest = self.sheets_service.find_guest_by_id(original_id)
 
             # Clear the tag from registry
-            del self.tag_registry[tag_uid]
-            self.save_registry()
+            self.unbind_tag(tag_uid)
             self.logger.info(f"Cleared registration for tag {tag_uid}")
 
             # Return guest info
@@ -542,12 +697,17 @@ class TagManager:
             self.logger.warning(f"Tag {tag_uid} not found in registry for clearing")
             return None
 
+    def get_guest_tags(self, original_id: int) -> List[str]:
+        """Get the tag UIDs bound to a guest (from the registry's reverse index)."""
+        return sorted(self.tag_registry.tags_for(original_id))
+
     def get_registry_stats(self) -> Dict[str, int]:
-        """Get statistics about the tag registry."""
+        """Get statistics about the tag registry (maintained as bindings change, no registry scan)."""
         queue_status = self.check_in_queue.get_queue_status()
         return {
             'total_registered_tags': len(self.tag_registry),
-            'unique_guests': len(set(self.tag_registry.values())),
+            'unique_guests': self.tag_registry.guest_count,
+            'guests_with_multiple_tags': self.tag_registry.duplicate_guests,
             'pending_syncs': queue_status['pending'],
             'failed_syncs': queue_status['failed']
         }
@@ -582,6 +742,7 @@ class TagManager:
     def resolve_sync_conflicts(self, all_guests) -> None:
         """Resolve conflicts between local data and Google Sheets."""
         self.check_in_queue.resolve_sync_conflicts(all_guests)
+        self.check_in_queue.evict_remote_check_ins(all_guests)
 
     def clear_all_local_data(self) -> None:
         """Clear all local check-in data and tag registry."""
@@ -624,14 +785,28 @@ class TagManager:
         """Clear all check-in data from Google Sheets."""
         success = self.sheets_service.clear_all_check_in_data()
         if success:
-            # Also clear all tag registrations since wristband data was cleared
+            if self.hub_client and self.check_in_queue is self._hub_queue:
+                # Lets the hub accept check-ins for these guests again and tells the other stations
+                self.hub_client.publish({'type': 'clear_check_ins', 'time': datetime.now().isoformat()})
+            # Also clear all tag registrations since wristband data was cleared (at every station)
+            for tag_uid in self.tag_registry.snapshot():
+                self._publish_registry_change(self.registry_replica.record(tag_uid, None))
             self.tag_registry.clear()
             self.save_registry()
             self.logger.info("Cleared all tag registrations along with Google Sheets data")
         return success
 
     def sync_tag_registry_with_sheets(self, guests_data: List) -> None:
-        """Sync local tag registry with wristband data from Google Sheets."""
+        """
+        Sync local tag registry with wristband data from Google Sheets.
+
+        Orphans are only dropped here, never replicated: the sheet may lag
+        behind the registry. Skipped when the guest list is the cached one
+        (Google Sheets unreachable).
+        """
+        if getattr(self.sheets_service, 'guests_from_cache', False):
+            self.logger.debug("Tag registry sync skipped: guest data is cached")
+            return
         try:
             # Build a mapping of current wristband UUIDs to guest IDs from Google Sheets
             sheets_wristbands = {}
@@ -641,18 +816,22 @@ class TagManager:
             
             # Find tags in local registry that are no longer in Google Sheets
             tags_to_remove = []
-            for tag_uid, guest_id in self.tag_registry.items():
+            recent_cutoff = time.time() - self.RECENT_BINDING_GRACE
+            for tag_uid, guest_id in self.tag_registry.snapshot().items():
+                # Bindings made (here or at another station) shortly before may not be in the sheet yet
+                if self._recent_bindings.get(tag_uid, 0) > recent_cutoff:
+                    continue
                 # If this tag is not in the sheets data, or points to different guest, remove it
                 if tag_uid not in sheets_wristbands or sheets_wristbands[tag_uid] != guest_id:
                     tags_to_remove.append(tag_uid)
             
-            # Remove orphaned tags
+            # Remove orphaned tags (this station only)
             if tags_to_remove:
                 for tag_uid in tags_to_remove:
                     old_guest_id = self.tag_registry.pop(tag_uid, None)
                     self.logger.info(f"Removed orphaned tag {tag_uid} (was registered to guest {old_guest_id})")
                 
-                self.save_registry()
+                self.save_bindings(tags_to_remove)
                 self.logger.info(f"Synced tag registry: removed {len(tags_to_remove)} orphaned tag(s)")
             else:
                 self.logger.debug("Tag registry sync: no orphaned tags found")
@@ -662,5 +841,10 @@ class TagManager:
 
     def shutdown(self) -> None:
         """Clean shutdown of tag manager."""
-        self.check_in_queue.stop_sync()
+        if self.hub_client:
+            self.hub_client.stop()
+        if self.folder_replication:
+            self.folder_replication.stop()
+        for queue in self._tab_queues.values():
+            queue.stop_sync()
         self.save_registry()
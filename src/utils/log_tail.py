@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Incremental log file reader for the realtime log viewer.
+'''
+
+import heapq
+import os
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+# (sequence number, level or None, line)
+LogEntry = Tuple[int, Optional[str], str]
+
+
+def parse_level(line: str) -> Optional[str]:
+    """
+    Get the level of a log line written by the app's formatters.
+
+    Args:
+        line: Log line (plain "asctime - name - LEVEL - message" or JSON lines)
+
+    Returns:
+        Optional[str]: Level name, or None for continuation lines (e.g. tracebacks)
+    """
+    for level in LOG_LEVELS:
+        if f' - {level} - ' in line or f'"level": "{level}"' in line:
+            return level
+    return None
+
+
+class LogTail:
+    """Follows a log file, reading only bytes appended since the last poll.
+
+    The reader remembers its file offset, notices rotation (new inode) and
+    truncation (file shorter than the offset) and then starts over on the
+    new file. On rotation the rest of the old file (now e.g. TP_NFC.log.1)
+    is read first, so lines written just before the rollover are not lost.
+    The most recent lines are kept in memory together with a per-level
+    index, so filtering by level never re-reads or re-scans the file.
+    """
+
+    INITIAL_TAIL_BYTES = 256 * 1024  # Only the end of an existing log is loaded on open
+
+    def __init__(self, path, max_lines: int = 200):
+        """
+        Initialize log tail.
+
+        Args:
+            path: Log file path
+            max_lines: Number of recent lines kept (overall and per level)
+        """
+        self.path = Path(path)
+        self.max_lines = max_lines
+        self.entries: Deque[LogEntry] = deque(maxlen=max_lines)
+        self.by_level: Dict[Optional[str], Deque[LogEntry]] = {}
+        self._offset = 0
+        self._inode = None
+        self._partial = b''
+        self._seq = 0
+        self._last_level: Optional[str] = None
+
+    def read_new(self) -> List[LogEntry]:
+        """
+        Read lines appended since the last call.
+
+        Returns:
+            List[LogEntry]: New complete lines, oldest first
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        data = b''
+        if self._inode is None:
+            # First open - skip to the tail of a large existing log
+            self._offset = max(0, stat.st_size - self.INITIAL_TAIL_BYTES)
+            self._inode = stat.st_ino
+            skip_first = self._offset > 0
+        elif stat.st_ino != self._inode:
+            # Rotated - drain the old file, then start over on the new one
+            data = self._drain_rotated()
+            if data and not data.endswith(b'\n'):
+                data += b'\n'  # The old file's last line is complete; don't join it to the new file
+            self._offset = 0
+            self._inode = stat.st_ino
+            skip_first = False
+        elif stat.st_size < self._offset:
+            # Truncated - start over
+            self._offset = 0
+            self._partial = b''
+            skip_first = False
+        else:
+            skip_first = False
+
+        if stat.st_size == self._offset and not data:
+            return []
+
+        appended = self._read_from(self.path, self._offset)
+        self._offset += len(appended)
+        data = self._partial + data + appended
+        lines = data.split(b'\n')
+        self._partial = lines.pop()  # Incomplete last line (empty if data ended with a newline)
+        if skip_first and lines:
+            lines.pop(0)  # Started mid-line
+
+        new_entries = []
+        for raw in lines:
+            line = raw.decode('utf-8', errors='replace').rstrip('\r')
+            if not line.strip():
+                continue
+            # Continuation lines (tracebacks) inherit the level of the line they belong to
+            level = parse_level(line) or self._last_level
+            self._last_level = level
+            self._seq += 1
+            entry = (self._seq, level, line)
+            self.entries.append(entry)
+            self.by_level.setdefault(level, deque(maxlen=self.max_lines)).append(entry)
+            new_entries.append(entry)
+        return new_entries
+
+    def _drain_rotated(self) -> bytes:
+        """Read what was appended to the old file (found by inode among the rotated logs) after the offset."""
+        for candidate in sorted(self.path.parent.glob(self.path.name + '.*')):
+            try:
+                if os.stat(candidate).st_ino == self._inode:
+                    return self._read_from(candidate, self._offset)
+            except OSError:
+                continue
+        return b''
+
+    @staticmethod
+    def _read_from(path: Path, offset: int) -> bytes:
+        """Read a file from an offset to its end."""
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                return f.read()
+        except OSError:
+            return b''
+
+    def lines(self, levels: Optional[Iterable[str]] = None) -> List[LogEntry]:
+        """
+        Get the most recent kept lines, optionally only for some levels.
+
+        Args:
+            levels: Levels to include, or None for all lines
+
+        Returns:
+            List[LogEntry]: Up to max_lines entries, oldest first
+        """
+        if levels is None:
+            return list(self.entries)
+        merged = heapq.merge(*(self.by_level.get(level, ()) for level in levels))
+        return list(deque(merged, maxlen=self.max_lines))
@@ -4,54 +4,152 @@
 Logging utility module.
 '''
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+from datetime import datetime
 from pathlib import Path
 
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
 
-def setup_logger(name, log_level="INFO", log_file=None):
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line for machine-readable log feeds."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'source': f"{record.filename}:{record.lineno}",
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the original record fields for the downstream formatters.
+
+    The stock QueueHandler.prepare() bakes the formatted text into record.msg;
+    here only the message arguments are merged (so records stay picklable and
+    cheap) and exception info is pre-rendered, leaving file/line/level intact
+    for both the text and JSON formatters.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_size(value):
+    """
+    Parse a size such as 10485760, "10MB" or "512KB" into bytes.
+
+    Args:
+        value: Size as int or string with optional KB/MB/GB suffix
+
+    Returns:
+        int: Size in bytes
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().upper()
+    for suffix, factor in (('GB', 1024 ** 3), ('MB', 1024 ** 2), ('KB', 1024), ('B', 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+def setup_logger(name, log_level="INFO", log_file=None, max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT, log_format="text"):
     """
     Set up and configure logger.
-    
+
+    Records are handed to a QueueHandler, so the calling thread (e.g. the NFC
+    scan loop) never waits on disk or console I/O; a QueueListener thread
+    writes them to the console and a size-rotated log file.
+
     Args:
         name (str): Logger name
         log_level (str): Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file (str, optional): Path to log file
-        
+        max_bytes (int or str, optional): Rotate the log file at this size (e.g. "10MB"); 0 disables rotation
+        backup_count (int, optional): Number of rotated files to keep
+        log_format (str, optional): "text" or "json" (JSON lines) for the log file
+
     Returns:
         logging.Logger: Configured logger instance
     """
     # Create logger
     logger = logging.getLogger(name)
-    
+
     # Set level
     level = getattr(logging, log_level.upper())
     logger.setLevel(level)
-    
+
+    # Already configured - stop the previous listener before replacing its handlers
+    previous_listener = getattr(logger, 'queue_listener', None)
+    if previous_listener:
+        previous_listener.stop()
+        atexit.unregister(previous_listener.stop)
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                logger.removeHandler(handler)
+
     # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-    )
+    if log_format == "json":
+        file_formatter = JsonLinesFormatter()
+    else:
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+        )
     console_formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     )
-    
+
     # Create console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
+    handlers = [console_handler]
+
     # Create file handler if log file specified
     if log_file:
         # Ensure log directory exists
         log_dir = os.path.dirname(log_file)
         if log_dir:
             Path(log_dir).mkdir(parents=True, exist_ok=True)
-            
-        file_handler = logging.FileHandler(log_file)
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=parse_size(max_bytes),
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
         file_handler.setLevel(level)
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-    
+        handlers.append(file_handler)
+
+    # Route records through a queue; the listener thread does the actual I/O
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_RecordQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    logger.queue_listener = listener
+    atexit.register(listener.stop)
+
     return logger
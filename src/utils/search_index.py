@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Prebuilt search index for the guest list.
+'''
+
+import unicodedata
+from typing import Dict, List, Sequence, Set
+
+# Letters that don't decompose into base letter + combining mark under NFKD
+_EXTRA_FOLDS = str.maketrans({
+    'ø': 'o', 'æ': 'ae', 'œ': 'oe', 'đ': 'd', 'ł': 'l', 'ı': 'i', 'þ': 'th', 'ð': 'd',
+})
+
+
+def normalize_text(text) -> str:
+    """
+    Normalize text for accent- and case-insensitive matching ("Öberg" -> "oberg").
+
+    Args:
+        text: Text to normalize (non-strings are converted with str())
+
+    Returns:
+        str: Normalized text
+    """
+    decomposed = unicodedata.normalize('NFKD', str(text).casefold())
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.translate(_EXTRA_FOLDS)
+
+
+class GuestSearchIndex:
+    """Trigram index over guest ID, first name, last name and full name.
+
+    The index is built once per guest list and answers multi-word queries:
+    every word must appear somewhere in the guest's text (order independent),
+    the same semantics as the original per-keystroke substring scan.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.source = None  # Guest list the index was built from
+        self._guests: List = []
+        self._texts: List[str] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+
+    def build(self, guests: Sequence) -> None:
+        """
+        Rebuild the index from a guest list.
+
+        Args:
+            guests: Guest records (GuestRecord-like objects)
+        """
+        self.source = guests
+        self._guests = list(guests)
+        self._texts = []
+        self._trigrams = {}
+        for position, guest in enumerate(self._guests):
+            text = normalize_text(f"{guest.original_id} {guest.firstname} {guest.lastname} {guest.full_name}")
+            self._texts.append(text)
+            for word in set(text.split()):
+                for i in range(len(word) - 2):
+                    self._trigrams.setdefault(word[i:i + 3], set()).add(position)
+
+    def is_current(self, guests: Sequence) -> bool:
+        """Check whether the index was built from this guest list."""
+        return self.source is guests and len(self._guests) == len(guests)
+
+    def search(self, query: str) -> List:
+        """
+        Find guests matching every word of the query.
+
+        Args:
+            query: Search text as typed by the user
+
+        Returns:
+            List: Matching guests in their original order
+        """
+        words = normalize_text(query).split()
+        if not words:
+            return list(self._guests)
+
+        # Narrow candidates with the trigrams of longer words, then verify substrings
+        candidates = None
+        for word in words:
+            for i in range(len(word) - 2):
+                positions = self._trigrams.get(word[i:i + 3])
+                if not positions:
+                    return []
+                candidates = set(positions) if candidates is None else candidates & positions
+                if not candidates:
+                    return []
+
+        positions = sorted(candidates) if candidates is not None else range(len(self._texts))
+        return [
+            self._guests[position] for position in positions
+            if all(word in self._texts[position] for word in words)
+        ]
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Lane-based background task scheduler.
+'''
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class CancellationToken:
+    """Cooperative cancellation flag handed to (and checked by) a task."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancellation was requested."""
+        return self._event.is_set()
+
+
+class TaskHandle:
+    """A submitted task: its lane, supersede key and cancellation token."""
+
+    def __init__(self, lane: str, func: Callable, args: Tuple, key: Optional[str],
+                 with_token: bool, on_cancel: Optional[Callable[[], None]]):
+        self.lane = lane
+        self.func = func
+        self.args = args
+        self.key = key
+        self.with_token = with_token
+        self.on_cancel = on_cancel
+        self.token = CancellationToken()
+        self.started = False
+        self.done = threading.Event()
+
+    def cancel(self) -> None:
+        """Cancel the task; a queued task is skipped, a running one sees its token set."""
+        self.token.cancel()
+
+    @property
+    def name(self) -> str:
+        return getattr(self.func, '__name__', repr(self.func))
+
+
+class _Lane:
+    """Bounded FIFO served by a fixed set of worker threads."""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pending: Deque[TaskHandle] = deque()
+        self.running: Dict[int, TaskHandle] = {}  # thread ident -> task
+        self.condition = threading.Condition()
+        self.threads = []
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'rejected': 0, 'superseded': 0}
+
+
+class TaskScheduler:
+    """Runs background work on named lanes with bounded queues.
+
+    Each lane has its own workers, so a slow Google Sheets refresh can never
+    occupy the threads an NFC scan needs. Tasks carry a cancellation token;
+    submitting with supersede=True drops queued tasks with the same key and
+    cancels a running one, so repeated refresh requests collapse into one.
+    """
+
+    LANE_NFC = "nfc"
+    LANE_CHECKIN = "checkin"  # Operator check-ins and table edits (never queued behind bulk sync work)
+    LANE_SYNC = "sync"
+    LANE_REFRESH = "refresh"
+    LANE_UI_PROBE = "ui_probe"
+
+    # lane -> (workers, max queued tasks)
+    DEFAULT_LANES = {
+        LANE_NFC: (2, 4),
+        LANE_CHECKIN: (1, 16),
+        LANE_SYNC: (1, 32),
+        LANE_REFRESH: (1, 2),
+        LANE_UI_PROBE: (1, 8),
+    }
+
+    def __init__(self, logger: logging.Logger, lanes: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Initialize scheduler and start lane workers.
+
+        Args:
+            logger: Logger instance
+            lanes: Lane name -> (worker count, max queued tasks); defaults to DEFAULT_LANES
+        """
+        self.logger = logger
+        self._shutdown = threading.Event()
+        self._lanes: Dict[str, _Lane] = {}
+        for name, (workers, max_queue) in (lanes or self.DEFAULT_LANES).items():
+            lane = _Lane(name, workers, max_queue)
+            for index in range(workers):
+                thread = threading.Thread(target=self._worker, args=(lane,), name=f"{name}-{index}", daemon=True)
+                lane.threads.append(thread)
+                thread.start()
+            self._lanes[name] = lane
+
+    def submit(self, lane: str, func: Callable, *args, key: Optional[str] = None, supersede: bool = False,
+               with_token: bool = False, on_cancel: Optional[Callable[[], None]] = None) -> Optional[TaskHandle]:
+        """
+        Queue a task on a lane.
+
+        Args:
+            lane: Lane name (LANE_NFC, LANE_CHECKIN, LANE_SYNC, LANE_REFRESH, LANE_UI_PROBE)
+            func: Callable to run
+            *args: Positional arguments for func
+            key: Identifies repeatable work (e.g. "refresh") for supersede
+            supersede: Replace queued/running tasks with the same key
+            with_token: Pass the task's CancellationToken to func as token=...
+            on_cancel: Called if the task is rejected, superseded or cancelled before it runs
+                       (e.g. to release a lock taken by the caller)
+
+        Returns:
+            Optional[TaskHandle]: Handle, or None if the scheduler is shut down or the lane queue is full
+        """
+        task_lane = self._lanes[lane]
+        task = TaskHandle(lane, func, args, key, with_token, on_cancel)
+        dropped = []
+
+        with task_lane.condition:
+            if supersede and key is not None:
+                for queued in [t for t in task_lane.pending if t.key == key]:
+                    task_lane.pending.remove(queued)
+                    queued.cancel()
+                    task_lane.stats['superseded'] += 1
+                    dropped.append(queued)
+                for running in task_lane.running.values():
+                    if running.key == key:
+                        running.cancel()
+
+            accepted = not self._shutdown.is_set() and len(task_lane.pending) < task_lane.max_queue
+            if accepted:
+                task_lane.pending.append(task)
+                task_lane.stats['submitted'] += 1
+                task_lane.condition.notify()
+            else:
+                task_lane.stats['rejected'] += 1
+                dropped.append(task)
+
+        if not accepted and not self._shutdown.is_set():
+            self.logger.warning(f"Task queue '{lane}' full - dropped {task.name}")
+        for dropped_task in dropped:
+            self._notify_cancelled(dropped_task)
+        return task if accepted else None
+
+    def cancel(self, lane: str, key: str) -> int:
+        """
+        Cancel all queued and running tasks with a key on a lane.
+
+        Returns:
+            int: Number of tasks cancelled
+        """
+        task_lane = self._lanes[lane]
+        count = 0
+        with task_lane.condition:
+            for task in list(task_lane.pending) + list(task_lane.running.values()):
+                if task.key == key and not task.token.cancelled:
+                    task.cancel()
+                    count += 1
+        return count
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get queue depth and counters per lane.
+
+        Returns:
+            Dict: lane -> {'queued', 'running', 'workers', 'max_queue', 'submitted', 'completed', ...}
+        """
+        result = {}
+        for name, lane in self._lanes.items():
+            with lane.condition:
+                result[name] = dict(
+                    lane.stats,
+                    queued=len(lane.pending),
+                    running=len(lane.running),
+                    workers=lane.workers,
+                    max_queue=lane.max_queue,
+                )
+        return result
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting tasks, cancel queued ones and stop the workers.
+
+        Args:
+            wait: Wait for running tasks to finish
+            timeout: Maximum seconds to wait for all workers together
+        """
+        self._shutdown.set()
+        dropped = []
+        for lane in self._lanes.values():
+            with lane.condition:
+                while lane.pending:
+                    task = lane.pending.popleft()
+                    task.cancel()
+                    lane.stats['cancelled'] += 1
+                    dropped.append(task)
+                for task in lane.running.values():
+                    task.cancel()
+                lane.condition.notify_all()
+        for task in dropped:
+            self._notify_cancelled(task)
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for lane in self._lanes.values():
+                for thread in lane.threads:
+                    thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _worker(self, lane: _Lane) -> None:
+        """Worker loop: run queued tasks of one lane until shutdown."""
+        ident = threading.get_ident()
+        while True:
+            with lane.condition:
+                while not lane.pending and not self._shutdown.is_set():
+                    lane.condition.wait()
+                if self._shutdown.is_set():
+                    return
+                task = lane.pending.popleft()
+                skip = task.token.cancelled
+                if skip:
+                    lane.stats['cancelled'] += 1
+                else:
+                    task.started = True
+                    lane.running[ident] = task
+
+            if skip:
+                self._notify_cancelled(task)
+                continue
+
+            outcome = 'failed'
+            try:
+                if task.with_token:
+                    task.func(*task.args, token=task.token)
+                else:
+                    task.func(*task.args)
+                outcome = 'completed'
+            except Exception as e:
+                self.logger.error(f"Background task {task.name} on lane '{lane.name}' failed: {e}")
+            finally:
+                task.done.set()
+                with lane.condition:
+                    lane.running.pop(ident, None)
+                    lane.stats[outcome] += 1
+
+    def _notify_cancelled(self, task: TaskHandle) -> None:
+        """Run a task's on_cancel callback and mark it done."""
+        task.done.set()
+        if task.on_cancel:
+            try:
+                task.on_cancel()
+            except Exception as e:
+                self.logger.debug(f"on_cancel for {task.name} failed: {e}")
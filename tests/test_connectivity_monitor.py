@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the background ConnectivityMonitor.
+'''
+import os
+import sys
+import socket
+import logging
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.connectivity_monitor import ConnectivityMonitor, ConnectivityState
+
+
+class _ProbeHandler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.send_response(404)  # Any HTTP response means reachable
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/"
+
+
+class TestConnectivityMonitor(unittest.TestCase):
+    """Test cases for ConnectivityMonitor."""
+
+    def setUp(self):
+        self.logger = logging.getLogger("test_connectivity_monitor")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.server = HTTPServer(("127.0.0.1", 0), _ProbeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_probes(self):
+        """Test internet reachability and the Google Sheets status mapping."""
+        def rate_limited():
+            raise Exception("HttpError 429: Quota exceeded")
+
+        monitor = ConnectivityMonitor(self.logger, sheets_probe=lambda: ["Reception"], probe_url=self.url)
+        try:
+            self.assertTrue(monitor.probe_internet())
+            self.assertEqual(monitor.probe_sheets(), ConnectivityMonitor.SHEETS_CONNECTED)
+            monitor.sheets_probe = lambda: []
+            self.assertEqual(monitor.probe_sheets(), ConnectivityMonitor.SHEETS_EMPTY)
+            monitor.sheets_probe = rate_limited
+            self.assertEqual(monitor.probe_sheets(), ConnectivityMonitor.SHEETS_RATE_LIMITED)
+            monitor.probe_url = closed_port_url()
+            self.assertFalse(monitor.probe_internet())
+        finally:
+            monitor.stop()
+
+    def test_publishes_state_changes_only(self):
+        """Test that the loop publishes the first state and later changes, woken by check_now()."""
+        monitor = ConnectivityMonitor(self.logger, sheets_probe=lambda: ["Reception"], probe_url=self.url,
+                                      interval=60)
+        monitor.start()
+        try:
+            self.assertEqual(monitor.updates.get(timeout=3),
+                             ConnectivityState(True, ConnectivityMonitor.SHEETS_CONNECTED))
+            monitor.check_now()  # Same state: nothing published
+            monitor.probe_url = closed_port_url()
+            monitor.check_now()
+            self.assertEqual(monitor.updates.get(timeout=3),
+                             ConnectivityState(False, ConnectivityMonitor.SHEETS_NO_INTERNET))
+            self.assertTrue(monitor.updates.empty())
+        finally:
+            monitor.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
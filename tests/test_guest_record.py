@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the compact GuestRecord representation.
+'''
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import GuestRecord
+
+
+class TestGuestRecord(unittest.TestCase):
+    """Test cases for GuestRecord."""
+
+    def test_compact_storage(self):
+        """Test that guests have no instance dict and share station keys."""
+        a = GuestRecord(1, "Ana", "Silva", ["Reception", "Lio"])
+        b = GuestRecord(2, "Ben", "Ortiz", ["Reception", "Lio"])
+        self.assertFalse(hasattr(a, '__dict__'))
+        self.assertIs(a.get_all_stations()[0], b.get_all_stations()[0])
+        self.assertEqual(a.full_name, "Ana Silva")
+
+    def test_check_ins_mapping(self):
+        """Test that check_ins still behaves like a dict."""
+        guest = GuestRecord(1, "Ana", "Silva", ["Reception", "Lio"])
+        self.assertEqual(guest.check_ins, {'reception': None, 'lio': None})
+
+        guest.check_ins['lio'] = "10:00"
+        self.assertTrue(guest.is_checked_in_at("Lio"))
+        self.assertEqual(guest.get_check_in_time("lio"), "10:00")
+
+        guest.check_ins['unvrs'] = None
+        self.assertIn('unvrs', guest.check_ins)
+        self.assertEqual(guest.get_all_stations(), ['reception', 'lio', 'unvrs'])
+
+        copy = guest.check_ins.copy()
+        copy['reception'] = "09:00"
+        self.assertFalse(guest.is_checked_in_at("reception"))
+
+        guest.check_ins = {'reception': "09:00", 'lio': " "}
+        self.assertTrue(guest.is_checked_in_at("reception"))
+        self.assertFalse(guest.is_checked_in_at("lio"))
+        self.assertFalse(guest.is_checked_in_at("unvrs"))
+
+    def test_check_in_at_station(self):
+        """Test recording a check-in and unknown stations."""
+        guest = GuestRecord(1, "Ana", "Silva")
+        self.assertTrue(guest.check_in_at_station("Reception"))
+        self.assertFalse(guest.check_in_at_station("reception"))
+        with self.assertRaises(ValueError):
+            guest.check_in_at_station("nowhere")
+        self.assertIn('reception', guest.to_dict()['check_ins'])
+
+
+if __name__ == "__main__":
+    unittest.main()
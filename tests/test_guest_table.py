@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the columnar GuestTable.
+'''
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import GuestRecord, GuestTable
+
+
+class TestGuestTable(unittest.TestCase):
+    """Test cases for GuestTable."""
+
+    def setUp(self):
+        stations = ["Reception", "Lio"]
+        self.guests = []
+        for guest_id in range(1, 7):
+            guest = GuestRecord(guest_id, f"First{guest_id}", f"Last{guest_id}", stations)
+            if guest_id % 2 == 0:
+                guest.set_check_in("reception", "09:00")
+            if guest_id in (2, 3):
+                guest.set_check_in("lio", "10:00")
+            self.guests.append(guest)
+        self.table = GuestTable(self.guests, stations, {4: {'lio': "10:30"}, 99: {'lio': "11:00"}})
+
+    def test_counts_merge_sheet_and_local(self):
+        """Test counts over Google Sheets and local check-ins."""
+        self.assertEqual(len(self.table), 6)
+        self.assertEqual(self.table.checked_count("Reception"), 3)
+        self.assertEqual(self.table.checked_count("lio"), 3)  # 2, 3 on the sheet, 4 locally
+        self.assertEqual(self.table.unchecked_ids("lio"), [1, 5, 6])
+
+    def test_completion(self):
+        """Test completion filters across stations."""
+        self.assertEqual(self.table.complete_ids(["reception", "lio"]), [2, 4])
+        self.assertTrue(self.table.is_complete(4, ["reception", "lio"]))
+        self.assertFalse(self.table.is_complete(99, ["lio"]))
+
+    def test_set_checked(self):
+        """Test single check-ins and clears."""
+        self.assertTrue(self.table.set_checked(6, "lio"))
+        self.assertFalse(self.table.set_checked(6, "lio"))
+        self.assertEqual(self.table.complete_ids(["reception", "lio"]), [2, 4, 6])
+
+        # A clear removes the check-in from both sources
+        self.assertTrue(self.table.set_checked(2, "lio", False))
+        self.assertEqual(self.table.checked_count("lio"), 3)
+        self.assertFalse(self.table.set_checked(99, "lio"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the virtualized GuestTableModel behind the guest list Treeview.
+'''
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from src.gui.guest_table import GuestTableModel
+except ImportError:  # src.gui imports the app, which needs customtkinter
+    GuestTableModel = None
+
+
+class FakeTree:
+    """Records what a ttk.Treeview would display, without a Tk root."""
+
+    def __init__(self):
+        self.items = {}  # item ID -> {'values', 'tags'}
+        self.order = []
+        self._next = 0
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def insert(self, parent, index, values=(), tags=()):
+        self._next += 1
+        item = f"I{self._next}"
+        self.items[item] = {'values': tuple(values), 'tags': tuple(tags)}
+        self.order.append(item)
+        return item
+
+    def item(self, item, **changes):
+        self.items[item].update({key: tuple(value) for key, value in changes.items()})
+
+    def delete(self, *items):
+        for item in items:
+            del self.items[item]
+            self.order.remove(item)
+
+    def shown(self):
+        return [(self.items[item]['values'][2], self.items[item]['tags']) for item in self.order]
+
+
+def row(guest_id, lastname, tags=()):
+    return guest_id, (guest_id, "First", lastname), tags
+
+
+@unittest.skipIf(GuestTableModel is None, "GUI dependencies not installed")
+class TestGuestTableModel(unittest.TestCase):
+    """Test cases for GuestTableModel."""
+
+    def setUp(self):
+        self.tree = FakeTree()
+        self.model = GuestTableModel(self.tree)
+
+    def test_stripes_follow_display_order(self):
+        """Test that alternate row colors follow the sorted rows, not the input order."""
+        self.model.sync([row(1, "Öst"), row(2, "Berg"), row(3, "Adams"), row(4, "Cole", ["complete"])])
+        self.assertEqual(self.tree.shown(), [
+            ("Adams", ("even",)), ("Berg", ("odd",)), ("Cole", ("complete",)), ("Öst", ("odd",))])
+
+        self.model.sync([row(1, "Öst"), row(3, "Adams"), row(4, "Cole", ["complete"])])  # Berg removed
+        self.assertEqual(self.tree.shown(), [("Adams", ("even",)), ("Cole", ("complete",)), ("Öst", ("even",))])
+
+    def test_window_and_updates_keep_stripes(self):
+        """Test stripes after scrolling, hover and in-place updates, with only changed rows rewritten."""
+        self.model._visible_rows = 2
+        self.model.BUFFER_ROWS = 0
+        self.model.sync([row(i, f"Name{i:02d}", ["even"] if i % 2 else ["odd"]) for i in range(10)])
+        self.assertEqual(self.tree.shown(), [("Name00", ("even",)), ("Name01", ("odd",))])
+
+        self.model.scroll(3)
+        self.assertEqual(self.tree.shown(), [("Name03", ("odd",)), ("Name04", ("even",))])
+        item = self.tree.order[0]
+        self.model.set_hover(item)
+        self.assertEqual(self.tree.items[item]['tags'], ("odd", GuestTableModel.HOVER_TAG))
+        self.model.set_hover(None)
+
+        self.model.set_row(item, tags=["complete"])
+        self.assertEqual(self.tree.shown(), [("Name03", ("complete",)), ("Name04", ("even",))])
+        self.model.set_row(item, tags=[])
+        self.assertEqual(self.tree.shown(), [("Name03", ("odd",)), ("Name04", ("even",))])
+        self.assertEqual(self.model.sync([row(i, f"Name{i:02d}") for i in range(10)]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the incremental LogTail reader.
+'''
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.log_tail import LogTail, parse_level
+
+
+def line(level: str, message: str) -> str:
+    return f"2026-01-01 10:00:00 - TP_NFC - {level} - {message}\n"
+
+
+class TestLogTail(unittest.TestCase):
+    """Test cases for LogTail."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "TP_NFC.log")
+        with open(self.path, 'w') as f:
+            f.write(line("INFO", "started"))
+        self.tail = LogTail(self.path, max_lines=10)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _append(self, text: str, path: str = None) -> None:
+        with open(path or self.path, 'a') as f:
+            f.write(text)
+
+    def test_reads_only_appended_lines(self):
+        """Test incremental reads, partial lines and the per-level index."""
+        self.assertEqual(len(self.tail.read_new()), 1)
+        self.assertEqual(self.tail.read_new(), [])
+
+        self._append(line("ERROR", "failed") + "Traceback (most recent call last):\n" + "2026-01-01 - half")
+        new = self.tail.read_new()
+        self.assertEqual([level for _, level, _ in new], ["ERROR", "ERROR"])  # Traceback inherits ERROR
+        self._append(" line - WARNING - done\n")
+        self.assertEqual(self.tail.read_new()[0][1], "WARNING")
+        self.assertEqual(len(self.tail.lines(["ERROR"])), 2)
+        self.assertIsNone(parse_level("plain text"))
+
+    def test_rotation_keeps_lines_written_before_rollover(self):
+        """Test that lines appended to the old file right before rotation are still read."""
+        self.tail.read_new()
+        self._append(line("INFO", "last before rotation"))
+        os.replace(self.path, self.path + ".1")  # What RotatingFileHandler does
+        self._append(line("INFO", "first after rotation"))
+
+        messages = [text.rsplit(" - ", 1)[1] for _, _, text in self.tail.read_new()]
+        self.assertEqual(messages, ["last before rotation", "first after rotation"])
+
+    def test_truncation_starts_over(self):
+        """Test that a truncated file is read again from the start."""
+        self.tail.read_new()
+        with open(self.path, 'w') as f:
+            f.write(line("DEBUG", "fresh"))
+        self.assertEqual(self.tail.read_new()[0][1], "DEBUG")
+
+
+if __name__ == "__main__":
+    unittest.main()
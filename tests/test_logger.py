@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the queue-based logger setup.
+'''
+import os
+import sys
+import json
+import atexit
+import logging
+import tempfile
+import threading
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.logger import parse_size, setup_logger
+
+
+class TestLogger(unittest.TestCase):
+    """Test cases for setup_logger."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "logs", "TP_NFC.log")
+
+    def tearDown(self):
+        for name in ("test_logger_json", "test_logger_rotation"):
+            logger = logging.getLogger(name)
+            self._stop(logger)
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+        self.temp_dir.cleanup()
+
+    def _setup(self, name, **kwargs):
+        """Configure a logger that writes to the log file only (keeps test output quiet)."""
+        logger = setup_logger(name, log_file=self.log_file, **kwargs)
+        logger.queue_listener.handlers = logger.queue_listener.handlers[1:]
+        return logger
+
+    @staticmethod
+    def _stop(logger):
+        """Flush the listener thread and close the log file."""
+        listener = getattr(logger, 'queue_listener', None)
+        if listener:
+            listener.stop()
+            atexit.unregister(listener.stop)
+            for handler in listener.handlers:
+                handler.close()
+            logger.queue_listener = None
+
+    def test_parse_size(self):
+        """Test size strings from the config."""
+        self.assertEqual(parse_size(1024), 1024)
+        self.assertEqual(parse_size("10MB"), 10 * 1024 * 1024)
+        self.assertEqual(parse_size(" 512kb "), 512 * 1024)
+        self.assertEqual(parse_size("2048"), 2048)
+
+    def test_json_lines_keep_the_caller_fields(self):
+        """Test that records written by the listener thread keep the source line, thread and exception."""
+        logger = self._setup("test_logger_json", log_level="DEBUG", log_format="json")
+        worker = threading.Thread(target=logger.info, args=("Scanned %s", "TAG1"), name="nfc-scan")
+        worker.start()
+        worker.join()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+        self._stop(logger)
+
+        with open(self.log_file, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(entries[0]['message'], "Scanned TAG1")
+        self.assertEqual(entries[0]['thread'], "nfc-scan")
+        self.assertTrue(entries[1]['source'].startswith("test_logger.py:"))
+        self.assertIn("ValueError: boom", entries[1]['exception'])
+
+    def test_size_rotation(self):
+        """Test that the log file is rotated at max_bytes and reconfiguring replaces the listener."""
+        self._setup("test_logger_rotation", max_bytes="1KB", backup_count=2)
+        logger = self._setup("test_logger_rotation", max_bytes="1KB", backup_count=2)
+        self.assertEqual(len(logger.handlers), 1)
+
+        for i in range(100):
+            logger.info("Line %d with some padding to fill the file", i)
+        self._stop(logger)
+
+        self.assertTrue(os.path.exists(self.log_file + ".1"))
+        self.assertTrue(os.path.exists(self.log_file + ".2"))
+        self.assertFalse(os.path.exists(self.log_file + ".3"))
+        self.assertLessEqual(os.path.getsize(self.log_file), 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for tag registry replication between stations.
+'''
+import os
+import sys
+import logging
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.registry_replication import RegistryReplica, SharedFolderReplication
+
+
+class TestRegistryReplica(unittest.TestCase):
+    """Test cases for RegistryReplica."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger("test_registry_replication")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _replica(self, replica_id):
+        return RegistryReplica(self.logger, replica_id, os.path.join(self.temp_dir.name, f"{replica_id}.jsonl"))
+
+    def test_concurrent_rebind_converges(self):
+        """Test that both stations keep the same binding whichever order the changes arrive in."""
+        a, b = self._replica("a"), self._replica("b")
+        bind_a = a.record("TAG", 1)
+        bind_b = b.record("TAG", 2)  # Concurrent: neither has seen the other
+
+        self.assertEqual(a.merge([bind_b]), {"TAG": 2})  # Equal clock sums: higher replica ID wins
+        self.assertEqual(b.merge([bind_a]), {})
+        self.assertEqual(a.bindings(), b.bindings())
+        self.assertEqual(a.merge([bind_b, bind_a]), {})  # Idempotent
+
+        unbind = a.record("TAG", None)  # Made after seeing b's change, so it wins everywhere
+        self.assertEqual(b.merge([unbind]), {"TAG": None})
+        self.assertEqual(b.bindings(), {})
+
+    def test_log_is_compacted_and_survives_restart(self):
+        """Test that superseded changes are dropped from the log without losing counters."""
+        a = self._replica("a")
+        for i in range(RegistryReplica.COMPACT_SLACK + 50):
+            a.record("TAG", i)
+        a.record("OTHER", 7)
+        with open(a.log_file) as f:
+            self.assertLess(len(f.readlines()), RegistryReplica.COMPACT_SLACK + 10)
+        self.assertEqual(len(a), 2)
+
+        restarted = self._replica("a")
+        self.assertEqual(restarted.bindings(), {"TAG": RegistryReplica.COMPACT_SLACK + 49, "OTHER": 7})
+        self.assertEqual(restarted.version, a.version)
+        self.assertEqual(restarted.record("TAG", 0)['counter'], a.version["a"] + 1)
+
+    def test_changes_since_skips_what_the_peer_has(self):
+        """Test that only winning changes above the peer's version vector are offered."""
+        a, b = self._replica("a"), self._replica("b")
+        for tag_uid, original_id in (("X", 1), ("Y", 2), ("X", 3)):
+            a.record(tag_uid, original_id)
+        self.assertEqual([(c['tag_uid'], c['original_id']) for c in a.changes_since({})], [("Y", 2), ("X", 3)])
+        b.merge(a.changes_since(b.version))
+        self.assertEqual(b.bindings(), {"X": 3, "Y": 2})
+        self.assertEqual(a.changes_since(b.version), [])
+
+
+class TestSharedFolderReplication(unittest.TestCase):
+    """Test cases for replication through a shared folder."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger("test_registry_replication")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.folder = os.path.join(self.temp_dir.name, "shared")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_changes_reach_the_other_station(self):
+        """Test that existing and new bindings are exchanged through the folder."""
+        replicas, updates = {}, []
+        for replica_id in ("a", "b"):
+            replicas[replica_id] = RegistryReplica(
+                self.logger, replica_id, os.path.join(self.temp_dir.name, f"{replica_id}.jsonl"))
+        replicas["a"].record("OLD", 1)  # Made before replication was enabled
+        a = SharedFolderReplication(replicas["a"], self.folder, self.logger, lambda u: None, poll_interval=60)
+        b = SharedFolderReplication(replicas["b"], self.folder, self.logger, updates.append, poll_interval=60)
+        a.start()
+        b.start()
+        try:
+            a.publish(replicas["a"].record("NEW", 2))
+            self.assertEqual(b.poll(), {"OLD": 1, "NEW": 2})
+            self.assertEqual(b.poll(), {})
+        finally:
+            a.stop()
+            b.stop()
+        self.assertEqual(updates, [{"OLD": 1, "NEW": 2}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the guest list search index.
+'''
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import GuestRecord
+from src.utils.search_index import GuestSearchIndex, normalize_text
+
+
+class TestGuestSearchIndex(unittest.TestCase):
+    """Test cases for GuestSearchIndex."""
+
+    def setUp(self):
+        self.guests = [
+            GuestRecord(1, "Anna", "Öberg"),
+            GuestRecord(2, "Søren", "Kierkegaard"),
+            GuestRecord(3, "Ægir", "Larsen"),
+            GuestRecord(14, "Bo", "Li"),
+        ]
+        self.index = GuestSearchIndex()
+        self.index.build(self.guests)
+
+    def _ids(self, query):
+        return [guest.original_id for guest in self.index.search(query)]
+
+    def test_normalize_text(self):
+        """Test case and accent folding, including letters NFKD does not decompose."""
+        self.assertEqual(normalize_text("Öberg"), "oberg")
+        self.assertEqual(normalize_text("Søren"), "soren")
+        self.assertEqual(normalize_text("Ægir"), "aegir")
+        self.assertEqual(normalize_text(42), "42")
+
+    def test_words_match_in_any_order(self):
+        """Test that every query word must match, wherever it appears."""
+        self.assertEqual(self._ids("anna oberg"), [1])
+        self.assertEqual(self._ids("OBERG Anna"), [1])
+        self.assertEqual(self._ids("anna kierkegaard"), [])
+        self.assertEqual(self._ids("soren kierk"), [2])
+        self.assertEqual(self._ids("ÆGIR"), [3])
+        self.assertEqual(self._ids("aegir lars"), [3])
+
+    def test_short_queries(self):
+        """Test that words under three characters (no trigrams) still match as substrings."""
+        self.assertEqual(self._ids(""), [1, 2, 3, 14])
+        self.assertEqual(self._ids("li"), [14])
+        self.assertEqual(self._ids("1"), [1, 14])
+        self.assertEqual(self._ids("bo li"), [14])
+        self.assertEqual(self._ids("Øb"), [1])
+
+    def test_is_current_after_the_list_is_replaced(self):
+        """Test that the index reports itself stale for a new or resized guest list."""
+        self.assertTrue(self.index.is_current(self.guests))
+        self.assertFalse(self.index.is_current(list(self.guests)))
+        self.guests.append(GuestRecord(5, "Eve", "Ng"))
+        self.assertFalse(self.index.is_current(self.guests))
+
+        replaced = [GuestRecord(6, "Zoë", "Ström")]
+        self.index.build(replaced)
+        self.assertTrue(self.index.is_current(replaced))
+        self.assertEqual(self._ids("zoe strom"), [6])
+        self.assertEqual(self._ids("anna"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
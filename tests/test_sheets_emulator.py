@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for GoogleSheetsService against the local Sheets API emulator.
+'''
+import os
+import sys
+import ssl
+import asyncio
+import logging
+import tempfile
+import threading
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+
+from src.models import NFCTag
+from src.services.google_sheets_service import GoogleSheetsService
+from src.services.tag_manager import TagManager
+from src.services.bulk_registration import BulkRegistration
+from sheets_emulator import SheetsEmulator, ERROR_HTTP_429, ERROR_HTTP_500, parse_range
+
+
+class TestSheetsEmulator(unittest.TestCase):
+    """Test cases for GoogleSheetsService running on the emulator."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger("test_sheets_emulator")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.emulator = SheetsEmulator(seed=1)
+        self.emulator.load_guests(50)
+        self.sheets = self._service(self.emulator.client)
+        self.sheets.authenticate()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _service(self, factory):
+        config = {
+            'spreadsheet_id': 'emulated',
+            'sheet_name': 'Sheet1',
+            'guest_cache_file': os.path.join(self.temp_dir.name, 'guest_cache.json')
+        }
+        return GoogleSheetsService(config, self.logger, service_factory=factory)
+
+    def test_parse_range(self):
+        """Test A1 range parsing."""
+        self.assertEqual(parse_range("Sheet1!A:H"), ("Sheet1", 0, 0, None, 7))
+        self.assertEqual(parse_range("Sheet1!E2:I"), ("Sheet1", 1, 4, None, 8))
+        self.assertEqual(parse_range("'My Sheet'!AA5"), ("My Sheet", 4, 26, 4, 26))
+        self.assertEqual(parse_range("Sheet1!1:1"), ("Sheet1", 0, 0, 0, None))
+
+    def test_get_all_guests(self):
+        """Test reading guests and request accounting."""
+        guests = self.sheets.get_all_guests()
+        self.assertEqual(len(guests), 50)
+        self.assertEqual(guests[0].full_name, "First1 Last1")
+        self.assertEqual(self.emulator.stats['values.get'], 2)  # Headers + data
+
+    def test_chunked_read_and_wide_layout(self):
+        """Test paged guest reads and station columns past Z."""
+        stations = [f"Station{chr(ord('A') + i)}" for i in range(24)]  # Columns F..AC
+        emulator = SheetsEmulator(seed=1)
+        emulator.load_guests(25, stations=stations)
+        emulator.sheets["Sheet1"].append(["x", "Bad", "Row"])  # Skipped, reported in one summary
+        sheets = self._service(emulator.client)
+        sheets.read_chunk_rows = 10
+        sheets.authenticate()
+        self.assertTrue(sheets.mark_attendance(7, "StationX", "12:00"))
+        self.assertEqual(emulator.cell("AC8"), "12:00")
+
+        guests = sheets.get_all_guests()
+        self.assertEqual(len(guests), 25)
+        self.assertEqual(emulator.stats['values.get'], 1 + 1 + 3)  # Headers, find_guest_by_id, 3 chunks
+        self.assertEqual(guests[6].get_check_in_time("stationx"), "12:00")
+        self.assertEqual(guests[6].row_number, 8)
+
+    def test_mark_attendance_uses_station_column(self):
+        """Test that a check-in lands in the column under the station header."""
+        self.assertTrue(self.sheets.mark_attendance(5, "Lio", "10:00"))
+        self.assertEqual(self.emulator.cell("G6"), "10:00")
+
+    def test_batch_update_attendance(self):
+        """Test batched check-ins in one write request."""
+        updates = [{'original_id': i, 'station': 'Juntos', 'timestamp': '11:00'} for i in range(1, 11)]
+        self.assertTrue(self.sheets.batch_update_attendance(updates))
+        self.assertEqual(self.emulator.stats['values.batchUpdate'], 1)
+        self.assertEqual(self.emulator.cell("H11"), "11:00")
+
+    def test_schema_follows_header_changes(self):
+        """Test that a moved station column is picked up and clearing covers every station."""
+        self.assertTrue(self.sheets.mark_attendance(5, "Lio", "10:00"))
+        version = self.sheets.get_schema().version
+
+        # Insert a notes column before Lio and add a station at the end
+        for row in self.emulator.sheets["Sheet1"]:
+            row.insert(6, "note")
+        self.emulator.sheets["Sheet1"][0][6] = "Notes 2"
+        self.emulator.sheets["Sheet1"][0].append("Exit")
+        self.sheets.schema_ttl = 0
+
+        self.assertTrue(self.sheets.mark_attendance(5, "Lio", "10:05"))
+        self.assertEqual(self.emulator.cell("H6"), "10:05")
+        self.assertEqual(self.sheets.get_station_column("Exit"), "L")
+        self.assertGreater(self.sheets.get_schema().version, version)
+
+        self.sheets.schema_ttl = 60
+        self.assertTrue(self.sheets.write_wristband_uuid(5, "UUID5"))
+        self.assertTrue(self.sheets.mark_attendance(5, "Exit", "18:00"))
+        self.assertTrue(self.sheets.clear_all_check_in_data())
+        self.assertEqual(self.emulator.stats['values.batchClear'], 1)
+        for a1 in ("E6", "H6", "L6"):
+            self.assertEqual(self.emulator.cell(a1), "")
+        self.assertEqual(self.emulator.cell("G6"), "note")  # Not a station column
+
+    def test_guests_for_view_reads_only_view_columns(self):
+        """Test single-station and wristband refreshes read only their columns after one full read."""
+        guests = self.sheets.get_guests_for_view(stations=["Lio"])  # First call is a full read
+        self.assertEqual(len(guests), 50)
+        self.emulator.sheets["Sheet1"][3][6] = "10:00"  # Guest 3 at Lio (G4)
+        self.emulator.sheets["Sheet1"][4][4] = "UUID4"  # Guest 4 wristband (E5)
+        self.emulator.reset_stats()
+
+        guests = self.sheets.get_guests_for_view(stations=["Lio"])
+        self.assertEqual(self.emulator.stats['values.batchGet'], 1)
+        self.assertEqual(self.emulator.stats['values.get'], 0)
+        self.assertEqual(self.emulator.stats['cells_read'], 50 + 3)  # IDs + Lio column up to row 4
+        self.assertEqual(guests[2].get_check_in_time("lio"), "10:00")
+        self.assertEqual(guests[2].full_name, "First3 Last3")
+        self.assertIsNone(guests[3].wristband_uuid)
+
+        guests = self.sheets.get_guests_for_view(stations=[], wristbands=True)
+        self.assertEqual(guests[3].wristband_uuid, "UUID4")
+        self.assertEqual(guests[2].get_check_in_time("lio"), "10:00")
+
+        # A new guest row forces a full read
+        self.emulator.sheets["Sheet1"].append(["51", "First51", "Last51"])
+        self.emulator.reset_stats()
+        guests = self.sheets.get_guests_for_view(stations=["Lio"])
+        self.assertEqual(len(guests), 51)
+        self.assertEqual(self.emulator.stats['values.get'], 1)
+
+    def test_refresh_skipped_when_unchanged(self):
+        """Test that the fingerprint probe skips unchanged refreshes and catches check-ins."""
+        self.assertEqual(len(self.sheets.get_guests_if_changed()), 50)
+        self.emulator.reset_stats()
+        self.assertIsNone(self.sheets.get_guests_if_changed())
+        self.assertEqual(self.emulator.request_count, 1)  # Probe only
+
+        self.assertTrue(self.sheets.mark_attendance(8, "Juntos", "12:00"))
+        guests = self.sheets.get_guests_if_changed()
+        self.assertEqual(guests[7].get_check_in_time("juntos"), "12:00")
+        self.assertIsNone(self.sheets.get_guests_if_changed())
+
+        # A different view is never "unchanged"; its probe doubles as the refresh
+        self.emulator.reset_stats()
+        guests = self.sheets.get_guests_if_changed(stations=["Juntos"])
+        self.assertEqual(len(guests), 50)
+        self.assertEqual(self.emulator.request_count, 1)
+        self.assertIsNone(self.sheets.get_guests_if_changed(stations=["Juntos"]))
+
+    def test_event_tabs_share_connection(self):
+        """Test that each tab keeps its own cache and schema while sharing API clients."""
+        self.emulator.load_guests(20, stations=["Gate", "Hall"], sheet="Day 2")
+        self.assertEqual(self.sheets.list_tabs(), ["Sheet1", "Day 2"])
+        self.assertEqual(len(self.sheets.get_all_guests()), 50)
+
+        day2 = self.sheets.tab("Day 2")
+        self.assertIs(self.sheets.tab("Day 2"), day2)
+        self.assertIs(day2.connection, self.sheets.connection)
+        self.assertTrue(day2.mark_attendance(3, "Hall", "09:30"))
+        self.assertEqual(self.emulator.sheets["Day 2"][3][6], "09:30")
+        self.assertEqual(day2.get_available_stations(), ["Gate", "Hall"])
+
+        day2.warm_tabs(["Sheet1", "Day 2"])
+        self.assertEqual(len(day2._cached_guests), 20)
+        self.assertEqual(len(self.sheets._cached_guests), 50)
+        self.assertNotEqual(day2.guest_cache_file, self.sheets.guest_cache_file)
+        self.assertEqual(self.emulator.stats['client_builds'], 1)  # One thread, one client
+
+    def test_bulk_registration_batches_writes(self):
+        """Test that bulk registration binds locally and writes column E in one batch."""
+        previous = os.getcwd()
+        os.chdir(self.temp_dir.name)  # TagManager keeps its files under config/
+        try:
+            tag_manager = TagManager(None, self.sheets, self.logger, replica_id='test')
+            tag_manager.check_in_queue.stop_sync()
+            session = BulkRegistration(tag_manager, self.sheets.get_all_guests(), self.logger, flush_size=100)
+            self.assertTrue(session.seek(11))
+            self.emulator.reset_stats()
+
+            for i in range(11, 21):
+                self.assertEqual(session.register(NFCTag(f"UID{i}"))['original_id'], i)
+            self.assertIsNone(session.register(NFCTag("UID11")))  # Already used in this session
+            self.assertEqual(self.emulator.request_count, 0)
+            self.assertEqual(session.current.original_id, 21)
+            self.assertEqual(tag_manager.tag_registry["UID15"], 15)
+
+            self.emulator.fail_next(ERROR_HTTP_429, method='values.batchUpdate')
+            self.assertFalse(session.flush())
+            self.assertEqual(session.pending, 10)
+            self.assertTrue(session.stop())
+            self.assertEqual(self.emulator.stats['values.batchUpdate'], 2)  # Failed + retried batch
+            self.assertEqual(self.emulator.stats['values.update'], 0)
+            self.assertEqual(self.emulator.cell("E12"), "UID11")
+            self.assertEqual(self.emulator.cell("E21"), "UID20")
+            tag_manager.shutdown()
+        finally:
+            os.chdir(previous)
+
+    def test_async_client_fans_out_writes(self):
+        """Test concurrent async check-ins sharing one row lookup, and retry with the shared backoff."""
+        emulator = SheetsEmulator(latency=0.01, seed=1)
+        emulator.load_guests(30)
+        sheets = self._service(emulator.client)
+        client = sheets.async_client(transport=emulator.async_transport())
+        client.backoff.base = 0.01
+
+        async def run():
+            guests = await client.get_all_guests()
+            emulator.reset_stats()
+            emulator.fail_next(ERROR_HTTP_500, method='values.update')
+            results = await asyncio.gather(*(client.mark_attendance(i, "Lio", "13:00") for i in range(1, 21)))
+            batched = await client.batch_update_attendance(
+                [{'original_id': i, 'station': 'Unvrs', 'timestamp': '14:00'} for i in range(21, 31)])
+            return guests, results, batched
+
+        guests, results, batched = asyncio.run(run())
+        self.assertEqual(len(guests), 30)
+        self.assertEqual(len(sheets._cached_guests), 30)
+        self.assertTrue(all(results))
+        self.assertTrue(batched)
+        self.assertEqual(emulator.stats['values.get'], 2)  # One shared ID column read per burst
+        self.assertEqual(emulator.stats['values.update'], 21)  # 20 writes + 1 retry
+        self.assertEqual(emulator.cell("G21"), "13:00")
+        self.assertEqual(emulator.cell("J31"), "14:00")
+
+    def test_header_read_does_not_block_async_schema_updates(self):
+        """Test that the async client can update the schema while a sync header read is in flight."""
+        client = self.sheets.async_client(transport=self.emulator.async_transport())
+        fetch_header_row = self.sheets._fetch_header_row
+        in_fetch, release = threading.Event(), threading.Event()
+
+        def slow_fetch(*args):
+            in_fetch.set()
+            release.wait(2)
+            return fetch_header_row(*args)
+
+        self.sheets._fetch_header_row = slow_fetch
+        reader = threading.Thread(target=self.sheets.get_schema)
+        reader.start()
+        try:
+            self.assertTrue(in_fetch.wait(2))
+            self.assertFalse(self.sheets._schema_lock.locked())
+            schema = asyncio.run(asyncio.wait_for(client.get_schema(), 2))
+            self.assertIn('lio', schema.station_columns)
+        finally:
+            release.set()
+            reader.join(2)
+
+    def test_guest_cache_keeps_wristbands(self):
+        """Test that a restart served from the guest cache still knows the wristband UUIDs."""
+        self.assertTrue(self.sheets.write_wristband_uuid(7, "UID7"))
+        self.sheets.get_all_guests()
+        restarted = self._service(self.emulator.client)
+        guest = next(g for g in restarted._cached_guests if g.original_id == 7)
+        self.assertEqual(guest.wristband_uuid, "UID7")
+
+    def test_server_error_is_retried(self):
+        """Test that a transient 500 is retried and a 429 is not."""
+        self.sheets.get_dynamic_stations()
+        self.emulator.fail_next(ERROR_HTTP_500)
+        self.assertIsNotNone(self.sheets.find_guest_by_id(3))
+
+        self.emulator.fail_next(ERROR_HTTP_429)
+        self.assertIsNone(self.sheets.find_guest_by_id(3))
+
+    def test_shared_client_reproduces_wrong_version_number(self):
+        """Test that concurrent use of one client fails like a shared httplib2 connection."""
+        emulator = SheetsEmulator(latency=0.02, detect_shared_clients=True)
+        emulator.load_guests(10)
+        shared_client = emulator.client()
+        client = shared_client.spreadsheets().values()
+        errors = []
+
+        def read():
+            try:
+                client.get(spreadsheetId='emulated', range='Sheet1!A:A').execute()
+            except ssl.SSLError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(errors)
+        self.assertIn("WRONG_VERSION_NUMBER", str(errors[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the headless StationDaemon against the local Sheets API emulator.
+'''
+import os
+import sys
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+
+from src.models import NFCTag
+from src.services.google_sheets_service import GoogleSheetsService
+from src.services.station_daemon import CommandFeedback, StationDaemon
+from src.services.tag_manager import TagManager
+from sheets_emulator import SheetsEmulator
+
+
+class TestStationDaemon(unittest.TestCase):
+    """Test cases for StationDaemon."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.previous_dir = os.getcwd()
+        os.chdir(self.temp_dir.name)  # TagManager keeps its files under config/
+        self.logger = logging.getLogger("test_station_daemon")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+
+        self.emulator = SheetsEmulator(seed=1)
+        self.emulator.load_guests(20)
+        self.sheets = GoogleSheetsService(
+            {'spreadsheet_id': 'emulated', 'sheet_name': 'Sheet1', 'guest_cache_file': 'config/guest_cache.json'},
+            self.logger, service_factory=self.emulator.client)
+        self.sheets.authenticate()
+        self.tag_manager = TagManager(None, self.sheets, self.logger, replica_id='test')
+        self.tag_manager.check_in_queue.stop_sync()  # Synced explicitly
+        self.tag_manager.bind_tag("TAG3", 3)
+        self.daemon = StationDaemon(None, self.sheets, self.tag_manager, self.logger, "Lio")
+        self.daemon.refresh_guests()
+
+    def tearDown(self):
+        self.tag_manager.shutdown()
+        os.chdir(self.previous_dir)
+        self.temp_dir.cleanup()
+
+    def test_rescan_after_sync_is_duplicate(self):
+        """Test that a re-scan stays a duplicate after the queue has synced and forgotten the check-in."""
+        self.assertEqual(self.daemon.process_tag(NFCTag("TAG3"))['status'], 'checked_in')
+        self.tag_manager.check_in_queue.force_sync()
+        self.assertNotEqual(self.emulator.cell("G4"), "")
+        self.assertFalse(self.tag_manager.check_in_queue.has_check_in(3, "lio"))
+
+        self.assertEqual(self.daemon.process_tag(NFCTag("TAG3"))['status'], 'duplicate')
+        self.assertEqual(self.daemon.process_tag(NFCTag("NOPE"))['status'], 'unregistered')
+        self.assertEqual(self.daemon._stats['check_ins'], 1)
+
+    def test_feedback_command_is_not_run_through_a_shell(self):
+        """Test that sheet values are passed as single arguments, never parsed by a shell."""
+        feedback = CommandFeedback({'success': "say 'Welcome {name}' --station {station}"}, self.logger)
+        with mock.patch('subprocess.Popen') as popen:
+            feedback.success({'guest_name': 'Eve"; rm -rf ~; "', 'station': 'Lio', 'tag_uid': 'X'})
+        argv = popen.call_args[0][0]
+        self.assertEqual(argv, ['say', 'Welcome Eve"; rm -rf ~; "', '--station', 'Lio'])
+        self.assertNotIn('shell', popen.call_args[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the LAN StationHub, its HubClient and the check-in queue's hub handling.
+'''
+import os
+import sys
+import time
+import logging
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+
+from src.services.check_in_queue import CheckInQueue
+from src.services.google_sheets_service import GoogleSheetsService
+from src.services.station_hub import HubClient, StationHub
+from src.services.tag_manager import TagManager
+from sheets_emulator import SheetsEmulator, ERROR_HTTP_429
+
+
+def check_in(event_id, original_id=5, station="Lio", timestamp="10:00"):
+    return {'type': 'check_in', 'event_id': event_id, 'original_id': original_id, 'station': station,
+            'timestamp': timestamp, 'guest_name': f"Guest {original_id}"}
+
+
+class TestStationHub(unittest.TestCase):
+    """Test cases for StationHub and HubClient."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger("test_station_hub")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.log_file = os.path.join(self.temp_dir.name, "hub_events.jsonl")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _hub(self, **kwargs):
+        return StationHub(self.logger, host="127.0.0.1", port=0, event_log_file=self.log_file, **kwargs)
+
+    def test_first_check_in_wins_until_cleared(self):
+        """Test per guest/station dedup, that a clear lifts it, and that both survive a hub restart."""
+        hub = self._hub()
+        self.assertEqual(hub.publish(check_in("a")), (1, False))
+        self.assertEqual(hub.publish(check_in("a")), (1, True))  # Re-sent event
+        self.assertEqual(hub.publish(check_in("b", timestamp="10:05")), (1, True))  # Another station, same key
+        self.assertFalse(hub.publish(check_in("c", station="Shuttle"))[1])
+
+        hub.publish({'type': 'clear_check_ins', 'event_id': 'clear-1'})
+        with hub._lock:
+            self.assertEqual(hub._pending_check_ins(), [])  # Cleared before the hub wrote them
+        self.assertEqual(hub.publish(check_in("d", timestamp="11:00")), (4, False))
+
+        restarted = self._hub()
+        self.assertTrue(restarted.publish(check_in("e", timestamp="11:30"))[1])
+        with restarted._lock:
+            self.assertEqual([event['event_id'] for event in restarted._pending_check_ins()], ["d"])
+
+    def test_clients_relay_and_ack(self):
+        """Test that one station's check-in reaches the other and its ack reports duplicates."""
+        hub = self._hub()
+        hub.start()
+        received, acks = [], []
+        got_event, got_acks = threading.Event(), threading.Event()
+
+        def on_ack(event, duplicate):
+            acks.append((event['event_id'], duplicate))
+            if len(acks) == 2:
+                got_acks.set()
+
+        first = HubClient(self.logger, "127.0.0.1", hub.port, station_id="one")
+        second = HubClient(self.logger, "127.0.0.1", hub.port, station_id="two")
+        first.on_ack = on_ack
+        second.on_event = lambda event: (received.append(event), got_event.set())
+        try:
+            for client in (first, second):
+                client.start()
+                self.assertTrue(client.wait_connected(3))
+            first.publish(check_in("a"))
+            self.assertTrue(got_event.wait(3))
+            first.publish(check_in("b", timestamp="10:05"))
+            self.assertTrue(got_acks.wait(3))
+        finally:
+            first.stop()
+            second.stop()
+            hub.stop()
+
+        self.assertEqual([event['event_id'] for event in received], ["a"])
+        self.assertEqual(acks, [("a", False), ("b", True)])
+        self.assertEqual(first.pending(), 0)
+
+    def test_log_is_compacted_and_replayed_with_gaps(self):
+        """Test that obsolete events leave the log and a replay from 0 still catches up."""
+        with mock.patch.object(StationHub, 'COMPACT_SLACK', 5):
+            hub = self._hub()
+            for original_id in range(1, 7):
+                hub.publish(check_in(f"c{original_id}", original_id=original_id))
+            for counter in (1, 2):  # The second change wins for the tag
+                hub.publish({'type': 'registry_change', 'event_id': f"reg:a:{counter}",
+                             'change': {'replica': "a", 'counter': counter, 'clock': {"a": counter},
+                                        'tag_uid': "X", 'original_id': counter}})
+            hub.publish({'type': 'clear_check_ins', 'event_id': 'clear-1'})
+            hub.publish(check_in("c7", original_id=7))
+            self.assertEqual([event['seq'] for event in hub._events], [8, 9, 10])
+            with open(self.log_file) as f:
+                self.assertEqual(len(f.readlines()), 3)
+
+            restarted = self._hub()
+        self.assertEqual(restarted.publish(check_in("c8", original_id=8)), (11, False))
+        restarted.start()
+        received = []
+        client = HubClient(self.logger, "127.0.0.1", restarted.port, station_id="late")
+        client.on_event = lambda event: received.append(event['seq'])
+        try:
+            client.start()
+            deadline = time.monotonic() + 3
+            while client._last_seq < 11 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            client.stop()
+            restarted.stop()
+        self.assertEqual(received, [8, 9, 10, 11])
+        self.assertEqual(client._last_seq, 11)
+
+
+class TestCheckInQueueHub(unittest.TestCase):
+    """Test cases for the check-in queue's handling of hub events and acks."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger("test_station_hub")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.emulator = SheetsEmulator(seed=1)
+        self.emulator.load_guests(10)
+        self.sheets = GoogleSheetsService(
+            {'spreadsheet_id': 'emulated', 'sheet_name': 'Sheet1',
+             'guest_cache_file': os.path.join(self.temp_dir.name, 'guest_cache.json')},
+            self.logger, service_factory=self.emulator.client)
+        self.sheets.authenticate()
+        self.queue = CheckInQueue(self.logger, os.path.join(self.temp_dir.name, "queue.json"))
+        self.queue.set_sheets_service(self.sheets)
+        self.hub_client = HubClient(self.logger, "127.0.0.1", 1)  # Never started
+        self.hub_client.hub_writes_sheets = True
+        self.queue.set_hub_client(self.hub_client)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_duplicate_ack_keeps_item_until_sheet_has_it(self):
+        """Test that a check-in the hub calls a duplicate is still written if the sheet has none."""
+        self.queue.add_check_in(5, "Lio", "11:00", "Guest 5")
+        self.queue.add_check_in(6, "Lio", "11:01", "Guest 6")
+        first, second = self.queue.queue
+        self.queue.apply_hub_ack(self.queue._hub_event(second), duplicate=False)
+        self.queue.apply_hub_ack(self.queue._hub_event(first), duplicate=True)
+        self.assertEqual(len(self.queue.queue), 1)
+        self.assertTrue(self.queue.queue[0]['hub_duplicate'])
+
+        self.queue.force_sync()  # Hub not connected: written here
+        self.assertEqual(self.emulator.cell("G6"), "11:00")
+        self.assertEqual(self.queue.queue, [])
+
+    def test_remote_check_ins_are_display_only(self):
+        """Test that other stations' check-ins are shown but never queued or written here."""
+        self.assertTrue(self.queue.apply_remote_check_in(5, "Juntos", "10:30"))
+        self.assertTrue(self.queue.has_check_in(5, "juntos"))
+        self.assertFalse(self.queue.add_check_in(5, "Juntos", "10:31", "Guest 5"))
+        self.assertEqual(self.queue.get_all_local_check_ins(), {5: {'juntos': "10:30"}})
+
+        guests = self.sheets.get_all_guests()
+        self.queue.resolve_sync_conflicts(guests)
+        self.assertEqual(self.queue.queue, [])
+        self.queue.evict_remote_check_ins(guests)
+        self.assertTrue(self.queue.has_check_in(5, "juntos"))  # Not in the sheet yet
+
+        self.sheets.mark_attendance(5, "Juntos", "10:30")
+        self.queue.evict_remote_check_ins(self.sheets.get_all_guests())
+        self.assertEqual(self.queue.remote_check_ins, {})
+
+    def test_sync_removes_written_items_by_identity(self):
+        """Test that a queue change during a Google Sheets write does not remove the wrong item."""
+        self.queue.add_check_in(5, "Lio", "11:00", "Guest 5")
+        self.queue.add_check_in(6, "Lio", "11:01", "Guest 6")
+        self.queue.queue[1]['attempts'] = 1  # Waiting for a retry
+        self.queue.queue[1]['last_attempt'] = datetime.now().isoformat()
+        mark_attendance = self.sheets.mark_attendance
+
+        def cleared_while_writing(*args):
+            self.queue.apply_remote_clear(original_id=5)  # Hub thread
+            return mark_attendance(*args)
+
+        self.sheets.mark_attendance = cleared_while_writing
+        self.queue.force_sync()
+        self.assertEqual([item['original_id'] for item in self.queue.queue], [6])
+
+    def test_remote_clear_drops_cached_and_queued_check_ins(self):
+        """Test that another station's clear removes matching check-ins here."""
+        self.queue.add_check_in(5, "Lio", "11:00", "Guest 5")
+        self.queue.apply_remote_check_in(6, "Lio", "11:02")
+        self.queue.add_check_in(7, "Shuttle", "11:03", "Guest 7")
+        self.assertTrue(self.queue.apply_remote_clear(station="Lio"))
+        self.assertEqual(self.queue.get_all_local_check_ins(), {7: {'shuttle': "11:03"}})
+        self.assertEqual([item['original_id'] for item in self.queue.queue], [7])
+        self.assertFalse(self.queue.apply_remote_clear(original_id=5))
+
+
+class TestTagManagerHub(unittest.TestCase):
+    """Test cases for the tag manager's routing of hub traffic."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.previous_dir = os.getcwd()
+        os.chdir(self.temp_dir.name)  # TagManager keeps its files under config/
+        self.logger = logging.getLogger("test_station_hub")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.emulator = SheetsEmulator(seed=1)
+        self.emulator.load_guests(10)
+        self.emulator.load_guests(10, sheet="Day 2")
+        sheets = GoogleSheetsService(
+            {'spreadsheet_id': 'emulated', 'sheet_name': 'Sheet1', 'guest_cache_file': 'config/guest_cache.json'},
+            self.logger, service_factory=self.emulator.client)
+        sheets.authenticate()
+        self.tag_manager = TagManager(None, sheets, self.logger, replica_id='test')
+        self.hub_client = HubClient(self.logger, "127.0.0.1", 1)
+        self.hub_client.start = lambda: None  # Routing only, no connection
+        self.hub_client.hub_writes_sheets = True
+
+    def tearDown(self):
+        self.tag_manager.shutdown()
+        os.chdir(self.previous_dir)
+        self.temp_dir.cleanup()
+
+    def test_hub_traffic_stays_on_its_tab(self):
+        """Test that hub check-ins and acks reach the hub's tab after switching to another tab."""
+        self.tag_manager.connect_hub(self.hub_client)
+        sheet1 = self.tag_manager.check_in_queue
+        sheet1.stop_sync()
+        sheet1.add_check_in(5, "Lio", "10:00", "Guest 5")
+        self.tag_manager.switch_sheet_tab("Day 2")
+        day2 = self.tag_manager.check_in_queue
+        day2.stop_sync()
+
+        self.tag_manager._on_hub_ack(sheet1._hub_event(sheet1.queue[0]), False)
+        self.tag_manager._on_hub_event(dict(check_in("remote", original_id=6), origin="other"))
+        self.assertEqual(sheet1.queue, [])
+        self.assertTrue(sheet1.has_check_in(6, "lio"))
+        self.assertEqual(day2.get_all_local_check_ins(), {})
+
+    def test_orphaned_tags_are_dropped_here_only(self):
+        """Test that sheet-derived orphans are not replicated and cached guest data unbinds nothing."""
+        self.tag_manager.connect_hub(self.hub_client)
+        sheets = self.tag_manager.sheets_service
+        for tag_uid, original_id in (("ORPHAN", 3), ("KEPT", 4)):
+            self.tag_manager.bind_tag(tag_uid, original_id)
+        self.tag_manager._recent_bindings.clear()  # Grace period over
+        published = self.hub_client.pending()
+
+        sheets.get_all_guests()  # Fills the guest cache
+        self.emulator.fail_next(ERROR_HTTP_429)
+        self.tag_manager.sync_tag_registry_with_sheets(sheets.get_all_guests())
+        self.assertTrue(sheets.guests_from_cache)
+        self.assertEqual(len(self.tag_manager.tag_registry), 2)
+
+        sheets.write_wristband_uuid(4, "KEPT")
+        self.tag_manager.sync_tag_registry_with_sheets(sheets.get_all_guests())
+        self.assertEqual(dict(self.tag_manager.tag_registry.snapshot()), {"KEPT": 4})
+        self.assertEqual(self.hub_client.pending(), published)
+        self.assertEqual(self.tag_manager.registry_replica.bindings(), {"ORPHAN": 3, "KEPT": 4})
+
+    def test_replayed_clear_spares_later_check_ins(self):
+        """Test that a clear replayed with since=0 keeps newer check-ins and the position is saved."""
+        hub = StationHub(self.logger, host="127.0.0.1", port=0, event_log_file="config/hub_events.jsonl")
+        hub.publish({'type': 'clear_check_ins', 'event_id': 'clear-1', 'origin': 'other',
+                     'time': "2000-01-01T00:00:00"})
+        hub.start()
+        queue = self.tag_manager.check_in_queue
+        queue.stop_sync()
+        queue.add_check_in(5, "Lio", "10:00", "Guest 5")
+        client = HubClient(self.logger, "127.0.0.1", hub.port, station_id="here")
+        try:
+            self.tag_manager.connect_hub(client)  # Nothing saved yet: since=0
+            deadline = time.monotonic() + 3
+            while client._last_seq < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            client.stop()
+            hub.stop()
+
+        self.assertEqual(client._last_seq, 1)
+        self.assertEqual([item['original_id'] for item in queue.queue], [5])
+        self.assertTrue(queue.has_check_in(5, "lio"))
+        self.assertEqual(HubClient(self.logger, "127.0.0.1", hub.port, state_file=client.state_file)._last_seq, 1)
+
+        self.assertTrue(queue.apply_remote_clear(cleared_at=datetime.now().isoformat()))
+        self.assertEqual(queue.queue, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the TagRegistry reverse index and its persistence.
+'''
+import os
+import sys
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import TagRegistry
+from src.services.registry_store import RegistryStore
+
+
+class TestTagRegistry(unittest.TestCase):
+    """Test cases for TagRegistry."""
+
+    def setUp(self):
+        self.registry = TagRegistry({"A1": 1, "B2": 2, "C2": 2})
+
+    def test_index_follows_mutations(self):
+        """Test that rebinding, popping and clearing keep the reverse index and counts right."""
+        self.assertEqual(self.registry.tags_for(2), {"B2", "C2"})
+        self.assertEqual(self.registry.guest_count, 2)
+        self.assertEqual(self.registry.duplicate_guests, 1)
+
+        self.registry["C2"] = 3  # Rebind
+        self.assertEqual(self.registry.tags_for(2), {"B2"})
+        self.assertEqual(self.registry.tags_for(3), {"C2"})
+        self.assertEqual(self.registry.duplicate_guests, 0)
+
+        self.assertEqual(self.registry.pop("A1"), 1)
+        self.assertIsNone(self.registry.pop("A1", None))
+        self.assertFalse(self.registry.has_guest(1))
+        del self.registry["B2"]
+        self.assertEqual(self.registry.guest_count, 1)
+
+        self.registry.update({"D4": "4", "E4": 4})
+        self.assertEqual(self.registry.unbind_guest(4), {"D4", "E4"})
+        self.assertEqual(dict(self.registry), {"C2": 3})
+        self.registry.clear()
+        self.assertEqual(self.registry.guest_count, 0)
+        self.assertEqual(self.registry.tags_for(3), frozenset())
+
+    def test_json_round_trip(self):
+        """Test that the registry serialises as a plain mapping."""
+        restored = TagRegistry(json.loads(json.dumps(self.registry)))
+        self.assertEqual(restored, self.registry)
+        self.assertEqual(restored.tags_for(2), {"B2", "C2"})
+
+
+class TestRegistryStore(unittest.TestCase):
+    """Test cases for the snapshot + journal registry store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger("test_registry_store")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.path = Path(self.temp_dir.name) / "tag_registry.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _store(self, compact_every=1000):
+        return RegistryStore(self.logger, self.path, compact_every=compact_every, fsync=False)
+
+    def test_journal_replay_and_compaction(self):
+        """Test that binds are journaled, replayed after a restart and compacted into the snapshot."""
+        store = self._store(compact_every=4)
+        registry = TagRegistry({"A": 1})
+        store.snapshot(registry)
+        for tag_uid, original_id in (("B", 2), ("C", 3), ("A", None)):
+            if original_id is None:
+                registry.pop(tag_uid)
+            else:
+                registry[tag_uid] = original_id
+            store.record(tag_uid, original_id, registry)
+        self.assertEqual(json.loads(self.path.read_text()), {"A": 1})  # Snapshot untouched
+        with open(store.journal_file, 'a') as f:
+            f.write('{"tag":"D","i')  # Torn write from a power loss
+        store = self._store(compact_every=4)
+        self.assertEqual(store.load(), {"B": 2, "C": 3})
+
+        registry["D"] = 4
+        store.record("D", 4, registry)  # Fourth entry triggers compaction
+        self.assertEqual(json.loads(self.path.read_text()), {"B": 2, "C": 3, "D": 4})
+        self.assertEqual(store.journal_entries, 0)
+        self.assertEqual(self._store().load(), {"B": 2, "C": 3, "D": 4})
+
+    def test_corrupt_snapshot_falls_back_to_backup_and_its_journal(self):
+        """Test that bindings journaled before the last compaction survive a corrupt snapshot."""
+        store = self._store(compact_every=2)
+        registry = TagRegistry()
+        store.snapshot(registry)
+        for tag_uid, original_id in (("A", 1), ("B", 2), ("C", 3)):
+            registry[tag_uid] = original_id
+            store.record(tag_uid, original_id, registry)  # Compacts after B
+        registry.clear()
+        store.snapshot(registry)  # Not journaled: the backup pair must not undo it...
+        self.assertEqual(self._store().load(), {})
+        self.path.write_text("{")  # ...unless the snapshot is lost
+        self.assertEqual(self._store().load(), {"A": 1, "B": 2, "C": 3})
+
+    def test_crash_between_renames(self):
+        """Test recovery when the snapshot was moved to backup but the new one never landed."""
+        store = self._store()
+        store.snapshot({"A": 1})
+        store.record("B", 2, {"A": 1, "B": 2})
+        os.replace(self.path, store.backup_file)
+        self.assertEqual(self._store().load(), {"A": 1, "B": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
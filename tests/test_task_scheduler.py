@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Tests for the lane-based TaskScheduler.
+'''
+import os
+import sys
+import time
+import logging
+import threading
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.task_scheduler import TaskScheduler
+
+
+class TestTaskScheduler(unittest.TestCase):
+    """Test cases for TaskScheduler."""
+
+    def setUp(self):
+        self.logger = logging.getLogger("test_task_scheduler")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self.scheduler = TaskScheduler(self.logger)
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.shutdown(wait=True, timeout=2)
+
+    def _blocking(self, token=None):
+        self.started.set()
+        self.release.wait(2)
+        self.results.append(('blocking', token.cancelled if token else None))
+
+    def test_supersede_cancels_running_and_drops_queued(self):
+        """Test that a newer task with the same key replaces queued ones and cancels the running one."""
+        self.results = []
+        cancelled = []
+        lane = TaskScheduler.LANE_REFRESH
+        first = self.scheduler.submit(lane, self._blocking, key="refresh", supersede=True, with_token=True)
+        self.assertTrue(self.started.wait(2))
+        self.scheduler.submit(lane, self.results.append, 'queued', key="refresh", supersede=True,
+                              on_cancel=lambda: cancelled.append('queued'))
+        last = self.scheduler.submit(lane, self.results.append, 'latest', key="refresh", supersede=True)
+
+        self.assertTrue(first.token.cancelled)
+        self.release.set()
+        self.assertTrue(last.done.wait(2))
+        self.assertEqual(self.results, [('blocking', True), 'latest'])
+        self.assertEqual(cancelled, ['queued'])
+        self.assertEqual(self.scheduler.metrics()[lane]['superseded'], 1)
+
+    def test_cancel_and_lane_isolation(self):
+        """Test cancel by key, and that a busy sync lane does not hold up check-ins."""
+        self.results = []
+        self.scheduler.submit(TaskScheduler.LANE_SYNC, self._blocking)
+        self.assertTrue(self.started.wait(2))
+        queued = self.scheduler.submit(TaskScheduler.LANE_SYNC, self.results.append, 'sync', key="resync")
+        self.assertEqual(self.scheduler.cancel(TaskScheduler.LANE_SYNC, "resync"), 1)
+
+        check_in = self.scheduler.submit(TaskScheduler.LANE_CHECKIN, self.results.append, 'check_in')
+        self.assertTrue(check_in.done.wait(2))
+        self.assertEqual(self.results, ['check_in'])  # Sync lane still blocked
+
+        self.release.set()
+        self.assertTrue(queued.done.wait(2))
+        self.assertNotIn('sync', self.results)
+
+    def test_shutdown_timeout_is_overall(self):
+        """Test that shutdown waits at most the timeout in total, however many workers are busy."""
+        self.results = []
+        lane = TaskScheduler.LANE_NFC
+        for _ in range(self.scheduler.metrics()[lane]['workers']):
+            self.scheduler.submit(lane, self._blocking)
+        self.assertTrue(self.started.wait(2))
+        started = time.monotonic()
+        self.scheduler.shutdown(wait=True, timeout=0.3)
+        self.assertLess(time.monotonic() - started, 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
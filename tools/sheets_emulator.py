@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+In-process Google Sheets API stand-in for offline tests and benchmarks.
+
+Implements the spreadsheets().values() calls GoogleSheetsService makes
+(get, batchGet, update, batchUpdate, clear, batchClear) and spreadsheets().get
+(tab titles) on an in-memory grid of one or more tabs, with
+configurable latency, error injection (HTTP 500/429, SSL resets, the
+WRONG_VERSION_NUMBER error of a client shared between threads) and
+request accounting.
+
+Usage:
+    emulator = SheetsEmulator(latency=0.05)
+    emulator.load_guests(1000, stations=["Reception", "Lio"])
+    sheets = GoogleSheetsService(config, logger, service_factory=emulator.client)
+    client = sheets.async_client(transport=emulator.async_transport())  # asyncio path
+"""
+
+import asyncio
+import random
+import re
+import ssl
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+DEFAULT_HEADERS = ["OriginalID", "FirstName", "LastName", "MobileNumber", "Wristband"]
+DEFAULT_STATIONS = ["Reception", "Lio", "Juntos", "Experimental", "Unvrs"]
+
+ERROR_HTTP_500 = "http_500"
+ERROR_HTTP_429 = "http_429"
+ERROR_SSL_RESET = "ssl_reset"
+ERROR_CONNECTION_RESET = "connection_reset"
+
+_A1_RE = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+def column_index(letters: str) -> int:
+    """Convert a column letter (A, Z, AA, ...) to a 0-based index."""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def parse_range(a1_range: str, default_sheet: str = "Sheet1") -> Tuple[str, int, int, Optional[int], Optional[int]]:
+    """
+    Parse an A1 range such as "Sheet1!A:H", "'My Sheet'!E2:I", "Sheet1!1:1" or "Sheet1!E5".
+
+    Returns:
+        Tuple: (sheet, first row, first column, last row or None, last column or None), 0-based and inclusive
+    """
+    if '!' in a1_range:
+        sheet, cells = a1_range.rsplit('!', 1)
+        sheet = sheet.strip("'").replace("''", "'")
+    else:
+        sheet, cells = default_sheet, a1_range
+
+    start, _, end = cells.upper().partition(':')
+    start_match, end_match = _A1_RE.match(start), _A1_RE.match(end or start)
+    if not start_match or not end_match:
+        raise ValueError(f"Unable to parse range: {a1_range}")
+    start_col, start_row = start_match.groups()
+    end_col, end_row = end_match.groups()
+
+    first_col = column_index(start_col) if start_col else 0
+    first_row = int(start_row) - 1 if start_row else 0
+    last_col = column_index(end_col) if end_col else None
+    last_row = int(end_row) - 1 if end_row else None
+    if not end and start_col and start_row:
+        last_col, last_row = first_col, first_row  # Single cell
+    return sheet, first_row, first_col, last_row, last_col
+
+
+class _Request:
+    """Deferred call returned by the emulated discovery client; runs on execute()."""
+
+    def __init__(self, client: "_Client", method: str, kwargs: Dict[str, Any]):
+        self._client = client
+        self._method = method
+        self._kwargs = kwargs
+
+    def execute(self, num_retries: int = 0) -> Dict[str, Any]:
+        return self._client.emulator.execute(self._client, self._method, self._kwargs)
+
+
+class _Values:
+    def __init__(self, client: "_Client"):
+        self._client = client
+
+    def get(self, **kwargs):
+        return _Request(self._client, 'values.get', kwargs)
+
+    def batchGet(self, **kwargs):
+        return _Request(self._client, 'values.batchGet', kwargs)
+
+    def update(self, **kwargs):
+        return _Request(self._client, 'values.update', kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return _Request(self._client, 'values.batchUpdate', kwargs)
+
+    def clear(self, **kwargs):
+        return _Request(self._client, 'values.clear', kwargs)
+
+    def batchClear(self, **kwargs):
+        return _Request(self._client, 'values.batchClear', kwargs)
+
+
+class _Spreadsheets:
+    def __init__(self, client: "_Client"):
+        self._client = client
+
+    def values(self):
+        return _Values(self._client)
+
+    def get(self, **kwargs):
+        return _Request(self._client, 'spreadsheets.get', kwargs)
+
+
+class _Client:
+    """Stand-in for build('sheets', 'v4', ...); one HTTP connection per client, like httplib2."""
+
+    def __init__(self, emulator: "SheetsEmulator"):
+        self.emulator = emulator
+        self.in_flight = 0
+
+    def spreadsheets(self):
+        return _Spreadsheets(self)
+
+
+class _AsyncTransport:
+    """Async transport for AsyncSheetsClient: same grid and accounting, latency is awaited."""
+
+    def __init__(self, emulator: "SheetsEmulator"):
+        self.emulator = emulator
+
+    async def call(self, method: str, **kwargs) -> Dict[str, Any]:
+        return await self.emulator.execute_async(method, kwargs)
+
+    async def close(self) -> None:
+        pass
+
+
+class SheetsEmulator:
+    """In-memory spreadsheet served through an emulated Sheets API client.
+
+    Pass emulator.client as GoogleSheetsService's service_factory. Every
+    execute() sleeps for the configured latency, may raise an injected error
+    and is counted in stats (per method, cells read/written, client builds).
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None,
+                 quota_per_minute: Optional[int] = None, detect_shared_clients: bool = False):
+        """
+        Initialize emulator.
+
+        Args:
+            latency: Seconds added to every request
+            jitter: Extra random latency (0..jitter seconds)
+            seed: Random seed for jitter and error rates (reproducible runs)
+            quota_per_minute: Requests allowed per rolling minute before HTTP 429, None for no quota
+            detect_shared_clients: Raise WRONG_VERSION_NUMBER when one client is used by two threads at once
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.quota_per_minute = quota_per_minute
+        self.detect_shared_clients = detect_shared_clients
+        self.sheets: Dict[str, List[List[str]]] = {"Sheet1": []}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._scripted_errors: Deque[Tuple[str, Optional[str]]] = deque()
+        self._error_rates: Dict[str, float] = {}
+        self._request_times: Deque[float] = deque()
+        self.stats: Counter = Counter()
+        self.request_log: List[Tuple[float, str, str]] = []
+
+    # --- Data -------------------------------------------------------------
+
+    def load_rows(self, rows: Sequence[Sequence[Any]], sheet: str = "Sheet1") -> None:
+        """Replace a sheet's content (first row = headers)."""
+        with self._lock:
+            self.sheets[sheet] = [[str(cell) for cell in row] for row in rows]
+
+    def load_guests(self, count: int, stations: Sequence[str] = DEFAULT_STATIONS, sheet: str = "Sheet1",
+                    checked_in_ratio: float = 0.0) -> None:
+        """
+        Fill a sheet with generated guests in the app's column layout.
+
+        Args:
+            count: Number of guests
+            stations: Station header names (columns after Wristband)
+            sheet: Sheet name
+            checked_in_ratio: Fraction of guests pre-checked-in at the first station
+        """
+        rows = [DEFAULT_HEADERS + list(stations)]
+        for guest_id in range(1, count + 1):
+            row = [str(guest_id), f"First{guest_id}", f"Last{guest_id}", f"+34 600 {guest_id:06d}", ""]
+            row += [""] * len(stations)
+            if stations and self._random.random() < checked_in_ratio:
+                row[len(DEFAULT_HEADERS)] = "09:00"
+            rows.append(row)
+        self.load_rows(rows, sheet)
+
+    def cell(self, a1: str, sheet: str = "Sheet1") -> str:
+        """Read one cell (e.g. "F12") without counting it as a request."""
+        _, row, col, _, _ = parse_range(a1, sheet)
+        with self._lock:
+            grid = self.sheets.get(sheet, [])
+            return grid[row][col] if row < len(grid) and col < len(grid[row]) else ""
+
+    # --- Faults and accounting ------------------------------------------
+
+    def fail_next(self, error: str, count: int = 1, method: Optional[str] = None) -> None:
+        """
+        Make the next request(s) fail.
+
+        Args:
+            error: ERROR_HTTP_500, ERROR_HTTP_429, ERROR_SSL_RESET or ERROR_CONNECTION_RESET
+            count: Number of consecutive failures
+            method: Only fail this method (e.g. "values.update"), None for any
+        """
+        with self._lock:
+            self._scripted_errors.extend([(error, method)] * count)
+
+    def set_error_rate(self, error: str, rate: float) -> None:
+        """Fail a random fraction (0..1) of requests with an error."""
+        with self._lock:
+            self._error_rates[error] = rate
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.request_log.clear()
+
+    @property
+    def request_count(self) -> int:
+        return self.stats['requests']
+
+    # --- Client -----------------------------------------------------------
+
+    def async_transport(self) -> _AsyncTransport:
+        """Transport for GoogleSheetsService.async_client(); requests run concurrently on the event loop."""
+        return _AsyncTransport(self)
+
+    def client(self) -> _Client:
+        """Create an emulated API client (counted like a build() call)."""
+        with self._lock:
+            self.stats['client_builds'] += 1
+        return _Client(self)
+
+    def execute(self, client: _Client, method: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request: account, delay, maybe fail, then apply it to the grid."""
+        error = self._begin(method, kwargs)
+        with self._lock:
+            client.in_flight += 1
+            shared = client.in_flight > 1
+
+        try:
+            delay = self._delay()
+            if delay:
+                time.sleep(delay)
+            if shared and self.detect_shared_clients:
+                error = ERROR_SSL_RESET
+            return self._finish(method, kwargs, error)
+        finally:
+            with self._lock:
+                client.in_flight -= 1
+
+    async def execute_async(self, method: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Like execute(), but the latency is awaited so concurrent requests overlap."""
+        error = self._begin(method, kwargs)
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._finish(method, kwargs, error)
+
+    def _begin(self, method: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Account for a request and pick the error it will fail with, if any."""
+        body = kwargs.get('body', {})
+        a1 = kwargs.get('range') or ','.join(kwargs.get('ranges', [])) or \
+            ','.join(d['range'] for d in body.get('data', [])) or ','.join(body.get('ranges', []))
+        with self._lock:
+            now = time.monotonic()
+            self.stats['requests'] += 1
+            self.stats[method] += 1
+            self.request_log.append((now, method, a1))
+            return self._pick_error(method, now)
+
+    def _delay(self) -> float:
+        return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def _finish(self, method: str, kwargs: Dict[str, Any], error: Optional[str]) -> Dict[str, Any]:
+        if error:
+            with self._lock:
+                self.stats['errors'] += 1
+                self.stats[f'errors.{error}'] += 1
+            self._raise(error)
+        with self._lock:
+            return getattr(self, '_' + method.replace('.', '_'))(**kwargs)
+
+    def _pick_error(self, method: str, now: float) -> Optional[str]:
+        for index, (error, only_method) in enumerate(self._scripted_errors):
+            if only_method in (None, method):
+                del self._scripted_errors[index]
+                return error
+        if self.quota_per_minute is not None:
+            while self._request_times and now - self._request_times[0] > 60:
+                self._request_times.popleft()
+            if len(self._request_times) >= self.quota_per_minute:
+                return ERROR_HTTP_429
+            self._request_times.append(now)
+        for error, rate in self._error_rates.items():
+            if self._random.random() < rate:
+                return error
+        return None
+
+    @staticmethod
+    def _raise(error: str) -> None:
+        if error == ERROR_HTTP_500:
+            raise HttpError(httplib2.Response({'status': 500}), b'{"error": {"code": 500, "message": "Internal error"}}')
+        if error == ERROR_HTTP_429:
+            raise HttpError(httplib2.Response({'status': 429}),
+                            b'{"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}')
+        if error == ERROR_SSL_RESET:
+            raise ssl.SSLError(1, '[SSL: WRONG_VERSION_NUMBER] wrong version number (_ssl.c:2580)')
+        if error == ERROR_CONNECTION_RESET:
+            raise ConnectionResetError(104, 'Connection reset by peer')
+        raise ValueError(f"Unknown error kind: {error}")
+
+    # --- Endpoints (called with the lock held) ---------------------------
+
+    def _read(self, a1_range: str, major_dimension: str = 'ROWS') -> Dict[str, Any]:
+        sheet, first_row, first_col, last_row, last_col = parse_range(a1_range)
+        grid = self.sheets.get(sheet, [])
+        end_row = len(grid) if last_row is None else min(last_row + 1, len(grid))
+        values = [row[first_col:None if last_col is None else last_col + 1] for row in grid[first_row:end_row]]
+        if major_dimension == 'COLUMNS':
+            width = max((len(row) for row in values), default=0)
+            values = [[row[col] if col < len(row) else "" for row in values] for col in range(width)]
+        trimmed = []
+        for cells in values:
+            while cells and cells[-1] == "":
+                cells = cells[:-1]  # The API omits trailing empty cells...
+            trimmed.append(list(cells))
+            self.stats['cells_read'] += len(cells)
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()  # ...and trailing empty rows (or columns)
+        result = {'range': a1_range, 'majorDimension': major_dimension}
+        if trimmed:
+            result['values'] = trimmed
+        return result
+
+    def _write(self, a1_range: str, values: List[List[Any]]) -> int:
+        sheet, first_row, first_col, _, _ = parse_range(a1_range)
+        grid = self.sheets.setdefault(sheet, [])
+        written = 0
+        for row_offset, row_values in enumerate(values):
+            row_index = first_row + row_offset
+            while len(grid) <= row_index:
+                grid.append([])
+            row = grid[row_index]
+            for col_offset, value in enumerate(row_values):
+                col_index = first_col + col_offset
+                if len(row) <= col_index:
+                    row.extend([""] * (col_index + 1 - len(row)))
+                row[col_index] = "" if value is None else str(value)
+                written += 1
+        self.stats['cells_written'] += written
+        return written
+
+    def _spreadsheets_get(self, spreadsheetId: str, **_) -> Dict[str, Any]:
+        return {'spreadsheetId': spreadsheetId,
+                'sheets': [{'properties': {'title': title}} for title in self.sheets]}
+
+    def _values_get(self, spreadsheetId: str, range: str, majorDimension: str = 'ROWS', **_) -> Dict[str, Any]:
+        return self._read(range, majorDimension)
+
+    def _values_batchGet(self, spreadsheetId: str, ranges: Sequence[str], majorDimension: str = 'ROWS',
+                         **_) -> Dict[str, Any]:
+        return {'spreadsheetId': spreadsheetId, 'valueRanges': [self._read(r, majorDimension) for r in ranges]}
+
+    def _values_update(self, spreadsheetId: str, range: str, body: Dict[str, Any], **_) -> Dict[str, Any]:
+        written = self._write(range, body.get('values', []))
+        return {'spreadsheetId': spreadsheetId, 'updatedRange': range, 'updatedCells': written}
+
+    def _values_batchUpdate(self, spreadsheetId: str, body: Dict[str, Any], **_) -> Dict[str, Any]:
+        written = sum(self._write(d['range'], d.get('values', [])) for d in body.get('data', []))
+        return {'spreadsheetId': spreadsheetId, 'totalUpdatedCells': written}
+
+    def _values_clear(self, spreadsheetId: str, range: str, **_) -> Dict[str, Any]:
+        sheet, first_row, first_col, last_row, last_col = parse_range(range)
+        grid = self.sheets.get(sheet, [])
+        end_row = len(grid) if last_row is None else min(last_row + 1, len(grid))
+        for row in grid[first_row:end_row]:
+            end_col = len(row) if last_col is None else min(last_col + 1, len(row))
+            row[first_col:end_col] = [""] * max(0, end_col - first_col)
+        return {'spreadsheetId': spreadsheetId, 'clearedRange': range}
+
+    def _values_batchClear(self, spreadsheetId: str, body: Dict[str, Any], **_) -> Dict[str, Any]:
+        cleared = [self._values_clear(spreadsheetId, a1)['clearedRange'] for a1 in body.get('ranges', [])]
+        return {'spreadsheetId': spreadsheetId, 'clearedRanges': cleared}